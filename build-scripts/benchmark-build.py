@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark process_svg, csv_to_json and ui_csv_to_json
+
+Times each stage on the real inputs of every language config and on
+synthetic copies enlarged 10x and 100x, records median and percentile
+timings plus memory to a JSON results file, and compares them against a
+stored baseline. Exits with status 1 if a case regressed by more than the
+threshold.
+
+Usage: python benchmark-build.py [--repeat N] [--scales 10 100] [--only TEXT]
+       python benchmark-build.py --save-baseline
+       python benchmark-build.py --threshold 0.2
+
+The suite lives in plutchik_build.bench.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from plutchik_build.bench import (
+    DEFAULT_SCALES,
+    DEFAULT_THRESHOLD,
+    compare_results,
+    load_results,
+    run_benchmarks,
+    save_results,
+)
+from plutchik_build.pipeline import PROJECT_ROOT
+
+BENCHMARK_DIR = PROJECT_ROOT / '.benchmarks'
+
+
+def print_result(name, result):
+    print(f"{name:<34} {result['runs']:>4} {result['median_ms']:>9.2f}ms {result['p90_ms']:>9.2f}ms "
+          f"{result['p99_ms']:>9.2f}ms {result['peak_bytes'] / 1024:>9,.0f}KiB {result['allocated_blocks']:>9,}")
+
+
+def print_comparison(rows, threshold):
+    print(f"\nCompared with baseline (threshold +{threshold:.0%}):")
+    regressions = 0
+    for name, metric, base, current, ratio, regressed in rows:
+        icon = '❌' if regressed else ('✅' if ratio < 1 - threshold else '  ')
+        regressions += regressed
+        print(f"  {icon} {name:<34} {metric:<11} {base:>12,.2f} → {current:>12,.2f} ({ratio - 1:+.1%})")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the build stages")
+    parser.add_argument('--repeat', type=int, default=20,
+                        help="timed runs on real inputs; enlarged inputs use repeat/scale, "
+                             "at least 5 (default: 20)")
+    parser.add_argument('--scales', type=int, nargs='*', default=DEFAULT_SCALES,
+                        help="enlargement factors for synthetic inputs (default: 10 100)")
+    parser.add_argument('--only', metavar='TEXT',
+                        help="only run cases whose name contains TEXT, e.g. process_svg or -x100")
+    parser.add_argument('--output', type=Path, default=BENCHMARK_DIR / 'latest.json',
+                        help="results file (default: .benchmarks/latest.json)")
+    parser.add_argument('--baseline', type=Path, default=BENCHMARK_DIR / 'baseline.json',
+                        help="baseline to compare with (default: .benchmarks/baseline.json)")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="store these results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed growth before a case counts as a regression (default: 0.10)")
+    args = parser.parse_args()
+
+    print(f"{'Case':<34} {'runs':>4} {'median':>11} {'p90':>11} {'p99':>11} {'peak mem':>12} {'blocks':>9}")
+    document = run_benchmarks(scales=args.scales, repeat=args.repeat, only=args.only,
+                              progress=print_result)
+    save_results(document, args.output)
+    print(f"\n📄 Results: {args.output}")
+
+    if args.save_baseline:
+        save_results(document, args.baseline)
+        print(f"📌 Saved as baseline: {args.baseline}")
+        sys.exit(0)
+
+    if not args.baseline.exists():
+        print(f"💡 No baseline yet; run with --save-baseline to store one")
+        sys.exit(0)
+
+    regressions = print_comparison(compare_results(document, load_results(args.baseline), args.threshold),
+                                   args.threshold)
+    if regressions:
+        print(f"\n❌ {regressions} metric(s) regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+    print(f"\n✅ No regressions")
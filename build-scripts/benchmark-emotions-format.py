@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Compare the size and parse time of the verbose and compact emotions JSON.
+
+For every language JSON (text.json, text-es.json, text-it.json) this
+reports the raw and gzip size of the verbose file as shipped, of the same
+data without indentation, and of the compact columnar encoding, plus the
+median time to parse each (and to decode the compact payload) in Python
+and, when node is installed, in JavaScript.
+
+Usage: python benchmark-emotions-format.py [--repeat N] [--no-node]
+"""
+
+import argparse
+import gzip
+import json
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+from plutchik_build.compact import decode_compact, dumps_compact, encode_compact
+from plutchik_build.pipeline import PROJECT_ROOT
+
+SOURCES = ['text.json', 'text-es.json', 'text-it.json']
+
+NODE_DECODER = PROJECT_ROOT / 'js' / 'emotions-compact.js'
+
+# Times JSON.parse of the verbose and minified text and JSON.parse + decode of
+# the compact text; prints the medians in milliseconds as JSON
+NODE_SCRIPT = """
+const {decode_compact_emotions} = require(process.argv[1]);
+const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const repeat = input.repeat;
+function median(func) {
+    const times = [];
+    for (let i = 0; i < repeat; i++) {
+        const start = process.hrtime.bigint();
+        func();
+        times.push(Number(process.hrtime.bigint() - start) / 1e6);
+    }
+    times.sort((a, b) => a - b);
+    return times[Math.floor(times.length / 2)];
+}
+console.log(JSON.stringify({
+    verbose: median(() => JSON.parse(input.verbose)),
+    minified: median(() => JSON.parse(input.minified)),
+    compact: median(() => decode_compact_emotions(JSON.parse(input.compact))),
+}));
+"""
+
+
+def median_time(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def gzip_size(text):
+    return len(gzip.compress(text.encode('utf-8'), compresslevel=9, mtime=0))
+
+
+def node_times(verbose_text, minified_text, compact_text, repeat):
+    """Median parse times in node, or None if node is not available"""
+    node = shutil.which('node')
+    if node is None:
+        return None
+    data = json.dumps({'verbose': verbose_text, 'minified': minified_text,
+                       'compact': compact_text, 'repeat': repeat})
+    result = subprocess.run([node, '-e', NODE_SCRIPT, str(NODE_DECODER)],
+                            input=data, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"⚠️  node benchmark failed: {result.stderr.strip()}")
+        return None
+    return json.loads(result.stdout)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=500,
+                        help="timed parses per file (default: 500)")
+    parser.add_argument('--no-node', action='store_true',
+                        help="skip the JavaScript timings")
+    args = parser.parse_args(argv)
+
+    print(f"{'File':<14} {'format':<10} {'raw':>8} {'gzip':>7} {'py parse':>10} {'js parse':>10}")
+    ok = True
+    for name in SOURCES:
+        path = PROJECT_ROOT / name
+        if not path.exists():
+            continue
+
+        verbose_text = path.read_text(encoding='utf-8')
+        emotions_data = json.loads(verbose_text)
+        minified_text = json.dumps(emotions_data, ensure_ascii=False, separators=(',', ':'))
+        compact_text = dumps_compact(encode_compact(emotions_data))
+        ok &= decode_compact(json.loads(compact_text)) == emotions_data
+
+        py_times = {
+            'verbose': median_time(lambda: json.loads(verbose_text), args.repeat),
+            'minified': median_time(lambda: json.loads(minified_text), args.repeat),
+            'compact': median_time(lambda: decode_compact(json.loads(compact_text)), args.repeat),
+        }
+        js_times = None
+        if not args.no_node:
+            js_times = node_times(verbose_text, minified_text, compact_text, args.repeat)
+
+        for label, text in (('verbose', verbose_text), ('minified', minified_text),
+                            ('compact', compact_text)):
+            js = f"{js_times[label]:>8.3f}ms" if js_times else f"{'-':>10}"
+            print(f"{name:<14} {label:<10} {len(text.encode('utf-8')):>8,} {gzip_size(text):>7,} "
+                  f"{py_times[label] * 1000:>8.3f}ms {js}")
+
+    print(f"\nParse times are medians of {args.repeat} runs; compact includes decoding.")
+    if ok:
+        print(f"✅ Every compact payload decodes to the verbose data")
+        return 0
+    print(f"❌ A compact payload does not decode to the verbose data")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
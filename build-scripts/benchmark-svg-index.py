@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark the single-pass emotion layer index in process_svg_tree() against
+the previous approach of one .//*[@id=...] search per emotion.
+
+Runs on the Spanish and Italian sources and on a synthetically enlarged copy,
+and checks that both approaches produce byte-identical output.
+
+Usage: python benchmark-svg-index.py [--repeat N] [--scale N]
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import statistics
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+from plutchik_build.pipeline import PROJECT_ROOT
+from plutchik_build.svg import (
+    BASE_EMOTIONS,
+    INTERMEDIATE_EMOTIONS,
+    DOUBLE_BACKGROUND_EMOTIONS,
+    load_svg,
+    process_svg_tree,
+)
+from plutchik_build.synthetic import enlarge_svg_tree
+
+SOURCES = [
+    PROJECT_ROOT / 'svg-source' / 'Plutchik-spanish.svg',
+    PROJECT_ROOT / 'svg-source' / 'Plutchik-italiano.svg',
+]
+
+NS = '{http://www.w3.org/2000/svg}'
+
+
+def process_svg_tree_findall(tree):
+    """Reference implementation: one full-tree search per emotion"""
+    root = tree.getroot()
+
+    for emotion in BASE_EMOTIONS + INTERMEDIATE_EMOTIONS:
+        groups = root.findall(f".//*[@id='{emotion}']")
+        if not groups:
+            continue
+        group = groups[0]
+        is_intermediate = emotion in INTERMEDIATE_EMOTIONS
+        group.set('class', f"{group.get('class', '')} emotion-container {emotion}".strip())
+
+        rects = group.findall(f'.//{NS}rect')
+        if rects and is_intermediate:
+            rects[0].set('class', 'intermediate-word-bounding-box')
+
+        paths = group.findall(f'.//{NS}path')
+        if paths:
+            current = paths[0].get('class', '')
+            if is_intermediate:
+                paths[0].set('class', f"{current} intermediate-letter {emotion}".strip())
+            else:
+                paths[0].set('class', f"{current} petal-shape filled-shape {emotion}-color {emotion}".strip())
+
+        for text_path in paths[1:]:
+            current = text_path.get('class', '')
+            if is_intermediate:
+                if 'intermediate-letter' not in current:
+                    text_path.set('class', f"{current} intermediate-letter {emotion}".strip())
+            elif 'central-letter' not in current:
+                text_path.set('class', f"{current} central-letter".strip())
+
+    for emotion in DOUBLE_BACKGROUND_EMOTIONS:
+        groups = root.findall(f".//*[@id='{emotion}']")
+        if not groups:
+            continue
+        nested_groups = groups[0].findall(f'./{NS}g')
+        if nested_groups:
+            paths = nested_groups[0].findall(f'./{NS}path')
+            if len(paths) >= 2:
+                current = paths[1].get('class', '')
+                if 'central-letter' in current:
+                    paths[1].set('class', current.replace(
+                        'central-letter', f'petal-shape filled-shape {emotion}-color {emotion}'))
+
+    return tree
+
+
+def time_processing(func, tree, repeat):
+    """Median time of func on fresh copies of tree, plus the last output"""
+    times = []
+    output = None
+    for _ in range(repeat):
+        work = copy.deepcopy(tree)
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func(work)
+            times.append(time.perf_counter() - start)
+        output = ET.tostring(work.getroot())
+    return statistics.median(times), output
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20,
+                        help="timed runs per input (default: 20)")
+    parser.add_argument('--scale', type=int, default=10,
+                        help="enlargement factor for the synthetic SVG (default: 10)")
+    args = parser.parse_args(argv)
+
+    inputs = []
+    for source in SOURCES:
+        if source.exists():
+            inputs.append((source.name, load_svg(source)))
+    if inputs:
+        name, tree = inputs[0]
+        inputs.append((f"{name} x{args.scale}", enlarge_svg_tree(tree, args.scale)))
+
+    print(f"{'Input':<32} {'elements':>9} {'findall':>10} {'index':>10} {'speedup':>8}")
+    identical = True
+    for name, tree in inputs:
+        elements = sum(1 for _ in tree.getroot().iter())
+        old_time, old_output = time_processing(process_svg_tree_findall, tree, args.repeat)
+        new_time, new_output = time_processing(process_svg_tree, tree, args.repeat)
+        identical &= old_output == new_output
+        print(f"{name:<32} {elements:>9} {old_time * 1000:>8.2f}ms "
+              f"{new_time * 1000:>8.2f}ms {old_time / new_time:>7.1f}x")
+
+    if identical:
+        print(f"\n✅ Both approaches produce identical output")
+        return 0
+    print(f"\n❌ Outputs differ between the two approaches")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
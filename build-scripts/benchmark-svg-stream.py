@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Compare peak memory and time of tree-based and streaming SVG processing
+
+Writes a synthetically enlarged copy of the Spanish source to a temporary
+directory, processes it both ways, and checks the outputs are byte-identical.
+
+Usage: python benchmark-svg-stream.py [--scale N ...]
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from plutchik_build.pipeline import PROJECT_ROOT
+from plutchik_build.svg import load_svg, process_svg, write_svg
+from plutchik_build.svg_stream import process_svg_stream
+from plutchik_build.synthetic import enlarge_svg_tree
+
+SOURCE = PROJECT_ROOT / 'svg-source' / 'Plutchik-spanish.svg'
+
+
+def measure(func, *args):
+    """Run func and return (seconds, peak traced bytes)"""
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', type=int, nargs='+', default=[1, 10, 50],
+                        help="enlargement factors to test (default: 1 10 50)")
+    args = parser.parse_args(argv)
+
+    source_tree = load_svg(SOURCE)
+    identical = True
+
+    print(f"{'Input':<14} {'size':>9} {'tree':>18} {'stream':>18}")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for scale in args.scale:
+            input_path = tmp / f"input-x{scale}.svg"
+            write_svg(enlarge_svg_tree(source_tree, scale), input_path)
+
+            tree_out = tmp / 'tree.svg'
+            stream_out = tmp / 'stream.svg'
+            tree_time, tree_peak = measure(process_svg, input_path, tree_out)
+            stream_time, stream_peak = measure(process_svg_stream, input_path, stream_out)
+            identical &= tree_out.read_bytes() == stream_out.read_bytes()
+
+            size = input_path.stat().st_size
+            print(f"{'x' + str(scale):<14} {size / 1024:>7.0f}KB "
+                  f"{tree_time * 1000:>7.1f}ms {tree_peak / 1024:>7.0f}KB "
+                  f"{stream_time * 1000:>7.1f}ms {stream_peak / 1024:>7.0f}KB")
+
+    if identical:
+        print(f"\n✅ Streaming output is byte-identical to tree mode")
+        return 0
+    print(f"\n❌ Streaming output differs from tree mode")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -2,132 +2,305 @@
 """
 Master build script for creating a language version of the Plutchik webapp
 This script orchestrates all the steps needed to create a complete language version.
+All stages run in-process through the plutchik_build package.
 
 Usage: python build-language.py language-config.json
+       python build-language.py language-config.json --compare-subprocess
+       python build-language.py --all [--jobs N]
+       python build-language.py es-config.json it-config.json
+       python build-language.py language-config.json --force
+       python build-language.py --all --check
+       python build-language.py --all --profile [trace.json] [--cprofile svg]
+       python build-language.py --all --watch
+       python build-language.py --all --cache [DIR] [--cache-size 256M]
 """
 
-import json
+import argparse
 import sys
-import subprocess
 from pathlib import Path
 
+from plutchik_build.artifacts import (
+    ArtifactStore,
+    add_stats,
+    default_cache_dir,
+    parse_size,
+    print_cache_stats,
+)
+from plutchik_build.check import check_translations, print_check_report
+from plutchik_build.compress import SIZE_MANIFEST, precompress, print_size_report
+from plutchik_build.manifest import STAGE_SOURCES
+from plutchik_build.multi import build_many, collect_shared_styles, find_configs, unique_configs
+from plutchik_build.pipeline import (
+    PROJECT_ROOT,
+    build_language,
+    compare_with_subprocess,
+    config_artifacts,
+    load_config,
+)
+from plutchik_build.profiling import PROFILE_DIR, print_profile, profile_build, write_trace
+from plutchik_build.watch import WATCH_INTERVAL, Watcher
+
+
+def print_summary(result, config_path):
+    """Print the generated files and the manual follow-up steps"""
+    config = result['config']
+    paths = result['paths']
+    lang_name = config['language_name']
+    json_file = paths['json_file']
+    ui_json_file = paths['ui_json_file']
+    graph_file = paths['graph_file']
+    compact_json_file = paths['compact_json_file']
+    svg_processed = paths['svg_processed']
+    hitmap_file = paths['svg_hitmap_file']
 
-def run_command(cmd, description):
-    """Run a shell command and handle errors"""
     print(f"\n{'='*60}")
-    print(f"📋 {description}")
+    print(f"✅ Build Complete for {lang_name}!")
     print(f"{'='*60}")
+    print(f"\nGenerated files:")
+    print(f"  📄 Emotions JSON: {json_file}")
+    if ui_json_file and ui_json_file.exists():
+        print(f"  📄 UI JSON:       {ui_json_file}")
+    if graph_file and graph_file.exists():
+        print(f"  🕸  Graph JSON:    {graph_file}")
+    if compact_json_file and compact_json_file.exists():
+        print(f"  📦 Compact JSON:  {compact_json_file}")
+    print(f"  🎨 SVG:           {svg_processed}")
+    if hitmap_file and hitmap_file.exists():
+        print(f"  🎯 Hit map:       {hitmap_file}")
+    print_build_report(result['report'])
+    print(f"\nNext steps:")
+    print(f"  1. Copy CSS and JS templates:")
+    print(f"     cp css/styles-it.css {config['css_file']}")
+    print(f"     cp js/scripts-it.js {config['js_file']}")
+    print(f"  2. Update {config['js_file']} to load {config['json_file']}")
+    print(f"  3. Generate {config['html_output']}:")
+    print(f"     python3 build-scripts/generate-html.py {config_path}")
 
-    result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
 
-    if result.stdout:
-        print(result.stdout)
+def print_build_report(report):
+    """Print which stages were rebuilt and why"""
+    print(f"\nBuild report:")
+    for stage, action, reason in report:
+        icon = {'rebuilt': '🔁', 'restored': '♻️ '}.get(action, '⏭ ')
+        print(f"  {icon} {stage:<10} {action:<8} {reason}")
 
-    if result.returncode != 0:
-        print(f"❌ Error: {description} failed")
-        print(result.stderr)
-        return False
 
-    return True
+def print_comparison(config_path, timings):
+    """Print wall-clock timings of the in-process and subprocess builds"""
+    print(f"\n{'='*60}")
+    print(f"⏱  In-process vs subprocess build: {config_path}")
+    print(f"{'='*60}")
+    print(f"  Subprocess path: {timings['subprocess'] * 1000:8.1f} ms")
+    print(f"  In-process path: {timings['in_process'] * 1000:8.1f} ms")
+    print(f"  Saved:           {timings['saved'] * 1000:8.1f} ms "
+          f"({timings['speedup']:.1f}x faster, best of {timings['runs']})")
 
 
-def build_language(config_path):
-    """Build a complete language version from configuration"""
+def print_multi_summary(summaries, wall_time, verbose=False):
+    """Print per-language results and overall throughput of a multi build"""
+    for summary in summaries:
+        if verbose or not summary['ok']:
+            print(f"\n{'='*60}")
+            print(f"📜 Log for {summary['language']} ({summary['config']})")
+            print(f"{'='*60}")
+            print(summary['log'])
 
-    # Load configuration
-    print(f"\n🌍 Loading configuration from: {config_path}")
-    with open(config_path, 'r', encoding='utf-8') as f:
-        config = json.load(f)
+    print(f"\n{'='*60}")
+    print(f"🌍 Multi-language build summary")
+    print(f"{'='*60}")
+    for summary in summaries:
+        status = '✅' if summary['ok'] else '❌'
+        line = f"  {status} {summary['language']:<12} {summary['elapsed'] * 1000:8.1f} ms  {summary['config']}"
+        rebuilt = [stage for stage, action, _ in summary['report'] if action == 'rebuilt']
+        restored = [stage for stage, action, _ in summary['report'] if action == 'restored']
+        if summary['ok']:
+            line += f"\n       rebuilt: {', '.join(rebuilt) or 'nothing (up to date)'}"
+        if restored:
+            line += f"\n       restored: {', '.join(restored)}"
+        if summary['error']:
+            line += f"\n       {summary['error']}"
+        print(line)
 
-    lang_code = config['language_code']
-    lang_name = config['language_name']
+    built = sum(1 for s in summaries if s['ok'])
+    rate = len(summaries) / wall_time if wall_time else float('inf')
+    print(f"\n  {built}/{len(summaries)} languages built in {wall_time:.2f} s "
+          f"({rate:.1f} languages/s)")
 
+
+def precompress_outputs(config_paths):
+    """Write precompressed siblings of every artifact of the given configs"""
+    files = []
+    for config_path in config_paths:
+        files += config_artifacts(load_config(config_path), PROJECT_ROOT)
+
+    manifest_path = PROJECT_ROOT / SIZE_MANIFEST
+    results = precompress(files, manifest_path, PROJECT_ROOT)
     print(f"\n{'='*60}")
-    print(f"Building Plutchik Webapp: {lang_name} ({lang_code})")
+    print(f"🗜  Precompressed artifacts")
     print(f"{'='*60}")
+    print_size_report(results)
+    print(f"\n   Sizes recorded in {manifest_path}")
 
-    # Get project root (parent of build-scripts)
-    project_root = Path(__file__).parent.parent
-    build_scripts_dir = Path(__file__).parent
-
-    # Step 1: Convert Emotions CSV to JSON
-    csv_file = project_root / config['csv_file']
-    json_file = project_root / config['json_file']
 
-    if csv_file.exists():
-        cmd = f"python3 '{build_scripts_dir}/csv-to-json.py' '{csv_file}' '{json_file}'"
-        if not run_command(cmd, f"Converting Emotions CSV to JSON for {lang_name}"):
-            return False
-    else:
-        print(f"⚠️  Emotions CSV file not found: {csv_file}")
-        print(f"   Skipping CSV conversion. Using existing JSON: {json_file}")
+def report_profiles(builds, trace_path):
+    """Print the stage profile of every build and write the JSON trace"""
+    for build in builds:
+        print_profile(build)
+    write_trace(builds, trace_path)
+    print(f"\n📈 Profile trace written to {trace_path}")
 
-    # Step 1.5: Convert UI CSV to JSON
-    ui_csv_file = project_root / config.get('ui_csv_file', '')
-    ui_json_file = project_root / config.get('ui_json_file', '')
 
-    if ui_csv_file and ui_csv_file.exists():
-        cmd = f"python3 '{build_scripts_dir}/ui-csv-to-json.py' '{ui_csv_file}' '{ui_json_file}'"
-        if not run_command(cmd, f"Converting UI CSV to JSON for {lang_name}"):
-            return False
-    else:
-        if ui_csv_file:
-            print(f"⚠️  UI CSV file not found: {ui_csv_file}")
-            print(f"   Skipping UI CSV conversion.")
-
-    # Step 2: Process SVG
-    svg_input = project_root / config['svg_input']
-    svg_processed = project_root / config['svg_processed']
-
-    if svg_input.exists():
-        cmd = f"python3 '{build_scripts_dir}/process-svg.py' '{svg_input}' '{svg_processed}'"
-        if not run_command(cmd, f"Processing SVG for {lang_name}"):
-            return False
-    else:
-        print(f"⚠️  SVG input file not found: {svg_input}")
-        print(f"   Skipping SVG processing. Using existing: {svg_processed}")
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description="Build a language version of the Plutchik webapp",
+        epilog="Example: python build-language.py languages/spanish-config.json")
+    parser.add_argument('configs', type=Path, nargs='*', metavar='config',
+                        help="language configuration JSON file(s)")
+    parser.add_argument('--all', action='store_true',
+                        help="build every languages/*-config.json in parallel")
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help="worker processes for multi-language builds "
+                             "(default: number of cores)")
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help="show the full log of every language in multi builds")
+    parser.add_argument('--shared-styles', type=Path, metavar='CSS',
+                        help="after a multi-language build, write the canonical SVG "
+                             "style rules of all languages to this stylesheet")
+    parser.add_argument('--precompress', action='store_true',
+                        help="write .gz (and .br/.zst if available) siblings of the "
+                             f"built artifacts and update {SIZE_MANIFEST}")
+    parser.add_argument('--force', action='store_true',
+                        help="rebuild every stage even if its inputs are unchanged")
+    parser.add_argument('--compare-subprocess', action='store_true',
+                        help="time the in-process build against one python3 "
+                             "per stage (outputs go to a temp dir)")
+    parser.add_argument('--runs', type=int, default=3,
+                        help="runs per variant for --compare-subprocess (default: 3)")
+    parser.add_argument('--check', action='store_true',
+                        help="only lint the translations of the given languages, do not build")
+    parser.add_argument('--no-check', action='store_true',
+                        help="build even if the translation lint finds errors")
+    parser.add_argument('--profile', type=Path, nargs='?', metavar='TRACE_JSON',
+                        const=PROFILE_DIR / 'trace.json',
+                        help="record wall time, CPU time and peak memory of every stage "
+                             f"and write a JSON trace (default: {PROFILE_DIR.name}/trace.json)")
+    parser.add_argument('--cprofile', action='append', default=[], metavar='STAGE',
+                        choices=sorted(STAGE_SOURCES) + ['all'],
+                        help="also run this stage under cProfile and dump "
+                             f"{PROFILE_DIR.name}/<language>-<stage>.pstats (repeatable, "
+                             "implies --profile)")
+    parser.add_argument('--watch', action='store_true',
+                        help="keep running and rebuild a language whenever one of its "
+                             "inputs changes")
+    parser.add_argument('--interval', type=float, default=WATCH_INTERVAL,
+                        help=f"seconds between polls in --watch mode (default: {WATCH_INTERVAL})")
+    parser.add_argument('--cache', type=Path, nargs='?', metavar='DIR', const=default_cache_dir(),
+                        help="restore stage outputs built before from identical inputs, "
+                             "by any checkout, from a shared artifact cache "
+                             f"(default: {default_cache_dir()})")
+    parser.add_argument('--cache-size', type=parse_size, default='256M', metavar='SIZE',
+                        help="evict the least recently used cache entries above this size, "
+                             "e.g. 64M or 2G (default: 256M)")
+    args = parser.parse_args(argv)
+    if not args.configs and not args.all:
+        parser.error("give a config file or --all")
+    if args.cprofile and args.profile is None:
+        args.profile = PROFILE_DIR / 'trace.json'
+    return args
 
-    # Step 3: Generate language-specific files summary
-    print(f"\n{'='*60}")
-    print(f"✅ Build Complete for {lang_name}!")
-    print(f"{'='*60}")
-    print(f"\nGenerated files:")
-    print(f"  📄 Emotions JSON: {json_file}")
-    if ui_json_file and ui_json_file.exists():
-        print(f"  📄 UI JSON:       {ui_json_file}")
-    print(f"  🎨 SVG:           {svg_processed}")
-    print(f"\nNext steps:")
-    print(f"  1. Copy CSS and JS templates:")
-    print(f"     cp css/styles-it.css {config['css_file']}")
-    print(f"     cp js/scripts-it.js {config['js_file']}")
-    print(f"  2. Update {config['js_file']} to load {config['json_file']}")
-    print(f"  3. Copy HTML template:")
-    print(f"     cp index-it.html {config['html_output']}")
-    print(f"  4. Embed {svg_processed} into {config['html_output']}")
-    print(f"  5. Update HTML references to CSS/JS files")
-    if ui_json_file and ui_json_file.exists():
-        print(f"\n💡 UI text is in {ui_json_file}")
-        print(f"   You can use this to update the HTML manually or with a script.")
 
-    return True
+def finish_cache(cache, stats):
+    """Evict down to the size limit and print the run's cache counters"""
+    before = dict(cache.stats)
+    cache.evict()
+    evicted = {key: cache.stats[key] - before[key] for key in ('evicted', 'evicted_bytes')}
+    print_cache_stats({**stats, **evicted}, cache)
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python build-language.py language-config.json")
-        print("\nExample:")
-        print("  python build-language.py languages/spanish-config.json")
-        sys.exit(1)
+    args = parse_args(sys.argv[1:])
+    config_paths = list(args.configs)
+    if args.all:
+        config_paths += find_configs()
+    config_paths = unique_configs(config_paths)
 
-    config_path = Path(sys.argv[1])
+    for config_path in config_paths:
+        if not config_path.exists():
+            print(f"❌ Error: Config file not found: {config_path}")
+            sys.exit(1)
 
-    if not config_path.exists():
-        print(f"❌ Error: Config file not found: {config_path}")
-        sys.exit(1)
+    # Lint the translations first: it takes milliseconds and catches broken
+    # references before any stage runs
+    if args.check or not (args.no_check or args.compare_subprocess):
+        print(f"\n🔍 Checking translations")
+        errors = print_check_report(*check_translations(config_paths, scan_translations=args.check))
+        if args.check:
+            sys.exit(1 if errors else 0)
+        if errors:
+            print(f"\n❌ Build stopped: fix the errors above or pass --no-check")
+            sys.exit(1)
+
+    cache = ArtifactStore(args.cache, args.cache_size) if args.cache else None
+
+    if args.watch:
+        Watcher(config_paths, interval=args.interval, force=args.force, cache=cache).run()
+        sys.exit(0)
+
+    if len(config_paths) > 1 or args.all:
+        if args.compare_subprocess:
+            for config_path in config_paths:
+                print_comparison(config_path, compare_with_subprocess(config_path, args.runs))
+            sys.exit(0)
+
+        summaries, wall_time = build_many(config_paths, jobs=args.jobs, force=args.force,
+                                          profile=args.profile is not None,
+                                          cprofile_stages=args.cprofile, cache=cache)
+        print_multi_summary(summaries, wall_time, verbose=args.verbose)
+
+        if cache:
+            finish_cache(cache, add_stats(*(s['cache'] for s in summaries)))
+
+        if args.profile:
+            report_profiles([s['profile'] for s in summaries if s['profile']], args.profile)
+
+        if args.shared_styles:
+            count, skipped = collect_shared_styles(config_paths, args.shared_styles)
+            print(f"\n🎨 Shared stylesheet: {args.shared_styles} ({count} classes)")
+            for config_path in skipped:
+                print(f"   ⚠️  Not included (no svg_canonical_styles or no SVG): {config_path}")
+
+        if args.precompress:
+            precompress_outputs([s['config'] for s in summaries if s['ok']])
+
+        sys.exit(0 if all(s['ok'] for s in summaries) else 1)
+
+    config_path = config_paths[0]
+
+    if args.compare_subprocess:
+        print_comparison(config_path, compare_with_subprocess(config_path, args.runs))
+        sys.exit(0)
+
+    if args.profile:
+        result, build = profile_build(
+            config_path,
+            lambda profiler: build_language(config_path, force=args.force, profiler=profiler,
+                                            cache=cache),
+            args.cprofile)
+    else:
+        result = build_language(config_path, force=args.force, cache=cache)
+
+    if result:
+        print_summary(result, config_path)
+
+    if result and cache:
+        finish_cache(cache, result['cache'])
 
-    success = build_language(config_path)
+    if args.profile:
+        report_profiles([build], args.profile)
 
-    if success:
+    if result:
+        if args.precompress:
+            precompress_outputs([config_path])
         print(f"\n🎉 Success! Language build completed.")
         sys.exit(0)
     else:
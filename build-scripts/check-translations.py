@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Lint every translation before building
+Checks all emotions CSVs, UI CSVs and SVG mappings in one pass: missing or
+duplicate rows, references to unknown emotions, SVG layer ids that are not
+mapped, mapped references that disagree with English, malformed colours and
+URLs. Exits with status 1 if there are errors, so it can gate builds and
+commits.
+
+Usage: python check-translations.py [config.json ...] [--json] [--strict]
+
+The checks live in plutchik_build.check.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from plutchik_build.check import ERROR, check_translations, print_check_report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lint translation CSVs and SVG mappings")
+    parser.add_argument('configs', type=Path, nargs='*', metavar='config',
+                        help="language configs to check (default: every languages/*-config.json)")
+    parser.add_argument('--json', action='store_true',
+                        help="print the issues as JSON instead of text")
+    parser.add_argument('--strict', action='store_true',
+                        help="treat warnings as errors")
+    args = parser.parse_args()
+
+    for config_path in args.configs:
+        if not config_path.exists():
+            print(f"❌ Error: Config file not found: {config_path}")
+            sys.exit(1)
+
+    issues, files_checked, elapsed = check_translations(args.configs or None)
+
+    if args.json:
+        print(json.dumps({
+            'files': files_checked,
+            'elapsed_ms': round(elapsed * 1000, 3),
+            'issues': [issue._asdict() for issue in issues],
+        }, ensure_ascii=False, indent=2))
+        errors = sum(1 for issue in issues if issue.severity == ERROR)
+    else:
+        errors = print_check_report(issues, files_checked, elapsed)
+
+    failed = errors or (args.strict and issues)
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Copy the site into an output directory with content-hashed asset names
+CSS, JS, JSON and SVG assets get a hash in their file name and every
+reference to them in the pages and scripts is rewritten, so they can be
+served with a year-long "Cache-Control: public, max-age=31536000, immutable".
+Pages keep their names and should be served with a short cache lifetime.
+
+Usage: python fingerprint-assets.py --all [--out dist] [--precompress]
+
+The stage itself lives in plutchik_build.fingerprint.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from plutchik_build.compress import SIZE_MANIFEST, precompress
+from plutchik_build.fingerprint import ASSET_MANIFEST, FingerprintError, fingerprint_assets
+from plutchik_build.multi import find_configs
+from plutchik_build.pipeline import PROJECT_ROOT, load_config, site_files
+
+# The English version has no language config
+DEFAULT_PAGES = ['index.html']
+DEFAULT_ASSETS = ['text.json', 'css/styles.css', 'js/scripts.js']
+
+
+def config_files(config_paths):
+    """Return (assets, pages) of the given language configs"""
+    assets, pages = [], []
+    for config_path in config_paths:
+        config_assets, config_pages = site_files(load_config(config_path), PROJECT_ROOT)
+        assets += [path.relative_to(PROJECT_ROOT).as_posix() for path in config_assets]
+        pages += [path.relative_to(PROJECT_ROOT).as_posix() for path in config_pages]
+    return assets, pages
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fingerprint static assets")
+    parser.add_argument('--config', type=Path, action='append', default=[],
+                        help="include the files of this language config")
+    parser.add_argument('--all', action='store_true',
+                        help="include every language config and the English version")
+    parser.add_argument('--out', type=Path, default=PROJECT_ROOT / 'dist',
+                        help="output directory (default: dist/)")
+    parser.add_argument('--precompress', action='store_true',
+                        help="also write precompressed siblings of the output")
+    args = parser.parse_args()
+
+    configs = list(args.config)
+    assets, pages = [], []
+    if args.all:
+        configs += find_configs()
+        assets += DEFAULT_ASSETS
+        pages += DEFAULT_PAGES
+    if not configs and not args.all:
+        parser.error("give --config or --all")
+
+    config_assets, config_pages = config_files(configs)
+    assets += config_assets
+    pages += config_pages
+
+    try:
+        manifest = fingerprint_assets(PROJECT_ROOT, assets, pages, args.out)
+    except FingerprintError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    for original, hashed in manifest.items():
+        print(f"  {original:<36} → {hashed}")
+    print(f"\n✅ Fingerprinted {len(manifest)} assets into {args.out}")
+    print(f"   Asset manifest: {args.out / ASSET_MANIFEST}")
+
+    if args.precompress:
+        files = [args.out / hashed for hashed in manifest.values()]
+        files += [args.out / page for page in pages]
+        precompress(files, args.out / SIZE_MANIFEST, args.out)
+        print(f"   Precompressed {len(files)} files, sizes in {args.out / SIZE_MANIFEST}")
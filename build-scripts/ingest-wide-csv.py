@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Write every language's emotions and UI JSON from one wide translation sheet
+
+Usage: python ingest-wide-csv.py translations/wide.csv
+       python ingest-wide-csv.py translations/wide.csv --locales es,it --output-dir /tmp/out
+       python ingest-wide-csv.py --export translations/wide.csv [--all | config ...]
+
+The sheet has section, key and field columns and one column per language
+code (see plutchik_build.wide for the layout). It is read once, row by
+row, and every language's text-*.json and ui-text-*.json is written
+incrementally; languages with a config get the config's file names, the
+others text-<code>.json and ui-text-<code>.json. Nothing is written if
+the sheet has an error.
+
+--export writes such a sheet from the JSON of the given language configs,
+e.g. to hand the current translations to a vendor.
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from pathlib import Path
+
+from plutchik_build.multi import find_configs
+from plutchik_build.pipeline import PROJECT_ROOT, load_config, mapping_path
+from plutchik_build.wide import (
+    WideSheetError,
+    export_wide_sheet,
+    ingest_wide_sheet,
+    locale_outputs,
+    sheet_locales,
+)
+
+TEMPLATE = PROJECT_ROOT / 'translations' / 'template.csv'
+UI_TEMPLATE = PROJECT_ROOT / 'translations' / 'ui-template.csv'
+
+
+def load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def export(sheet_path, config_paths, template, ui_template):
+    languages = {}
+    for config_path in config_paths:
+        config = load_config(config_path)
+        ui_json_file = PROJECT_ROOT / config['ui_json_file'] if config.get('ui_json_file') else None
+        svg_mapping = mapping_path(config_path, config)
+        languages[config['language_code']] = (
+            load_json(PROJECT_ROOT / config['json_file']),
+            load_json(ui_json_file) if ui_json_file and ui_json_file.exists() else {},
+            load_json(svg_mapping) if svg_mapping.exists() else {},
+        )
+    rows = export_wide_sheet(sheet_path, languages, template, ui_template)
+    print(f"✅ Exported {len(languages)} languages ({', '.join(languages)}) in {rows} rows")
+    print(f"   Output: {sheet_path}")
+
+
+def ingest(sheet_path, locales, output_dir, template, ui_template):
+    with open(sheet_path, 'r', encoding='utf-8', newline='') as f:
+        header = [column.strip() for column in next(csv.reader(f), [])]
+    locales = locales or sheet_locales(header)
+    configs = {}
+    for config_path in find_configs():
+        config = load_config(config_path)
+        configs[config['language_code']] = config
+
+    start = time.perf_counter()
+    stats = ingest_wide_sheet(sheet_path, locale_outputs(locales, configs, output_dir),
+                              template, ui_template)
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ Ingested {stats['rows']} rows for {len(locales)} languages in {elapsed * 1000:.0f} ms")
+    print(f"   {stats['emotions']} emotions and {stats['ui']} UI keys per language")
+    for locale, count in stats['untranslated'].items():
+        if count:
+            print(f"   ⚠️  {locale}: {count} field(s) without a row, taken from the English template")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest a wide multi-language translation sheet")
+    parser.add_argument('sheet', type=Path, help="wide sheet to read (or write with --export)")
+    parser.add_argument('configs', type=Path, nargs='*', metavar='config',
+                        help="with --export: language configs to export")
+    parser.add_argument('--locales', type=lambda value: [v.strip() for v in value.split(',') if v.strip()],
+                        help="comma-separated language columns to ingest (default: all)")
+    parser.add_argument('--output-dir', type=Path, default=PROJECT_ROOT,
+                        help="directory the JSON file names are relative to (default: project root)")
+    parser.add_argument('--template', type=Path, default=TEMPLATE,
+                        help="English emotions template (default: translations/template.csv)")
+    parser.add_argument('--ui-template', type=Path, default=UI_TEMPLATE,
+                        help="English UI template (default: translations/ui-template.csv)")
+    parser.add_argument('--export', action='store_true',
+                        help="write the sheet from the built JSON of the configs instead")
+    parser.add_argument('--all', action='store_true',
+                        help="with --export: export every languages/*-config.json")
+    args = parser.parse_args()
+
+    try:
+        if args.export:
+            config_paths = find_configs() if args.all else args.configs
+            if not config_paths:
+                parser.error("--export needs config files or --all")
+            export(args.sheet, config_paths, args.template, args.ui_template)
+        else:
+            if args.configs or args.all:
+                parser.error("config files and --all only go with --export")
+            if not args.sheet.exists():
+                print(f"❌ Error: Sheet not found: {args.sheet}")
+                sys.exit(1)
+            ingest(args.sheet, args.locales, args.output_dir, args.template, args.ui_template)
+    except (OSError, WideSheetError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Minify the path data of processed SVG files
+Rounds coordinates, picks the shorter of absolute/relative commands, uses
+H/V/S/T shorthands and strips redundant whitespace. Paths that would move
+by more than the tolerance are left unchanged.
+
+Usage: python minify-svg.py input.svg output.svg [--precision N] [--tolerance T]
+       python minify-svg.py --in-place file.svg [file.svg ...]
+       python minify-svg.py input.svg output.svg --simplify 0.25
+
+--simplify first simplifies the petal and ring outlines (never the label
+glyphs) to within the given distance in user units, and reports the
+vertices and bytes saved per emotion layer. It needs NumPy.
+
+The minifier itself lives in plutchik_build.svg_minify, the simplifier in
+plutchik_build.svg_simplify.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from plutchik_build.svg import load_svg
+from plutchik_build.svg_minify import DEFAULT_PRECISION, DEFAULT_TOLERANCE, minify_svg
+from plutchik_build.svg_simplify import print_simplify_report, simplify_svg_tree
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Minify SVG path data")
+    parser.add_argument('files', type=Path, nargs='+',
+                        help="input.svg output.svg, or files to rewrite with --in-place")
+    parser.add_argument('--in-place', action='store_true',
+                        help="overwrite every given file")
+    parser.add_argument('--precision', type=int, default=DEFAULT_PRECISION,
+                        help=f"decimal places to keep (default: {DEFAULT_PRECISION})")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f"largest allowed coordinate change (default: {DEFAULT_TOLERANCE})")
+    parser.add_argument('--simplify', type=float, metavar='TOLERANCE',
+                        help="simplify petal and ring outlines to within TOLERANCE user units first "
+                             "(needs NumPy)")
+    args = parser.parse_args()
+
+    if args.in_place:
+        pairs = [(path, path) for path in args.files]
+    elif len(args.files) == 2:
+        pairs = [tuple(args.files)]
+    else:
+        parser.error("give input.svg output.svg, or use --in-place")
+
+    for input_path, output_path in pairs:
+        if not input_path.exists():
+            print(f"❌ Error: Input SVG file not found: {input_path}")
+            sys.exit(1)
+
+    for input_path, output_path in pairs:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        tree = None
+        if args.simplify is not None:
+            tree = load_svg(input_path)
+            try:
+                stats = simplify_svg_tree(tree, args.simplify, args.precision)
+            except ImportError as e:
+                print(f"❌ Error: {e}")
+                sys.exit(1)
+            print_simplify_report(stats, input_path.name)
+            print()
+        minify_svg(input_path, output_path, args.precision, args.tolerance, tree)
+        print()
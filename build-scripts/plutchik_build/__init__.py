@@ -0,0 +1,45 @@
+"""
+Importable build pipeline for the Plutchik webapp
+
+The command line scripts in build-scripts/ are thin wrappers around these
+functions. Importing them directly lets a build run every stage in a single
+interpreter and hand parsed data from one stage to the next in memory.
+
+Usage:
+    from plutchik_build import csv_to_json, ui_csv_to_json, process_svg
+"""
+
+from .emotions import csv_to_json, read_emotions_csv
+from .ui_text import ui_csv_to_json, read_ui_csv
+from .svg import (
+    BASE_EMOTIONS,
+    INTERMEDIATE_EMOTIONS,
+    DOUBLE_BACKGROUND_EMOTIONS,
+    process_svg,
+    process_svg_tree,
+)
+from .svg_stream import process_svg_stream
+from .svg_minify import minify_path, minify_svg
+from .svg_styles import canonicalize_svg_styles, share_svg_styles
+from .pipeline import build_language, load_config
+from .page import compile_page
+
+__all__ = [
+    'BASE_EMOTIONS',
+    'INTERMEDIATE_EMOTIONS',
+    'DOUBLE_BACKGROUND_EMOTIONS',
+    'build_language',
+    'canonicalize_svg_styles',
+    'compile_page',
+    'csv_to_json',
+    'load_config',
+    'minify_path',
+    'minify_svg',
+    'process_svg',
+    'process_svg_stream',
+    'process_svg_tree',
+    'read_emotions_csv',
+    'read_ui_csv',
+    'share_svg_styles',
+    'ui_csv_to_json',
+]
@@ -0,0 +1,251 @@
+"""
+Content-addressed store of stage outputs shared by builds
+
+The build manifest only knows what one output root last built. Locales,
+branches, checkouts and CI jobs that run a stage on identical inputs
+each redo the work; the artifact store lets them share it. Outputs are
+keyed by stage name, stage version (the hash of its code), the hash of
+the config entries it reads and the hashes of its input files - never
+by path, so two checkouts of the same commit share every entry:
+
+    <cache>/entries/ab/ab12...json    {"blob": "<sha256>", "bytes": 1234}
+    <cache>/blobs/cd/cd34...          the output itself
+
+A hit restores the output by copying the blob instead of running the
+stage. Outputs and blobs never share a file, so a tool that edits an
+output in place cannot change what other checkouts restore. Every file is
+written under a temporary name and renamed into place, so concurrent
+builds never see a partial entry or blob. A blob is hashed again on
+every restore and dropped if it no longer matches. evict() deletes the
+least recently used entries, and the blobs no entry refers to any more,
+until the blobs fit in the size limit.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+from .jsonio import temp_path, write_atomic
+from .manifest import hash_file
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Blobs without an entry younger than this may belong to a store in progress
+ORPHAN_GRACE = 60.0
+STAT_KEYS = ('hits', 'misses', 'stored', 'bytes_restored', 'bytes_stored',
+             'evicted', 'evicted_bytes')
+_SIZE_SUFFIXES = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
+
+def default_cache_dir():
+    """$XDG_CACHE_HOME/plutchik-build, else ~/.cache/plutchik-build"""
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'plutchik-build'
+
+
+def parse_size(text):
+    """Parse a size such as 500000, 64K, 256M or 2G into bytes"""
+    value = text.strip().upper().removesuffix('B')
+    suffix = value[-1:] if value[-1:] in _SIZE_SUFFIXES else ''
+    number = float(value[:len(value) - len(suffix)])
+    if number < 0:
+        raise ValueError(f"negative size: {text}")
+    return int(number * _SIZE_SUFFIXES[suffix])
+
+
+def _copy_atomic(source, target):
+    """Put a copy of source at target atomically
+
+    Never a hard link: an output edited in place would change the blob
+    under every checkout that restores it.
+    """
+    tmp_path = temp_path(target)
+    try:
+        shutil.copyfile(source, tmp_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    os.replace(tmp_path, target)
+
+
+class ArtifactStore:
+    """A size-bounded, content-addressed cache directory of stage outputs
+
+    The store is only a path, a limit and counters, so it can be handed to
+    worker processes; 'stats' counts the hits, misses, stores and
+    evictions made through this object.
+    """
+
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = Path(path or default_cache_dir())
+        self.max_bytes = max_bytes
+        self.stats = dict.fromkeys(STAT_KEYS, 0)
+
+    def key(self, stage, fingerprint):
+        """Cache key of a stage from its BuildManifest fingerprint"""
+        material = [stage, fingerprint['version'], fingerprint['config'],
+                    list(fingerprint['inputs'].values())]
+        return hashlib.sha256(json.dumps(material).encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key):
+        return self.path / 'entries' / key[:2] / f"{key}.json"
+
+    def _blob_path(self, digest):
+        return self.path / 'blobs' / digest[:2] / digest
+
+    def _read_entry(self, entry_path):
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            return entry['blob'], int(entry['bytes'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def restore(self, key, output):
+        """Put the cached output of key at output; returns whether it was a hit"""
+        entry_path = self._entry_path(key)
+        entry = self._read_entry(entry_path)
+        if entry is None:
+            self.stats['misses'] += 1
+            return False
+
+        digest, size = entry
+        blob_path = self._blob_path(digest)
+        if hash_file(blob_path) != digest:
+            # Missing, evicted meanwhile, or changed on disk
+            blob_path.unlink(missing_ok=True)
+            entry_path.unlink(missing_ok=True)
+            self.stats['misses'] += 1
+            return False
+
+        output = Path(output)
+        try:
+            output.parent.mkdir(parents=True, exist_ok=True)
+            _copy_atomic(blob_path, output)
+            os.utime(entry_path)
+        except OSError:
+            self.stats['misses'] += 1
+            return False
+        self.stats['hits'] += 1
+        self.stats['bytes_restored'] += size
+        return True
+
+    def store(self, key, output):
+        """Add the output a stage has just built under key"""
+        output = Path(output)
+        digest = hash_file(output)
+        if digest is None:
+            return False
+        size = output.stat().st_size
+        blob_path = self._blob_path(digest)
+        entry_path = self._entry_path(key)
+        try:
+            if not blob_path.exists():
+                blob_path.parent.mkdir(parents=True, exist_ok=True)
+                _copy_atomic(output, blob_path)
+                self.stats['bytes_stored'] += size
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(entry_path, json.dumps({'blob': digest, 'bytes': size}))
+        except OSError as e:
+            print(f"   ⚠️  Artifact cache: cannot store {output.name}: {e}")
+            return False
+        self.stats['stored'] += 1
+        return True
+
+    def evict(self):
+        """Delete least recently used entries until the blobs fit in max_bytes
+
+        An entry's modification time is its last store or restore. A blob
+        is deleted with the last entry that refers to it; blobs no entry
+        refers to are deleted first. Files another process deleted first
+        are skipped. Returns (entries evicted, bytes freed).
+        """
+        entries = []
+        for entry_path in self.path.glob('entries/*/*.json'):
+            try:
+                mtime = entry_path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            entry = self._read_entry(entry_path)
+            entries.append((mtime, entry_path, entry[0] if entry else None))
+
+        blobs = {}
+        for blob_path in self.path.glob('blobs/*/*'):
+            if blob_path.name.startswith('.'):
+                continue
+            try:
+                stat = blob_path.stat()
+            except FileNotFoundError:
+                continue
+            blobs[blob_path.name] = (stat.st_size, stat.st_mtime)
+
+        references = {}
+        for _, _, digest in entries:
+            references[digest] = references.get(digest, 0) + 1
+
+        total = sum(size for size, _ in blobs.values())
+        evicted = freed = 0
+
+        def drop_blob(digest):
+            nonlocal total, freed
+            size, _ = blobs.pop(digest)
+            try:
+                self._blob_path(digest).unlink()
+            except FileNotFoundError:
+                return
+            total -= size
+            freed += size
+
+        now = time.time()
+        for digest, (_, mtime) in list(blobs.items()):
+            if digest not in references and now - mtime > ORPHAN_GRACE:
+                drop_blob(digest)
+
+        entries.sort(key=lambda entry: entry[0])
+        for _, entry_path, digest in entries:
+            if total <= self.max_bytes:
+                break
+            entry_path.unlink(missing_ok=True)
+            evicted += 1
+            references[digest] -= 1
+            if references[digest] == 0 and digest in blobs:
+                drop_blob(digest)
+
+        self.stats['evicted'] += evicted
+        self.stats['evicted_bytes'] += freed
+        return evicted, freed
+
+    def size(self):
+        """Total bytes of the blobs in the store"""
+        total = 0
+        for blob_path in self.path.glob('blobs/*/*'):
+            try:
+                total += blob_path.stat().st_size
+            except FileNotFoundError:
+                pass
+        return total
+
+
+def stats_since(stats, before):
+    """Counters added to stats since the copy before was taken"""
+    return {key: stats[key] - before.get(key, 0) for key in STAT_KEYS}
+
+
+def add_stats(*stats):
+    """Sum the counters of several stats dicts (None entries are ignored)"""
+    return {key: sum(s[key] for s in stats if s) for key in STAT_KEYS}
+
+
+def print_cache_stats(stats, store=None):
+    """Print the hit/miss counters of a run, and the store's size if given"""
+    looked_up = stats['hits'] + stats['misses']
+    rate = f" ({stats['hits'] / looked_up:.0%} hit rate)" if looked_up else ''
+    print(f"\n♻️  Artifact cache: {stats['hits']} hits, {stats['misses']} misses{rate}, "
+          f"{stats['stored']} stored")
+    print(f"   Restored {stats['bytes_restored']:,} bytes, stored {stats['bytes_stored']:,} new bytes")
+    if stats['evicted']:
+        print(f"   Evicted {stats['evicted']} entries ({stats['evicted_bytes']:,} bytes)")
+    if store is not None:
+        print(f"   {store.path}: {store.size():,} of {store.max_bytes:,} bytes")
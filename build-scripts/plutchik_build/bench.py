@@ -0,0 +1,212 @@
+"""
+Micro-benchmarks for the build stages
+
+Each case times one stage function (process_svg, csv_to_json,
+ui_csv_to_json) on one input: the real Spanish and Italian files and
+synthetic copies enlarged 10x and 100x. A case records timing percentiles
+and, from one extra traced run, the peak traced memory and the number of
+memory blocks the call allocated that are still live as it returns: its
+working set (parsed tree, rows, output buffers) including its locals,
+without the temporaries it freed on the way.
+
+Results are plain JSON so they can be kept as a baseline and compared with
+compare_results() on the next run.
+"""
+
+import contextlib
+import gc
+import inspect
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from .emotions import csv_to_json
+from .jsonio import write_atomic
+from .multi import find_configs
+from .pipeline import PROJECT_ROOT, load_config
+from .svg import load_svg, process_svg, write_svg
+from .synthetic import enlarge_emotions_csv, enlarge_svg_tree, enlarge_ui_csv
+from .ui_text import ui_csv_to_json
+
+RESULTS_FORMAT = 1
+DEFAULT_SCALES = [10, 100]
+DEFAULT_THRESHOLD = 0.10
+
+# Metrics compared against the baseline; lower is better for all of them
+COMPARED_METRICS = ['median_ms', 'peak_bytes']
+
+# Stage name -> (config key of the input, stage function, output suffix)
+STAGES = {
+    'process_svg': ('svg_input', process_svg, '.svg'),
+    'csv_to_json': ('csv_file', csv_to_json, '.json'),
+    'ui_csv_to_json': ('ui_csv_file', ui_csv_to_json, '.json'),
+}
+
+
+def percentile(sorted_values, fraction):
+    """Linear-interpolated percentile of an already sorted list"""
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def _enlarge(stage, source, output, factor):
+    if stage == 'process_svg':
+        write_svg(enlarge_svg_tree(load_svg(source), factor), output)
+    elif stage == 'csv_to_json':
+        enlarge_emotions_csv(source, output, factor)
+    else:
+        enlarge_ui_csv(source, output, factor)
+
+
+def collect_cases(work_dir, config_paths=None, scales=DEFAULT_SCALES):
+    """Return [(case name, stage, scale, input path, output path), ...]
+
+    Real inputs come from the language configs; inputs that do not exist
+    are left out. Enlarged copies are written into work_dir.
+    """
+    work_dir = Path(work_dir)
+    cases = []
+    for config_path in (find_configs() if config_paths is None else config_paths):
+        config = load_config(config_path)
+        language = config['language_code']
+        for stage, (key, _, suffix) in STAGES.items():
+            if not config.get(key):
+                continue
+            source = PROJECT_ROOT / config[key]
+            if not source.exists():
+                continue
+            cases.append((f"{stage}/{language}", stage, 1, source,
+                          work_dir / f"{stage}-{language}{suffix}"))
+            for factor in scales:
+                enlarged = work_dir / f"{stage}-{language}-x{factor}-input{source.suffix}"
+                _enlarge(stage, source, enlarged, factor)
+                cases.append((f"{stage}/{language}-x{factor}", stage, factor, enlarged,
+                              work_dir / f"{stage}-{language}-x{factor}{suffix}"))
+    return cases
+
+
+def traced_call(func, args):
+    """Call func(*args) under tracemalloc
+
+    Returns (peak traced bytes, blocks allocated by the call). The blocks
+    are counted in a snapshot taken on the call's return event, while its
+    frame and locals are still alive, so they are not lost when the
+    result or the locals are freed.
+    """
+    caller = inspect.currentframe()
+    blocks = []
+
+    def on_return(frame, event, arg):
+        if event == 'return' and frame.f_back is caller and not blocks:
+            blocks.append(len(tracemalloc.take_snapshot().traces))
+
+    tracemalloc.start()
+    sys.setprofile(on_return)
+    try:
+        func(*args)
+    finally:
+        sys.setprofile(None)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return peak, blocks[0] if blocks else 0
+
+
+def measure_case(func, args, repeat, warmup=1):
+    """Time func(*args) and trace the memory of one extra call"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(warmup):
+            func(*args)
+
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(*args)
+            times.append(time.perf_counter() - start)
+
+        # Memory: peak while the call runs, and the blocks it allocated
+        gc.collect()
+        gc.disable()
+        try:
+            peak, allocated_blocks = traced_call(func, args)
+        finally:
+            gc.enable()
+
+    times.sort()
+    return {
+        'runs': repeat,
+        'min_ms': times[0] * 1000,
+        'median_ms': statistics.median(times) * 1000,
+        'p90_ms': percentile(times, 0.90) * 1000,
+        'p99_ms': percentile(times, 0.99) * 1000,
+        'max_ms': times[-1] * 1000,
+        'peak_bytes': peak,
+        'allocated_blocks': allocated_blocks,
+    }
+
+
+def run_benchmarks(config_paths=None, scales=DEFAULT_SCALES, repeat=20, only=None, progress=None):
+    """Run every case and return the results document
+
+    Enlarged cases run repeat // factor times (at least 5) so a full run
+    stays short. only keeps the cases whose name contains the string.
+    progress, if given, is called with each (name, result) as it finishes.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='plutchik-bench-') as work_dir:
+        for name, stage, factor, source, output in collect_cases(work_dir, config_paths, scales):
+            if only and only not in name:
+                continue
+            runs = max(5, repeat // factor)
+            func = STAGES[stage][1]
+            results[name] = measure_case(func, (source, output), runs)
+            if progress:
+                progress(name, results[name])
+
+    return {
+        'format': RESULTS_FORMAT,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+
+def save_results(document, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(path, json.dumps(document, indent=2) + '\n')
+
+
+def load_results(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_results(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """Compare two results documents case by case
+
+    Returns [(case, metric, baseline value, current value, ratio, regressed)]
+    for every case present in both. A metric regresses when it grew by more
+    than threshold (0.10 = 10%).
+    """
+    rows = []
+    for name, result in current['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if base is None:
+            continue
+        for metric in COMPARED_METRICS:
+            if metric not in base or not base[metric]:
+                continue
+            ratio = result[metric] / base[metric]
+            rows.append((name, metric, base[metric], result[metric], ratio, ratio > 1 + threshold))
+    return rows
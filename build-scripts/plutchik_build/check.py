@@ -0,0 +1,318 @@
+"""
+One-pass translation lint across every locale
+
+check_translations() reads every emotions CSV, UI CSV and SVG mapping once,
+indexes them, and validates all cross-references for all languages:
+
+- emotions CSVs: required columns, duplicate or missing rows, types,
+  colours, and references (opposite, +intense, -intense, combo-emotion-0/1)
+  to emotions that do not exist
+- SVG mappings (languages/<language>-svg-mapping.json): every SVG layer id
+  in BASE_EMOTIONS / INTERMEDIATE_EMOTIONS is mapped, to an emotion of the
+  same type that exists in the CSV, and the mapped references agree with
+  the English template (fear's opposite is anger, so the translation of
+  fear must have the translation of anger as its opposite)
+- UI CSVs: required columns, duplicate keys, empty text, malformed URLs
+  and keys the page template does not know
+
+Nothing is built or written, so a full check takes milliseconds and can run
+before every build and as a pre-commit hook.
+"""
+
+import csv
+import json
+import time
+from collections import namedtuple
+from pathlib import Path
+
+from .graph import RECIPROCAL_FIELDS, REFERENCE_FIELDS
+from .multi import find_configs
+from .page import DEFAULT_UI_TEXT
+from .pipeline import PROJECT_ROOT, load_config, mapping_path
+from .svg import BASE_EMOTIONS, INTERMEDIATE_EMOTIONS
+
+# English emotions CSV whose names are the SVG layer ids
+REFERENCE_CSV = 'template.csv'
+
+EMOTION_COLUMNS = [
+    'emotion', 'type', 'intensity', 'petal-color', 'color', '+intense', '-intense',
+    'opposite', 'similar-words', 'sensations', 'message', 'purpose',
+    'combo-emotion-0', 'combo-emotion-1', 'combo-explanation',
+]
+UI_COLUMNS = ['key', 'text', 'url']
+
+# Columns a row of each type must fill in
+REQUIRED_VALUES = {
+    'base': ['petal-color', 'color', 'intensity', 'opposite'],
+    'intermediate': ['color', 'combo-emotion-0', 'combo-emotion-1', 'combo-explanation'],
+}
+# Text columns the page shows for each type; intermediate emotions have no similar words
+TEXT_COLUMNS = {
+    'base': ['similar-words', 'sensations', 'message', 'purpose'],
+    'intermediate': ['sensations', 'message', 'purpose'],
+}
+EXPECTED_COUNTS = {'base': len(BASE_EMOTIONS), 'intermediate': len(INTERMEDIATE_EMOTIONS)}
+
+ERROR = 'error'
+WARNING = 'warning'
+
+Issue = namedtuple('Issue', ['severity', 'path', 'line', 'code', 'message'])
+
+
+def _is_color(value):
+    return len(value) == 7 and value[0] == '#' and all(c in '0123456789abcdefABCDEF' for c in value[1:])
+
+
+class Checker:
+    """Collects issues and caches every parsed file, so each is read once"""
+
+    def __init__(self, project_root=None):
+        self.project_root = Path(project_root or PROJECT_ROOT)
+        self.issues = []
+        self.files = {}
+
+    def report(self, severity, path, line, code, message):
+        self.issues.append(Issue(severity, self._relative(path), line, code, message))
+
+    def _relative(self, path):
+        try:
+            return Path(path).resolve().relative_to(self.project_root.resolve()).as_posix()
+        except ValueError:
+            return str(path)
+
+    def read_csv(self, path, columns):
+        """Return [(line, row), ...] for a CSV, or None if it cannot be used"""
+        path = Path(path)
+        try:
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                reader = csv.DictReader(f)
+                missing = [c for c in columns if c not in (reader.fieldnames or [])]
+                if missing:
+                    self.report(ERROR, path, 1, 'missing-column',
+                                f"missing column(s): {', '.join(missing)}")
+                    return None
+                rows = []
+                for row in reader:
+                    rows.append((reader.line_num, {k: (v or '').strip() for k, v in row.items() if k}))
+                return rows
+        except FileNotFoundError:
+            self.report(ERROR, path, None, 'missing-file', "file not found")
+        except UnicodeDecodeError as e:
+            self.report(ERROR, path, None, 'bad-encoding', f"not UTF-8: {e}")
+        return None
+
+    def emotions(self, path):
+        """Check an emotions CSV once and return {name: (line, row)}, or None"""
+        path = Path(path)
+        key = ('emotions', path.resolve())
+        if key not in self.files:
+            self.files[key] = self._check_emotions(path)
+        return self.files[key]
+
+    def ui_text(self, path):
+        """Check a UI CSV once"""
+        path = Path(path)
+        key = ('ui', path.resolve())
+        if key not in self.files:
+            self.files[key] = self._check_ui(path)
+        return self.files[key]
+
+    def _check_emotions(self, path):
+        rows = self.read_csv(path, EMOTION_COLUMNS)
+        if rows is None:
+            return None
+
+        index = {}
+        counts = {'base': 0, 'intermediate': 0}
+        for line, row in rows:
+            name = row['emotion']
+            if not name:
+                self.report(ERROR, path, line, 'missing-value', "row has no emotion name")
+                continue
+            if name in index:
+                self.report(ERROR, path, line, 'duplicate-emotion',
+                            f"{name!r} already defined on line {index[name][0]}")
+                continue
+            index[name] = (line, row)
+
+            emotion_type = row['type']
+            if emotion_type not in REQUIRED_VALUES:
+                self.report(ERROR, path, line, 'unknown-type',
+                            f"{name}: type {emotion_type!r} is not 'base' or 'intermediate'")
+                continue
+            counts[emotion_type] += 1
+
+            for column in REQUIRED_VALUES[emotion_type]:
+                if not row[column]:
+                    self.report(ERROR, path, line, 'missing-value', f"{name}: {column} is empty")
+            for column in TEXT_COLUMNS[emotion_type]:
+                if not row[column]:
+                    self.report(WARNING, path, line, 'missing-value', f"{name}: {column} is empty")
+            for column in ('petal-color', 'color'):
+                if row[column] and not _is_color(row[column]):
+                    self.report(ERROR, path, line, 'bad-color',
+                                f"{name}: {column} {row[column]!r} is not a #rrggbb colour")
+
+        for line, row in index.values():
+            name = row['emotion']
+            for column in REFERENCE_FIELDS:
+                target = row[column]
+                if not target or row['type'] not in REQUIRED_VALUES:
+                    continue
+                if target not in index:
+                    self.report(ERROR, path, line, 'unknown-reference',
+                                f"{name}: {column} refers to unknown emotion {target!r}")
+                elif column in RECIPROCAL_FIELDS:
+                    back = index[target][1][RECIPROCAL_FIELDS[column]]
+                    if back != name:
+                        self.report(WARNING, path, line, 'non-reciprocal',
+                                    f"{name}: {column} is {target!r}, but the "
+                                    f"{RECIPROCAL_FIELDS[column]} of {target!r} is {back!r}")
+
+        for emotion_type, expected in EXPECTED_COUNTS.items():
+            if counts[emotion_type] != expected:
+                self.report(ERROR, path, None, 'row-count',
+                            f"{counts[emotion_type]} {emotion_type} emotions, expected {expected}")
+        return index
+
+    def _check_ui(self, path):
+        rows = self.read_csv(path, UI_COLUMNS)
+        if rows is None:
+            return None
+
+        keys = {}
+        for line, row in rows:
+            key = row['key']
+            if not key:
+                continue
+            if key in keys:
+                self.report(ERROR, path, line, 'duplicate-key',
+                            f"{key!r} already defined on line {keys[key]}")
+                continue
+            keys[key] = line
+            if not row['text']:
+                self.report(ERROR, path, line, 'missing-value', f"{key}: text is empty")
+            if row['url'] and not row['url'].startswith(('https://', 'http://')):
+                self.report(ERROR, path, line, 'bad-url', f"{key}: {row['url']!r} is not an http(s) URL")
+            if key not in DEFAULT_UI_TEXT:
+                self.report(WARNING, path, line, 'unknown-key', f"{key!r} is not used by the page template")
+
+        missing = [key for key in DEFAULT_UI_TEXT if key not in keys]
+        if missing:
+            self.report(WARNING, path, None, 'missing-key',
+                        f"falls back to English for: {', '.join(missing)}")
+        return keys
+
+    def mapping(self, path, csv_path, index, reference):
+        """Check an SVG layer id -> emotion name mapping against its CSV"""
+        self.files[('mapping', Path(path).resolve())] = True
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                mapping = json.load(f)
+        except ValueError as e:
+            self.report(ERROR, path, None, 'bad-json', str(e))
+            return
+
+        svg_ids = BASE_EMOTIONS + INTERMEDIATE_EMOTIONS
+        for svg_id in svg_ids:
+            if svg_id not in mapping:
+                self.report(ERROR, path, None, 'mapping-missing-id', f"no emotion for SVG layer {svg_id!r}")
+        for svg_id in mapping:
+            if svg_id not in svg_ids:
+                self.report(ERROR, path, None, 'mapping-unknown-id', f"{svg_id!r} is not an SVG layer id")
+
+        seen = {}
+        for svg_id, name in mapping.items():
+            if name in seen:
+                self.report(ERROR, path, None, 'mapping-duplicate',
+                            f"{svg_id!r} and {seen[name]!r} both map to {name!r}")
+            seen[name] = svg_id
+
+        if index is None:
+            return
+        csv_name = self._relative(csv_path)
+        for svg_id, name in mapping.items():
+            if svg_id not in svg_ids:
+                continue
+            if name not in index:
+                self.report(ERROR, path, None, 'mapping-unknown-emotion',
+                            f"{svg_id!r} maps to {name!r}, which is not in {csv_name}")
+                continue
+            expected_type = 'base' if svg_id in BASE_EMOTIONS else 'intermediate'
+            line, row = index[name]
+            if row['type'] != expected_type:
+                self.report(ERROR, csv_path, line, 'mapping-type-mismatch',
+                            f"{name} is {row['type']!r}, but SVG layer {svg_id!r} is {expected_type!r}")
+                continue
+
+            # The translated references must follow the English ones
+            if not reference or svg_id not in reference:
+                continue
+            english_row = reference[svg_id][1]
+            for column in REFERENCE_FIELDS:
+                expected = mapping.get(english_row[column]) if english_row[column] else ''
+                if row[column] != (expected or ''):
+                    self.report(WARNING, csv_path, line, 'mapping-reference-mismatch',
+                                f"{name}: {column} is {row[column]!r}, but {svg_id}'s {column} "
+                                f"{english_row[column]!r} maps to {expected!r}")
+
+
+def check_translations(config_paths=None, project_root=None, translations_dir=None,
+                       scan_translations=True):
+    """Lint every language and return (issues, files_checked, elapsed)
+
+    config_paths defaults to every languages/*-config.json. With
+    scan_translations, all emotions and UI CSVs in the translations
+    directory are checked as well, so files no config refers to yet are
+    covered.
+    """
+    start = time.perf_counter()
+    project_root = Path(project_root or PROJECT_ROOT)
+    translations_dir = Path(translations_dir or project_root / 'translations')
+    checker = Checker(project_root)
+
+    reference_csv = translations_dir / REFERENCE_CSV
+    reference = checker.emotions(reference_csv) if reference_csv.exists() else None
+
+    for config_path in (find_configs() if config_paths is None else config_paths):
+        config = load_config(config_path)
+        csv_path = project_root / config['csv_file']
+        index = None
+        if csv_path.exists():
+            index = checker.emotions(csv_path)
+        else:
+            checker.report(WARNING, config_path, None, 'missing-file',
+                           f"csv_file {config['csv_file']} not found; the build reuses {config['json_file']}")
+
+        if config.get('ui_csv_file'):
+            checker.ui_text(project_root / config['ui_csv_file'])
+
+        svg_mapping = mapping_path(config_path, config)
+        if svg_mapping.exists():
+            checker.mapping(svg_mapping, csv_path, index, reference)
+
+    for path in sorted(translations_dir.glob('*.csv')) if scan_translations else []:
+        if path.name.startswith('ui-'):
+            checker.ui_text(path)
+        else:
+            checker.emotions(path)
+
+    return checker.issues, len(checker.files), time.perf_counter() - start
+
+
+def format_issue(issue):
+    location = issue.path if issue.line is None else f"{issue.path}:{issue.line}"
+    icon = '❌' if issue.severity == ERROR else '⚠️ '
+    return f"{icon} {location}: [{issue.code}] {issue.message}"
+
+
+def print_check_report(issues, files_checked, elapsed):
+    """Print every issue and a summary line; returns the number of errors"""
+    for issue in issues:
+        print(format_issue(issue))
+    errors = sum(1 for issue in issues if issue.severity == ERROR)
+    warnings = len(issues) - errors
+    icon = '❌' if errors else '✅'
+    print(f"{icon} Checked {files_checked} files in {elapsed * 1000:.1f}ms: "
+          f"{errors} error(s), {warnings} warning(s)")
+    return errors
@@ -0,0 +1,198 @@
+"""
+Compact columnar encoding of the emotions JSON
+
+The webapp JSON repeats every field name for each of the 32 emotions. The
+compact encoding stores each field once, with one column of values per
+field:
+
+    {
+        "format": "plutchik-columns",
+        "version": 2,
+        "names": ["serenidad", "alegría", ...],
+        "palette": ["ffca05", "ffed9f", ...],
+        "fields": [["petal-color", "color"], ["intensity", "text"], ...],
+        "columns": [[0, 0, 0, 4, ...], ["bajo", "medio", ...], ...]
+    }
+
+Decoder contract: columns[f][i] is the value of fields[f] for names[i],
+where null means the emotion has no such field. By field kind:
+
+    text   the string itself
+    list   a list of strings joined with "; ", or a string kept as is
+    color  an index into palette; the colour is "#" + palette[index]
+    ref    [id, colour]: id indexes names and the value is that emotion's
+           name; colour indexes palette and is that emotion's "color"
+
+decode_compact() (and decode_compact_emotions() in js/emotions-compact.js)
+turns a payload back into a dict equal to the webapp JSON.
+decode_compact_links() (decode_compact_links() in the same script) reads
+the references already resolved, equal to graph.emotion_links(), so the
+page never looks a neighbour up to colour its button.
+"""
+
+import json
+from pathlib import Path
+
+from .graph import REFERENCE_FIELDS, GraphError, check_emotions, emotion_links
+from .jsonio import write_atomic
+
+COMPACT_FORMAT = 'plutchik-columns'
+COMPACT_VERSION = 2
+
+COLOR_FIELDS = ['petal-color', 'color']
+LIST_FIELDS = ['similar-words', 'sensations', 'purpose']
+LIST_SEPARATOR = '; '
+
+
+def field_kind(field):
+    if field in COLOR_FIELDS:
+        return 'color'
+    if field in REFERENCE_FIELDS:
+        return 'ref'
+    if field in LIST_FIELDS:
+        return 'list'
+    return 'text'
+
+
+def split_list(value):
+    """Split a ';'-separated value, unless joining it back would change it"""
+    parts = [part.strip() for part in value.split(';')]
+    if len(parts) > 1 and LIST_SEPARATOR.join(parts) == value:
+        return parts
+    return value
+
+
+def encode_compact(emotions_data):
+    """Encode the webapp emotions dict into the columnar format
+
+    Raises GraphError when a reference names an unknown emotion, since it
+    could not be stored as an index.
+    """
+    errors, _ = check_emotions(emotions_data)
+    if errors:
+        raise GraphError(errors)
+
+    names = list(emotions_data)
+    ids = {name: i for i, name in enumerate(names)}
+
+    fields = []
+    for emotion_obj in emotions_data.values():
+        for field in emotion_obj:
+            if field not in fields:
+                fields.append(field)
+
+    palette = []
+    palette_ids = {}
+
+    def palette_id(value):
+        color = value.lstrip('#')
+        if color not in palette_ids:
+            palette_ids[color] = len(palette)
+            palette.append(color)
+        return palette_ids[color]
+
+    columns = []
+    for field in fields:
+        kind = field_kind(field)
+        column = []
+        for emotion_obj in emotions_data.values():
+            value = emotion_obj.get(field)
+            if value is None:
+                column.append(None)
+            elif kind == 'color':
+                column.append(palette_id(value))
+            elif kind == 'ref':
+                column.append([ids[value], palette_id(emotions_data[value]['color'])])
+            elif kind == 'list':
+                column.append(split_list(value))
+            else:
+                column.append(value)
+        columns.append(column)
+
+    return {
+        'format': COMPACT_FORMAT,
+        'version': COMPACT_VERSION,
+        'names': names,
+        'palette': palette,
+        'fields': [[field, field_kind(field)] for field in fields],
+        'columns': columns,
+    }
+
+
+def _check_payload(payload):
+    if payload.get('format') != COMPACT_FORMAT or payload.get('version') != COMPACT_VERSION:
+        raise ValueError(f"not a {COMPACT_FORMAT} v{COMPACT_VERSION} payload")
+
+
+def decode_compact(payload):
+    """Decode a columnar payload back into the webapp emotions dict"""
+    _check_payload(payload)
+
+    names = payload['names']
+    palette = payload['palette']
+    emotions_data = {name: {} for name in names}
+
+    for (field, kind), column in zip(payload['fields'], payload['columns']):
+        for name, value in zip(names, column):
+            if value is None:
+                continue
+            if kind == 'color':
+                value = '#' + palette[value]
+            elif kind == 'ref':
+                value = names[value[0]]
+            elif kind == 'list' and isinstance(value, list):
+                value = LIST_SEPARATOR.join(value)
+            emotions_data[name][field] = value
+
+    return emotions_data
+
+
+def decode_compact_links(payload):
+    """The resolved references of a payload, like graph.emotion_links()"""
+    _check_payload(payload)
+
+    names = payload['names']
+    palette = payload['palette']
+    links = {name: {} for name in names}
+
+    for (field, kind), column in zip(payload['fields'], payload['columns']):
+        if kind != 'ref':
+            continue
+        for name, value in zip(names, column):
+            if value is not None:
+                target, color = value
+                links[name][field] = {'id': target, 'name': names[target], 'color': '#' + palette[color]}
+
+    return links
+
+
+def dumps_compact(payload):
+    """Serialize a payload without any optional whitespace"""
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':'))
+
+
+def write_compact(emotions_data, compact_file_path):
+    """Encode the emotions and write the compact JSON atomically
+
+    Returns the payload.
+    """
+    payload = encode_compact(emotions_data)
+    if decode_compact(payload) != emotions_data:
+        raise ValueError("compact encoding does not round-trip")
+    if decode_compact_links(payload) != emotion_links(emotions_data):
+        raise ValueError("compact encoding does not keep the resolved references")
+
+    compact_file_path = Path(compact_file_path)
+    write_atomic(compact_file_path, dumps_compact(payload))
+
+    print(f"✅ Encoded {len(payload['names'])} emotions into "
+          f"{len(payload['fields'])} columns ({compact_file_path.stat().st_size:,} bytes)")
+    print(f"   Output: {compact_file_path}")
+    return payload
+
+
+def json_to_compact(json_file_path, compact_file_path):
+    """Write the compact encoding of an existing webapp JSON file"""
+    with open(json_file_path, 'r', encoding='utf-8') as f:
+        emotions_data = json.load(f)
+    return write_compact(emotions_data, compact_file_path)
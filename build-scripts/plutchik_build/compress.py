@@ -0,0 +1,140 @@
+"""
+Precompressed siblings for static build artifacts
+
+Every artifact gets a maximum-level .gz next to it, plus .br and .zst when
+the brotli / zstandard modules are importable, so a static server can send
+precompressed bytes without compressing per request. A size manifest
+records the raw and compressed size of each file.
+
+gzip output is deterministic (no file name or timestamp in the header), so
+rebuilding unchanged files produces identical bytes.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .jsonio import write_atomic
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+SIZE_MANIFEST = 'precompressed.json'
+
+
+def _gzip(data):
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _brotli(data):
+    return brotli.compress(data, quality=11)
+
+
+def _zstd(data):
+    return zstandard.ZstdCompressor(level=22).compress(data)
+
+
+def available_encodings():
+    """Return {encoding: (suffix, compress function)} for this interpreter"""
+    encodings = {'gzip': ('.gz', _gzip)}
+    if brotli is not None:
+        encodings['br'] = ('.br', _brotli)
+    if zstandard is not None:
+        encodings['zstd'] = ('.zst', _zstd)
+    return encodings
+
+
+def precompress_file(path, encodings=None):
+    """Write compressed siblings of one file and return its size entry
+
+    A sibling is only kept if it is smaller than the raw file; a stale one
+    is removed otherwise, so the server falls back to the raw bytes.
+    """
+    path = Path(path)
+    encodings = encodings or available_encodings()
+    data = path.read_bytes()
+
+    entry = {
+        'raw': len(data),
+        'sha256': hashlib.sha256(data).hexdigest(),
+    }
+    for encoding, (suffix, compress) in encodings.items():
+        sibling = path.with_name(path.name + suffix)
+        compressed = compress(data)
+        if len(compressed) < len(data):
+            write_atomic(sibling, compressed)
+            entry[encoding] = len(compressed)
+        elif sibling.exists():
+            sibling.unlink()
+
+    return entry
+
+
+def precompress(paths, manifest_path=None, root=None, jobs=None):
+    """Precompress several files in parallel and update the size manifest
+
+    zlib, brotli and zstandard release the GIL while compressing, so a
+    thread pool keeps all cores busy without process start-up cost.
+    Manifest keys are paths relative to root (default: the manifest's
+    directory). Returns {key: entry} for the files processed.
+    """
+    paths = [Path(p) for p in paths if Path(p).exists()]
+    encodings = available_encodings()
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        entries = list(pool.map(lambda p: precompress_file(p, encodings), paths))
+
+    if manifest_path is None:
+        return {str(p): e for p, e in zip(paths, entries)}
+
+    manifest_path = Path(manifest_path)
+    root = Path(root or manifest_path.parent).resolve()
+
+    def key(path):
+        try:
+            return path.resolve().relative_to(root).as_posix()
+        except ValueError:
+            return str(path.resolve())
+
+    results = {key(p): e for p, e in zip(paths, entries)}
+
+    manifest = {}
+    if manifest_path.exists():
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding='utf-8')).get('files', {})
+        except ValueError:
+            manifest = {}
+    manifest.update(results)
+
+    data = json.dumps({'encodings': sorted(encodings), 'files': manifest},
+                      indent=2, sort_keys=True) + '\n'
+    write_atomic(manifest_path, data.encode('utf-8'))
+    return results
+
+
+def print_size_report(results):
+    """Print raw and compressed sizes of each file"""
+    encodings = sorted({k for e in results.values() for k in e} - {'raw', 'sha256'})
+    header = ''.join(f"{enc:>10}" for enc in encodings)
+    print(f"{'File':<36} {'raw':>10}{header}")
+    totals = {'raw': 0, **{enc: 0 for enc in encodings}}
+    for name, entry in sorted(results.items()):
+        cells = ''
+        for enc in encodings:
+            size = entry.get(enc)
+            cells += f"{size:>10,}" if size is not None else f"{'-':>10}"
+            totals[enc] += size if size is not None else entry['raw']
+        totals['raw'] += entry['raw']
+        print(f"{name:<36} {entry['raw']:>10,}{cells}")
+    cells = ''.join(f"{totals[enc]:>10,}" for enc in encodings)
+    print(f"{'Total':<36} {totals['raw']:>10,}{cells}")
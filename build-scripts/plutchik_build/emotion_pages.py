@@ -0,0 +1,292 @@
+"""
+Prerendered emotion detail fragments and pages
+
+js/scripts*.js fills the detail panel (#content) field by field after the
+emotions JSON has loaded. write_emotion_pages() renders that panel at
+build time for every emotion of a language, from the same text-*.json
+and ui-text-*.json:
+
+    <pages dir>/<emotion>.html            deep-linkable page, no JS needed
+    <pages dir>/fragments/<emotion>.html  the panel's inner HTML
+    <pages dir>/index.json                emotion -> name, page, fragment
+
+<emotion> is the English SVG layer id from the language's SVG mapping, so
+URLs stay ASCII and the same across languages. The fragments use the
+template's ids and classes (#emotion-title, #emotion-description,
+#explore-container), so the client can swap one in as a whole; the
+emotion a button leads to is in its data-emotion attribute. Pages wrap
+the same fragment in links to the neighbouring pages.
+
+Every file is written to a temporary name and renamed into place, and
+files of emotions that no longer exist are removed once the new index is
+written. plutchik_build.multi.prerender_many() renders several languages
+on a process pool.
+"""
+
+import html
+import json
+import os
+from pathlib import Path
+
+from .jsonio import write_atomic
+from .page import EMOTION_NAME_SPAN, ui_html, ui_url
+
+INDEX_NAME = 'index.json'
+FRAGMENTS_DIR = 'fragments'
+DISABLED_ARROW_COLOR = '#D3D3D3'
+DETAIL_FIELDS = ('similar-words', 'sensations', 'message', 'purpose')
+# UI label of each detail field
+FIELD_LABELS = {
+    'similar-words': 'similar_words_label',
+    'sensations': 'sensations_label',
+    'message': 'message_label',
+    'purpose': 'purpose_label',
+}
+
+PAGE_TEMPLATE = """<!doctype html>
+<html lang="{lang}">
+    <head>
+        <meta charset="utf-8">
+        <title>{title}</title>
+        <meta name="description" content="{description}">
+        <link rel="stylesheet" href="{css_href}">
+    </head>
+    <body>
+        <div class='main-container'>
+            <div class='words column'>
+                <div id='content'>
+{fragment}
+                    <div id='more-info-container'>
+                        <span id='more-info-text'>{learn_more}</span>
+{links}
+                    </div>
+                    <div id='sei-container'>
+                        <i>{cta_intro} </i><a href='{cta_url}' target='_blank'>{cta_text}</a>
+                    </div>
+                    <p><a href='{home_href}'>{home_text}</a></p>
+                </div>
+            </div>
+        </div>
+    </body>
+</html>
+"""
+
+
+def capitalize(word):
+    """First letter upper-cased, like capitalization_helper() in the page scripts"""
+    return word[:1].upper() + word[1:]
+
+
+def is_base_emotion(emotion):
+    return all(key in emotion for key in ('intensity', 'opposite'))
+
+
+def is_intermediate_emotion(emotion):
+    return all(key in emotion for key in ('combo-emotion-0', 'combo-emotion-1', 'combo-explanation'))
+
+
+def emotion_slugs(emotions, mapping=None):
+    """Map each emotion name to its URL name: the English SVG layer id
+
+    Emotions the mapping does not cover keep their own name.
+    """
+    english = {name: svg_id for svg_id, name in (mapping or {}).items()}
+    return {name: english.get(name, name) for name in emotions}
+
+
+def _escape(text):
+    return html.escape(str(text), quote=True)
+
+
+def _name_html(name):
+    return f"<span class='emotion-name'>{_escape(capitalize(name))}</span>"
+
+
+class FragmentRenderer:
+    """Renders the detail panel of the emotions of one language
+
+    href, when given, maps a slug to the URL a navigation button links to.
+    """
+
+    def __init__(self, emotions, ui_text, slugs, href=None):
+        self.emotions = emotions
+        self.ui_text = ui_text
+        self.slugs = slugs
+        self.href = href
+
+    def _link(self, element, target):
+        if self.href is None:
+            return element
+        return f"<a href='{_escape(self.href(self.slugs[target]))}'>{element}</a>"
+
+    def _button(self, element_id, target):
+        color = self.emotions[target]['color']
+        button = (f"<div id='{element_id}' class='label' data-emotion='{_escape(self.slugs[target])}' "
+                  f"style='background-color: {_escape(color)}'>{_escape(capitalize(target))}</div>")
+        return self._link(button, target)
+
+    def _arrow(self, direction, target):
+        points, sign, text_y, size = (('20,0 40,20 0,20', '+', '12px', '9px') if direction == 'increase'
+                                      else ('20,20 40,0 0,0', '-', '8', '20px'))
+        text_id = 'plus' if direction == 'increase' else 'minus'
+        enabled = target is not None
+        color = self.emotions[target]['color'] if enabled else DISABLED_ARROW_COLOR
+        data = f" data-emotion='{_escape(self.slugs[target])}'" if enabled else ''
+        arrow = (f"<svg class='explore-shape {direction}-intensity{' enabled' if enabled else ''}'{data} "
+                 f"viewBox='0 0 40 20'>"
+                 f"<polygon class='explore-arrow' points='{points}' style='fill: {_escape(color)}'/>"
+                 f"<text id='{text_id}' class='label' x='20px' y='{text_y}' font-size='{size}' "
+                 f"dominant-baseline='middle' text-anchor='middle'>{sign}</text></svg>")
+        return self._link(arrow, target) if enabled else arrow
+
+    def _label(self, key, name):
+        return ui_html(self.ui_text, key).replace(EMOTION_NAME_SPAN, _name_html(name))
+
+    def render(self, name):
+        """Return the inner HTML of #content for one emotion"""
+        emotion = self.emotions[name]
+        base = is_base_emotion(emotion)
+        if not base and not is_intermediate_emotion(emotion):
+            raise ValueError(f"properties for {name!r} are not properly defined")
+
+        title_color = emotion['petal-color'] if base else emotion['color']
+        parts = [f"<div id='emotion-title' class='emotion-name' "
+                 f"style='background-color: {_escape(title_color)}'>{_escape(capitalize(name))}</div>",
+                 "<div id='emotion-description'>", "<br>"]
+        for field in DETAIL_FIELDS:
+            if field in emotion:
+                parts.append(f"<span id='{field}-line'>{self._label(FIELD_LABELS[field], name)} "
+                             f"<i><span id='{field}'>{_escape(emotion[field])}</span></i>"
+                             f"<br><br></span>")
+        parts += ["<br>", "</div>", "<div id='explore-container'>"]
+
+        if base:
+            parts += [
+                "<div id='base-emotion-explore-container'>",
+                self._arrow('increase', emotion.get('+intense')),
+                f"<span id='change-intensity-text'>{ui_html(self.ui_text, 'change_intensity_text')}</span>",
+                f"<span id='intensity-text'><i>{ui_html(self.ui_text, 'intensity_label')} "
+                f"<span id='intensity'>{_escape(emotion['intensity'])}</span> </i></span>",
+                self._arrow('decrease', emotion.get('-intense')),
+                f"<span id='opposite-text'>{ui_html(self.ui_text, 'opposite_text')}</span>",
+                self._button('opposite-button', emotion['opposite']),
+                "</div>",
+            ]
+        else:
+            parts += [
+                "<div id='intermediate-emotion-explore-container'>",
+                self._button('combo-emotion-0-button', emotion['combo-emotion-0']),
+                "<div style='text-align: center; font-size: 30px;'>+</div>",
+                self._button('combo-emotion-1-button', emotion['combo-emotion-1']),
+                "<br>",
+                f"<div style='text-align: center; width: 90%;'><i><span id='combo-explanation'>"
+                f"{_escape(emotion['combo-explanation'])}</span></i></div>",
+                "</div>",
+            ]
+        parts.append("</div>")
+        return '\n'.join(parts)
+
+
+def render_page(config, ui_text, name, emotion, fragment, css_href, home_href):
+    """Wrap a fragment into a standalone page for one emotion"""
+    links = []
+    for key in ('eq_what_text', 'eq_iq_text', 'seven_things_text'):
+        links.append(f"                        <div class='temp-div'><a href='{ui_url(ui_text, key)}' "
+                     f"target='_blank'>{ui_html(ui_text, key)}</a></div>")
+    page_title = ui_html(ui_text, 'page_title')
+    return PAGE_TEMPLATE.format(
+        lang=_escape(config['language_code']),
+        title=f"{_escape(capitalize(name))} · {page_title}",
+        description=_escape(emotion.get('message') or emotion.get('similar-words') or name),
+        css_href=_escape(css_href),
+        fragment='\n'.join(f"                    {line}" for line in fragment.splitlines()),
+        learn_more=ui_html(ui_text, 'learn_more_heading'),
+        links='\n'.join(links),
+        cta_intro=ui_html(ui_text, 'cta_intro'),
+        cta_url=ui_url(ui_text, 'cta_link_text'),
+        cta_text=ui_html(ui_text, 'cta_link_text'),
+        home_href=_escape(home_href),
+        home_text=page_title,
+    )
+
+
+def _load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _relative_url(target, start_dir):
+    return Path(os.path.relpath(target, start_dir)).as_posix()
+
+
+def emotion_pages_files(pages_dir):
+    """Index, pages and fragments written into pages_dir, none before a build"""
+    pages_dir = Path(pages_dir)
+    index = pages_dir / INDEX_NAME
+    if not index.exists():
+        return []
+    return [index] + sorted(pages_dir.glob('*.html')) + sorted((pages_dir / FRAGMENTS_DIR).glob('*.html'))
+
+
+def write_emotion_pages(config, emotions, ui_text, mapping, pages_dir, project_root,
+                        output_root=None):
+    """Write the fragment and page of every emotion and the pages index
+
+    project_root holds the stylesheet and output_root (default
+    project_root) the language page the emotion pages link back to.
+    Returns the index written.
+    """
+    project_root = Path(project_root)
+    output_root = Path(output_root or project_root)
+    pages_dir = Path(pages_dir)
+    fragments_dir = pages_dir / FRAGMENTS_DIR
+    fragments_dir.mkdir(parents=True, exist_ok=True)
+
+    index_path = pages_dir / INDEX_NAME
+    old_index = _load_json(index_path) if index_path.exists() else {}
+
+    slugs = emotion_slugs(emotions, mapping)
+    fragments = FragmentRenderer(emotions, ui_text, slugs)
+    pages = FragmentRenderer(emotions, ui_text, slugs, href=lambda slug: f"{slug}.html")
+    css_href = _relative_url(project_root / config['css_file'], pages_dir)
+    home_href = _relative_url(output_root / config['html_output'], pages_dir)
+
+    index = {}
+    for name, emotion in emotions.items():
+        slug = slugs[name]
+        fragment_name = f"{FRAGMENTS_DIR}/{slug}.html"
+        page_name = f"{slug}.html"
+        write_atomic(pages_dir / fragment_name, fragments.render(name) + '\n')
+        page = render_page(config, ui_text, name, emotion, pages.render(name), css_href,
+                           f"{home_href}#{slug}")
+        write_atomic(pages_dir / page_name, page)
+        index[slug] = {'name': name, 'page': page_name, 'fragment': fragment_name}
+
+    write_atomic(index_path, json.dumps(index, ensure_ascii=False, indent=4) + '\n')
+
+    # Only remove what an earlier run wrote, never unrelated files
+    for slug, entry in old_index.items():
+        if slug not in index:
+            for key in ('page', 'fragment'):
+                (pages_dir / entry[key]).unlink(missing_ok=True)
+    return index
+
+
+def run_emotion_pages_stage(*files, config, ui_json_file=None, mapping_file=None,
+                            project_root, output_root=None, emotions=None, ui_text=None):
+    """Pipeline stage: files are the stage inputs, the emotions JSON first,
+    then the pages index to write
+
+    ui_json_file and mapping_file are read when given; emotions / ui_text
+    already in memory are used instead of reading them back.
+    """
+    json_file, index_path = files[0], Path(files[-1])
+    if emotions is None:
+        emotions = _load_json(json_file)
+    if ui_text is None:
+        ui_text = _load_json(ui_json_file) if ui_json_file else {}
+    mapping = _load_json(mapping_file) if mapping_file else None
+    index = write_emotion_pages(config, emotions, ui_text, mapping, index_path.parent,
+                                project_root, output_root)
+    print(f"✅ Prerendered {len(index)} emotion pages and fragments in {index_path.parent}")
+    return index
@@ -0,0 +1,79 @@
+"""
+Convert CSV emotion translations to the JSON format used by the webapp
+"""
+
+import csv
+
+from .jsonio import write_json
+
+
+def emotion_from_row(row):
+    """Return (name, webapp emotion object) for one emotions CSV row"""
+
+    emotion = row['emotion'].strip()
+    emotion_type = row['type'].strip()
+
+    # Build the emotion object based on type
+    emotion_obj = {}
+
+    if emotion_type == 'base':
+        # Base emotions have petal-color, intensity, +/-intense, opposite
+        emotion_obj['petal-color'] = row['petal-color'].strip()
+        emotion_obj['color'] = row['color'].strip()
+        emotion_obj['intensity'] = row['intensity'].strip()
+
+        if row['+intense'].strip():
+            emotion_obj['+intense'] = row['+intense'].strip()
+        if row['-intense'].strip():
+            emotion_obj['-intense'] = row['-intense'].strip()
+
+        emotion_obj['opposite'] = row['opposite'].strip()
+
+    elif emotion_type == 'intermediate':
+        # Intermediate emotions have combo-emotion-0, combo-emotion-1, combo-explanation
+        emotion_obj['color'] = row['color'].strip()
+        emotion_obj['combo-emotion-0'] = row['combo-emotion-0'].strip()
+        emotion_obj['combo-emotion-1'] = row['combo-emotion-1'].strip()
+        emotion_obj['combo-explanation'] = row['combo-explanation'].strip()
+
+    # Common fields for all emotions
+    emotion_obj['similar-words'] = row['similar-words'].strip()
+    emotion_obj['sensations'] = row['sensations'].strip()
+    emotion_obj['message'] = row['message'].strip()
+    emotion_obj['purpose'] = row['purpose'].strip()
+
+    return emotion, emotion_obj
+
+
+def read_emotions_csv(csv_file_path):
+    """Parse an emotions CSV file and return the webapp data dict"""
+
+    emotions_data = {}
+
+    with open(csv_file_path, 'r', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile)
+
+        for row in reader:
+            emotion, emotion_obj = emotion_from_row(row)
+            emotions_data[emotion] = emotion_obj
+
+    return emotions_data
+
+
+def csv_to_json(csv_file_path, json_file_path):
+    """Convert CSV emotion translations to JSON format
+
+    Returns the parsed emotions dict so callers can reuse it without
+    reading the JSON file back from disk.
+    """
+
+    emotions_data = read_emotions_csv(csv_file_path)
+
+    # Write to JSON file with proper formatting
+    write_json(emotions_data, json_file_path)
+
+    print(f"✅ Converted {len(emotions_data)} emotions from CSV to JSON")
+    print(f"   Input:  {csv_file_path}")
+    print(f"   Output: {json_file_path}")
+
+    return emotions_data
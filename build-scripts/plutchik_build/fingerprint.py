@@ -0,0 +1,177 @@
+"""
+Content-hashed asset filenames for immutable caching
+
+Assets (CSS, JS, JSON, SVG) are copied into an output directory under a
+name that includes a hash of their content, e.g. css/styles-es.3f2a9c1b70.css.
+References to them in pages and in other assets are rewritten to the new
+names, and an asset manifest maps every original path to its fingerprinted
+one. Pages (index*.html, the prerendered emotion pages) keep their names,
+since they are the entry points.
+
+An asset is hashed after its own references have been rewritten, so a
+changed text-es.json also gives scripts-es.js a new name.
+"""
+
+import hashlib
+import json
+import posixpath
+import re
+from pathlib import Path
+
+from .jsonio import write_atomic
+
+ASSET_MANIFEST = 'asset-manifest.json'
+HASH_LENGTH = 10
+
+# URL prefixes that point at the deployed site root, e.g. the S3 bucket
+# js/scripts.js loads text.json from
+REMOTE_PREFIXES = [
+    'https://6secus.s3.amazonaws.com/website/plutchik-webapp-testing/plutchik-webapp/',
+]
+
+TEXT_SUFFIXES = {'.html', '.js', '.css', '.svg', '.json'}
+# Files whose relative URLs resolve against their own directory
+RELATIVE_SUFFIXES = ('.css', '.html')
+
+_QUOTED_RE = re.compile(r'''(["'])([^"'\s<>()]+?)\1''')
+_CSS_URL_RE = re.compile(r'''url\(\s*(["']?)([^"')\s]+)\1\s*\)''')
+_SCHEME_RE = re.compile(r'^[a-zA-Z][a-zA-Z0-9+.-]*:|^//')
+
+
+class FingerprintError(ValueError):
+    """Assets whose references cannot be resolved"""
+
+
+def fingerprinted_name(rel_path, content):
+    """Insert a content hash before the suffix of rel_path"""
+    digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+    directory, name = posixpath.split(rel_path)
+    stem, dot, suffix = name.rpartition('.')
+    new_name = f"{stem}.{digest}.{suffix}" if dot else f"{name}.{digest}"
+    return posixpath.join(directory, new_name)
+
+
+def _resolve(reference, referrer, assets, remote_prefixes):
+    """Map a reference string to (asset path, prefix to keep), or None"""
+    url = reference.split('#', 1)[0].split('?', 1)[0]
+
+    prefix = ''
+    for remote in remote_prefixes:
+        if url.startswith(remote):
+            prefix, url = remote, url[len(remote):]
+            break
+    else:
+        if _SCHEME_RE.match(url):
+            return None
+
+    if url.startswith('/'):
+        path = url.lstrip('/')
+    elif referrer.endswith(RELATIVE_SUFFIXES) and not prefix:
+        # CSS url() values are relative to the stylesheet, page URLs to the page
+        path = posixpath.join(posixpath.dirname(referrer), url)
+    else:
+        # Scripts resolve URLs against the page, and their pages live at the root
+        path = url
+    path = posixpath.normpath(path)
+
+    if path in assets:
+        return path, prefix
+    return None
+
+
+def find_references(rel_path, text, assets, remote_prefixes=REMOTE_PREFIXES):
+    """Return the asset paths referenced from a text file"""
+    found = set()
+    for pattern in (_QUOTED_RE, _CSS_URL_RE):
+        for match in pattern.finditer(text):
+            resolved = _resolve(match.group(2), rel_path, assets, remote_prefixes)
+            if resolved:
+                found.add(resolved[0])
+    found.discard(rel_path)
+    return found
+
+
+def rewrite_references(rel_path, text, renamed, remote_prefixes=REMOTE_PREFIXES):
+    """Replace references to renamed assets with their fingerprinted names"""
+
+    def replace(match):
+        value = match.group(2)
+        resolved = _resolve(value, rel_path, renamed, remote_prefixes)
+        if not resolved:
+            return match.group(0)
+        target, prefix = resolved
+        new_target = renamed[target]
+        if not prefix and not value.startswith('/') and rel_path.endswith(RELATIVE_SUFFIXES):
+            new_value = posixpath.relpath(new_target, posixpath.dirname(rel_path) or '.')
+        else:
+            new_value = prefix + ('/' if value.startswith('/') else '') + new_target
+        # Keep any query string or fragment
+        rest = value[len(value.split('#', 1)[0].split('?', 1)[0]):]
+        whole, offset = match.group(0), match.start()
+        start, end = match.span(2)
+        return whole[:start - offset] + new_value + rest + whole[end - offset:]
+
+    text = _QUOTED_RE.sub(replace, text)
+    text = _CSS_URL_RE.sub(replace, text)
+    return text
+
+
+def _read(root, rel_path):
+    return (Path(root) / rel_path).read_bytes()
+
+
+def _is_text(rel_path):
+    return posixpath.splitext(rel_path)[1] in TEXT_SUFFIXES
+
+
+def fingerprint_assets(root, assets, pages, output_dir, remote_prefixes=REMOTE_PREFIXES):
+    """Copy assets under content-hashed names and rewrite every reference
+
+    assets and pages are paths relative to root. Returns the asset manifest
+    {original path: fingerprinted path}; it is also written to
+    output_dir/asset-manifest.json.
+    """
+    root = Path(root)
+    output_dir = Path(output_dir)
+    assets = sorted({posixpath.normpath(a) for a in assets if (root / a).exists()})
+    pages = sorted({posixpath.normpath(p) for p in pages if (root / p).exists()})
+    asset_set = set(assets)
+
+    contents = {path: _read(root, path) for path in assets + pages}
+    references = {
+        path: find_references(path, contents[path].decode('utf-8'), asset_set, remote_prefixes)
+        if _is_text(path) else set()
+        for path in assets + pages
+    }
+
+    renamed = {}
+    outputs = {}
+    pending = list(assets)
+    while pending:
+        ready = [path for path in pending if references[path] <= renamed.keys()]
+        if not ready:
+            raise FingerprintError(f"circular references between assets: {sorted(pending)}")
+        for path in ready:
+            content = contents[path]
+            if references[path]:
+                text = rewrite_references(path, content.decode('utf-8'), renamed, remote_prefixes)
+                content = text.encode('utf-8')
+            renamed[path] = fingerprinted_name(path, content)
+            outputs[renamed[path]] = content
+            pending.remove(path)
+
+    for path in pages:
+        content = contents[path]
+        if references[path]:
+            content = rewrite_references(path, content.decode('utf-8'), renamed,
+                                         remote_prefixes).encode('utf-8')
+        outputs[path] = content
+
+    for rel_path, content in outputs.items():
+        target = output_dir / rel_path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(target, content)
+
+    manifest = dict(sorted(renamed.items()))
+    write_atomic(output_dir / ASSET_MANIFEST, json.dumps(manifest, indent=2) + '\n')
+    return manifest
@@ -0,0 +1,175 @@
+"""
+Resolved emotion graph: the references between emotions, checked and inlined
+
+The webapp JSON stores neighbours by name ('opposite', '+intense',
+'combo-emotion-0', ...). build_emotion_graph() resolves those names once,
+at build time: every emotion becomes a node with an integer id, and each
+neighbour reference is replaced by {"id", "name", "color"}. A reference to
+an emotion that does not exist fails the build instead of breaking the
+page; references that resolve but look inconsistent (an opposite that
+does not point back) are reported as warnings.
+
+    {
+        "format": 1,
+        "ids": {"serenidad": 0, ...},
+        "nodes": [
+            {"id": 0, "name": "serenidad", "type": "base", "color": "#ffed9f",
+             "opposite": {"id": 12, "name": "pensativo", "color": "#a0c0e5"}, ...},
+            ...
+        ]
+    }
+
+The page receives the resolved references, not the whole graph: the data
+island carries emotion_links() next to the emotions, and the compact
+payload stores each reference as the neighbour's id and colour (see
+compact.py). The page scripts read a neighbour's colour from there instead
+of looking the neighbour up on every click. The graph file itself is for
+other tools.
+"""
+
+import json
+import re
+
+from .jsonio import write_json
+
+GRAPH_FORMAT = 1
+
+# Fields that name another emotion
+REFERENCE_FIELDS = ['+intense', '-intense', 'opposite', 'combo-emotion-0', 'combo-emotion-1']
+
+# Fields whose target should point back through the paired field
+RECIPROCAL_FIELDS = {
+    'opposite': 'opposite',
+    '+intense': '-intense',
+    '-intense': '+intense',
+}
+
+_COLOR_RE = re.compile(r'^#[0-9a-fA-F]{6}$')
+
+
+class GraphError(ValueError):
+    """Broken references between emotions"""
+
+    def __init__(self, problems):
+        self.problems = problems
+        super().__init__(f"{len(problems)} problem(s) in the emotion graph:\n  "
+                         + '\n  '.join(problems))
+
+
+def emotion_type(emotion_obj):
+    """Return 'base', 'intermediate' or 'other' from the fields present"""
+    if 'opposite' in emotion_obj:
+        return 'base'
+    if 'combo-emotion-0' in emotion_obj:
+        return 'intermediate'
+    return 'other'
+
+
+def check_emotions(emotions_data):
+    """Check the references between emotions
+
+    Returns (errors, warnings). Errors are references the page cannot
+    follow: unknown emotions, missing or malformed colours. Warnings are
+    references that resolve but look inconsistent, such as an opposite that
+    does not point back or has a different intensity.
+    """
+    errors = []
+    warnings = []
+    for name, emotion_obj in emotions_data.items():
+        for field in ('color', 'petal-color'):
+            color = emotion_obj.get(field)
+            if color is not None and not _COLOR_RE.match(color):
+                errors.append(f"{name}: {field} {color!r} is not a #rrggbb colour")
+
+        for field in REFERENCE_FIELDS:
+            target = emotion_obj.get(field)
+            if target is None:
+                continue
+            if target not in emotions_data:
+                errors.append(f"{name}: {field} refers to unknown emotion {target!r}")
+                continue
+            target_obj = emotions_data[target]
+            if 'color' not in target_obj:
+                errors.append(f"{name}: {field} {target!r} has no color")
+
+            if field in RECIPROCAL_FIELDS:
+                back = target_obj.get(RECIPROCAL_FIELDS[field])
+                if back != name:
+                    warnings.append(f"{name}: {field} is {target!r}, but the "
+                                    f"{RECIPROCAL_FIELDS[field]} of {target!r} is {back!r}")
+            if field == 'opposite' and target_obj.get('intensity') != emotion_obj.get('intensity'):
+                warnings.append(f"{name}: opposite {target!r} has intensity "
+                                f"{target_obj.get('intensity')!r}, not {emotion_obj.get('intensity')!r}")
+    return errors, warnings
+
+
+def _resolve_graph(emotions_data):
+    ids = {name: i for i, name in enumerate(emotions_data)}
+
+    nodes = []
+    for name, emotion_obj in emotions_data.items():
+        node = {'id': ids[name], 'name': name, 'type': emotion_type(emotion_obj)}
+        for field, value in emotion_obj.items():
+            if field in REFERENCE_FIELDS:
+                node[field] = {
+                    'id': ids[value],
+                    'name': value,
+                    'color': emotions_data[value]['color'],
+                }
+            else:
+                node[field] = value
+        nodes.append(node)
+
+    return {'format': GRAPH_FORMAT, 'ids': ids, 'nodes': nodes}
+
+
+def build_emotion_graph(emotions_data):
+    """Resolve the webapp emotions dict into the graph format
+
+    Node ids follow the order of the emotions data (the CSV row order).
+    Raises GraphError listing every broken reference.
+    """
+    errors, _ = check_emotions(emotions_data)
+    if errors:
+        raise GraphError(errors)
+    return _resolve_graph(emotions_data)
+
+
+def graph_links(graph):
+    """The resolved references of every node
+
+    Returns {name: {field: {"id", "name", "color"}}}, with an entry (maybe
+    empty) for every emotion.
+    """
+    return {node['name']: {field: node[field] for field in REFERENCE_FIELDS if field in node}
+            for node in graph['nodes']}
+
+
+def emotion_links(emotions_data):
+    """graph_links() of the emotions; raises GraphError like build_emotion_graph()"""
+    return graph_links(build_emotion_graph(emotions_data))
+
+
+def write_emotion_graph(emotions_data, graph_file_path):
+    """Check the references, print the warnings and write the graph
+
+    Returns the graph dict; raises GraphError like build_emotion_graph().
+    """
+    errors, warnings = check_emotions(emotions_data)
+    if errors:
+        raise GraphError(errors)
+    graph = _resolve_graph(emotions_data)
+    write_json(graph, graph_file_path)
+
+    for warning in warnings:
+        print(f"⚠️  {warning}")
+    print(f"✅ Resolved {len(graph['nodes'])} emotions into a graph")
+    print(f"   Output: {graph_file_path}")
+    return graph
+
+
+def json_to_graph(json_file_path, graph_file_path):
+    """Build the graph from an existing webapp JSON file"""
+    with open(json_file_path, 'r', encoding='utf-8') as f:
+        emotions_data = json.load(f)
+    return write_emotion_graph(emotions_data, graph_file_path)
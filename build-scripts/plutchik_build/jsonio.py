@@ -0,0 +1,87 @@
+"""
+Shared output helpers for the build stages
+
+Every output is written under a temporary name next to it and renamed
+into place, so readers never see a partial file.
+"""
+
+import contextlib
+import json
+import os
+from pathlib import Path
+
+
+def temp_path(path):
+    """The temporary name of path for this process"""
+    path = Path(path)
+    return path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+
+@contextlib.contextmanager
+def atomic_output(path, mode='w', **kwargs):
+    """Open a temporary file for path and rename it into place on success
+
+    The temporary file is removed if the block raises.
+    """
+    path = Path(path)
+    tmp_path = temp_path(path)
+    try:
+        with open(tmp_path, mode, **kwargs) as f:
+            yield f
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    os.replace(tmp_path, path)
+
+
+def write_atomic(path, data):
+    """Write bytes, or text as UTF-8, to path atomically"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    with atomic_output(path, 'wb') as f:
+        f.write(data)
+
+
+def write_json(data, json_file_path):
+    """Write data as UTF-8 JSON using the webapp's formatting, atomically"""
+    with atomic_output(json_file_path, 'w', encoding='utf-8') as jsonfile:
+        json.dump(data, jsonfile, ensure_ascii=False, indent=4)
+
+
+class JsonObjectWriter:
+    """Write a top-level JSON object one member at a time
+
+    The output is byte-identical to write_json() of the same dict, but
+    only the member being written is held in memory. Members go to a
+    temporary file next to json_file_path; commit() renames it into place
+    (finish() only completes it) and abort() removes it, so readers never
+    see a partial file.
+    """
+
+    def __init__(self, json_file_path):
+        self.path = Path(json_file_path)
+        self.tmp_path = temp_path(self.path)
+        self.count = 0
+        self._file = open(self.tmp_path, 'w', encoding='utf-8')
+        self._file.write('{')
+
+    def add(self, key, value):
+        """Append one member; keys must not repeat"""
+        member = json.dumps(value, ensure_ascii=False, indent=4).replace('\n', '\n    ')
+        separator = ',\n    ' if self.count else '\n    '
+        self._file.write(f"{separator}{json.dumps(key, ensure_ascii=False)}: {member}")
+        self.count += 1
+
+    def finish(self):
+        """Complete the temporary file without moving it into place"""
+        if not self._file.closed:
+            self._file.write('\n}' if self.count else '}')
+            self._file.close()
+
+    def commit(self):
+        self.finish()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        self._file.close()
+        self.tmp_path.unlink(missing_ok=True)
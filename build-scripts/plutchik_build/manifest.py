@@ -0,0 +1,192 @@
+"""
+Build manifest for incremental builds
+
+For every output the manifest records the SHA-256 of each input file, of
+the config entries the stage reads, of the stage's own source code and of
+the output it produced. A stage is skipped when all of these still match.
+
+One manifest is kept per language (.build-manifest/<language_code>.json
+under the output root) so parallel language builds never write the same
+file.
+"""
+
+import ast
+import hashlib
+import json
+from pathlib import Path
+
+from .jsonio import atomic_output
+
+MANIFEST_DIR = '.build-manifest'
+MANIFEST_FORMAT = 1
+
+_PACKAGE_DIR = Path(__file__).resolve().parent
+
+# Modules that implement each stage; the stage's version is the hash of
+# these and of every package module they import (see stage_sources())
+STAGE_SOURCES = {
+    'emotions': ['emotions.py'],
+    'ui_text': ['ui_text.py'],
+    'graph': ['graph.py'],
+    'compact': ['compact.py'],
+    'emotion_pages': ['emotion_pages.py'],
+    'svg': ['svg.py', 'svg_stream.py', 'svg_identify.py', 'svg_minify.py', 'svg_simplify.py',
+            'svg_styles.py', 'svg_split.py', 'svg_text.py', 'emotions.py'],
+    'hitmap': ['svg_hitmap.py'],
+}
+
+# The stage runners in pipeline.py choose each stage's steps, their order
+# and their options, so a change there changes every stage's output. Its
+# imports are not followed: they are every stage module of the package.
+RUNNER_SOURCES = ['pipeline.py']
+
+_stage_versions = {}
+
+
+def hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path):
+    """Return the SHA-256 hex digest of a file, or None if it does not exist"""
+    h = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                h.update(chunk)
+    except FileNotFoundError:
+        return None
+    return h.hexdigest()
+
+
+def hash_config(config, keys):
+    """Hash only the config entries a stage depends on"""
+    subset = {key: config.get(key) for key in keys}
+    return hash_bytes(json.dumps(subset, sort_keys=True).encode('utf-8'))
+
+
+def package_imports(name):
+    """Package modules (file names) a module of this package imports"""
+    tree = ast.parse((_PACKAGE_DIR / name).read_bytes(), name)
+    imported = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.ImportFrom) or node.level != 1:
+            continue
+        if node.module:
+            imported.add(node.module.split('.')[0] + '.py')
+        else:
+            # from . import module
+            imported.update(alias.name + '.py' for alias in node.names)
+    return {module for module in imported if (_PACKAGE_DIR / module).exists()}
+
+
+def stage_sources(stage):
+    """STAGE_SOURCES of a stage, everything they import and the runners, sorted
+
+    Following the imports keeps a stage's version from missing a helper
+    module it only reaches indirectly, e.g. the path parser in
+    svg_minify.py that the hit map uses through svg_identify.py.
+    """
+    sources = set()
+    pending = list(STAGE_SOURCES[stage])
+    while pending:
+        name = pending.pop()
+        if name not in sources:
+            sources.add(name)
+            pending.extend(package_imports(name))
+    return sorted(sources.union(RUNNER_SOURCES))
+
+
+def stage_version(stage):
+    """Hash of the source code implementing a stage"""
+    if stage not in _stage_versions:
+        h = hashlib.sha256()
+        for name in stage_sources(stage):
+            h.update(name.encode('utf-8') + b'\0')
+            h.update((_PACKAGE_DIR / name).read_bytes())
+        _stage_versions[stage] = h.hexdigest()
+    return _stage_versions[stage]
+
+
+class BuildManifest:
+    """Per-language record of what each stage was last built from"""
+
+    def __init__(self, path, force=False):
+        self.path = Path(path)
+        self.force = force
+        self.entries = {}
+        self.report = []
+
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('format') == MANIFEST_FORMAT:
+                    self.entries = data.get('stages', {})
+            except (OSError, ValueError):
+                # A corrupt manifest only costs a full rebuild
+                self.entries = {}
+
+    @classmethod
+    def for_language(cls, output_root, language_code, force=False):
+        return cls(Path(output_root) / MANIFEST_DIR / f"{language_code}.json", force)
+
+    def fingerprint(self, stage, inputs, output, config, config_keys):
+        """Describe the current state of a stage's inputs"""
+        return {
+            'output': str(output),
+            'inputs': {str(p): hash_file(p) for p in inputs},
+            'config': hash_config(config, config_keys),
+            'version': stage_version(stage),
+        }
+
+    def rebuild_reason(self, stage, fingerprint):
+        """Return why a stage must run, or None if it is up to date"""
+        if self.force:
+            return 'forced (--force)'
+
+        entry = self.entries.get(stage)
+        if entry is None:
+            return 'no previous build recorded'
+        if entry.get('output') != fingerprint['output']:
+            return 'output path changed'
+        if entry.get('version') != fingerprint['version']:
+            return 'stage code changed'
+        if entry.get('config') != fingerprint['config']:
+            return 'config changed'
+
+        old_inputs = entry.get('inputs', {})
+        for path, digest in fingerprint['inputs'].items():
+            if old_inputs.get(path) != digest:
+                return f"input changed: {path}"
+        if set(old_inputs) != set(fingerprint['inputs']):
+            return 'input list changed'
+
+        output_hash = hash_file(fingerprint['output'])
+        if output_hash is None:
+            return 'output missing'
+        if output_hash != entry.get('output_hash'):
+            return 'output modified since last build'
+
+        return None
+
+    def record(self, stage, fingerprint, reason, action='rebuilt'):
+        """Store the fingerprint of a stage that has just been rebuilt
+
+        action is 'restored' when the output came from the artifact cache
+        (see plutchik_build.artifacts) instead.
+        """
+        entry = dict(fingerprint)
+        entry['output_hash'] = hash_file(fingerprint['output'])
+        self.entries[stage] = entry
+        self.report.append((stage, action, reason))
+
+    def skip(self, stage):
+        self.report.append((stage, 'skipped', 'inputs unchanged'))
+
+    def save(self):
+        """Write the manifest atomically"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_output(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'format': MANIFEST_FORMAT, 'stages': self.entries},
+                      f, indent=2, sort_keys=True)
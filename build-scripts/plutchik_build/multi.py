@@ -0,0 +1,219 @@
+"""
+Build several language versions at the same time on a process pool
+
+Each language is built in its own worker process. Output from a worker is
+captured and handed back with its result, so logs from different languages
+do not interleave and a failing locale never aborts the others.
+"""
+
+import contextlib
+import io
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from .emotion_pages import write_emotion_pages
+from .pipeline import PROJECT_ROOT, build_language, load_config, load_json, mapping_path, resolve_paths
+from .profiling import PROFILE_DIR, profile_build
+from .svg import load_svg
+from .svg_styles import canonicalize_svg_styles, write_stylesheet
+
+LANGUAGES_DIR = PROJECT_ROOT / 'languages'
+
+
+def find_configs(languages_dir=None):
+    """Return every *-config.json in the languages directory, sorted by name"""
+    languages_dir = Path(languages_dir or LANGUAGES_DIR)
+    return sorted(languages_dir.glob('*-config.json'))
+
+
+def unique_configs(config_paths):
+    """Drop configs named more than once, however the path is spelled
+
+    languages/spanish-config.json and the absolute path find_configs()
+    returns are the same language; building it twice at once would race
+    on its outputs and manifest. Keeps the first spelling of each.
+    """
+    seen = set()
+    unique = []
+    for config_path in config_paths:
+        resolved = Path(config_path).resolve()
+        if resolved not in seen:
+            seen.add(resolved)
+            unique.append(config_path)
+    return unique
+
+
+def _summary(config_path, **fields):
+    """Summary of a config before (or instead of) its result
+
+    Every summary has 'config', 'language', 'ok', 'elapsed' and 'error';
+    fields are the keys of one kind of run with their empty values.
+    """
+    summary = {
+        'config': str(config_path),
+        'language': Path(config_path).stem.replace('-config', ''),
+        'ok': False,
+        'elapsed': 0.0,
+        'error': None,
+    }
+    summary.update(fields)
+    return summary
+
+
+def build_summary(config_path):
+    return _summary(config_path, log='', report=[], profile=None, cache=None)
+
+
+def prerender_summary(config_path):
+    return _summary(config_path, pages=0, pages_dir=None)
+
+
+def run_many(func, config_paths, jobs, new_summary, *args):
+    """Run func(config_path, *args) for every config on a process pool
+
+    func returns a picklable summary and never raises; a worker that dies
+    anyway (killed, unpicklable result) gets new_summary(config_path) with
+    the error. jobs defaults to the number of cores, and one job runs in
+    this process. Returns (summaries, wall_time) with summaries in config
+    order.
+    """
+    config_paths = [Path(p) for p in config_paths]
+    if not config_paths:
+        return [], 0.0
+
+    jobs = jobs or os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(config_paths)))
+
+    start = time.perf_counter()
+    summaries = {}
+
+    if jobs == 1:
+        for config_path in config_paths:
+            summaries[config_path] = func(config_path, *args)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {pool.submit(func, config_path, *args): config_path
+                       for config_path in config_paths}
+            for future in as_completed(futures):
+                config_path = futures[future]
+                try:
+                    summaries[config_path] = future.result()
+                except Exception as e:
+                    summaries[config_path] = new_summary(config_path)
+                    summaries[config_path]['error'] = f"{type(e).__name__}: {e}"
+
+    wall_time = time.perf_counter() - start
+    return [summaries[p] for p in config_paths], wall_time
+
+
+def build_one(config_path, project_root=None, output_root=None, force=False,
+              profile=False, cprofile_stages=(), pstats_dir=PROFILE_DIR, cache=None):
+    """Build a single language and return a picklable summary
+
+    The summary holds 'config', 'language', 'ok', 'elapsed', 'log',
+    'report', 'error', with profile set the build's 'profile' trace
+    entry (see plutchik_build.profiling) and with cache, an
+    ArtifactStore, the build's artifact 'cache' counters. Exceptions are
+    caught and reported, never raised.
+    """
+    log = io.StringIO()
+    summary = build_summary(config_path)
+
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(log):
+            if profile:
+                result, summary['profile'] = profile_build(
+                    config_path,
+                    lambda profiler: build_language(config_path, project_root, output_root,
+                                                    force, profiler, cache=cache),
+                    cprofile_stages, pstats_dir)
+            else:
+                result = build_language(config_path, project_root, output_root, force,
+                                        cache=cache)
+        if result:
+            summary['ok'] = True
+            summary['report'] = result['report']
+            summary['cache'] = result['cache']
+            summary['language'] = result['config']['language_name']
+        else:
+            summary['error'] = 'a build stage failed'
+    except Exception as e:
+        summary['error'] = f"{type(e).__name__}: {e}"
+        log.write(traceback.format_exc())
+    summary['elapsed'] = time.perf_counter() - start
+    summary['log'] = log.getvalue()
+
+    return summary
+
+
+def build_many(config_paths, jobs=None, project_root=None, output_root=None,
+               force=False, profile=False, cprofile_stages=(), pstats_dir=PROFILE_DIR,
+               cache=None):
+    """Build every config on a process pool sized to the available cores
+
+    profile, cprofile_stages, pstats_dir and cache are passed on to
+    build_one(); every worker gets its own copy of the cache.
+    Returns (summaries, wall_time) where summaries are in config order.
+    """
+    return run_many(build_one, config_paths, jobs, build_summary,
+                    project_root, output_root, force, profile, cprofile_stages, pstats_dir, cache)
+
+
+def collect_shared_styles(config_paths, css_path, project_root=None, output_root=None):
+    """Write the canonical style rules of every built SVG to one stylesheet
+
+    Reads the <style> blocks of the processed SVGs of every config that
+    sets "svg_canonical_styles". Returns (number of shared classes, configs
+    that were left out).
+    """
+    shared = {}
+    skipped = []
+    for config_path in config_paths:
+        config = load_config(config_path)
+        svg_processed = resolve_paths(config, project_root, output_root)['svg_processed']
+        if not config.get('svg_canonical_styles') or not svg_processed.exists():
+            skipped.append(str(config_path))
+            continue
+        # Canonicalizing canonical rules is a no-op that returns them
+        shared.update(canonicalize_svg_styles(load_svg(svg_processed)))
+    write_stylesheet(shared, css_path)
+    return len(shared), skipped
+
+
+def prerender_one(config_path, project_root=None, output_root=None):
+    """Prerender the emotion pages of one built language; returns a picklable summary
+
+    Reads the built emotions and UI JSON. The summary holds 'config',
+    'language', 'ok', 'elapsed', 'pages', 'pages_dir' and 'error'.
+    Exceptions are caught and reported, never raised.
+    """
+    summary = prerender_summary(config_path)
+    start = time.perf_counter()
+    try:
+        config = load_config(config_path)
+        summary['language'] = config['language_name']
+        paths = resolve_paths(config, project_root, output_root)
+        if not paths['emotion_pages_dir']:
+            raise ValueError('the config sets no "emotion_pages_dir"')
+        ui_json_file = paths['ui_json_file']
+        ui_text = load_json(ui_json_file) if ui_json_file and ui_json_file.exists() else {}
+        svg_mapping = mapping_path(config_path, config, project_root)
+        index = write_emotion_pages(config, load_json(paths['json_file']), ui_text,
+                                    load_json(svg_mapping) if svg_mapping.exists() else None,
+                                    paths['emotion_pages_dir'], project_root or PROJECT_ROOT,
+                                    output_root)
+        summary.update(ok=True, pages=len(index), pages_dir=str(paths['emotion_pages_dir']))
+    except Exception as e:
+        summary['error'] = f"{type(e).__name__}: {e}"
+    summary['elapsed'] = time.perf_counter() - start
+    return summary
+
+
+def prerender_many(config_paths, jobs=None, project_root=None, output_root=None):
+    """Prerender every config on a process pool; returns (summaries, wall_time)"""
+    return run_many(prerender_one, config_paths, jobs, prerender_summary,
+                    project_root, output_root)
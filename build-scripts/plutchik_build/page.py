@@ -0,0 +1,188 @@
+"""
+Self-contained language pages
+
+compile_page() fills build-scripts/template.html with a language's UI text
+and inlines everything the first paint needs: the processed SVG, the
+stylesheet, and the emotions and UI JSON as a data island
+
+    <script type="application/json" id="plutchik-data">{"emotions": ..., "links": ..., "ui": ...}</script>
+
+The page scripts read the island instead of fetching text.json, so a page
+is one response with no extra round-trip before the wheel is clickable.
+"links" holds every emotion's references resolved at build time
+(graph.emotion_links()), so a click never looks up a neighbour's colour.
+"""
+
+import html
+import json
+import re
+from pathlib import Path
+from string import Template
+
+from .graph import emotion_links
+from .jsonio import write_atomic
+
+DATA_ISLAND_ID = 'plutchik-data'
+TEMPLATE_PATH = Path(__file__).resolve().parent.parent / 'template.html'
+
+# UI text used when a language's UI CSV has no entry for a key
+DEFAULT_UI_TEXT = {
+    'page_title': ('Plutchik Emotions Wheel', None),
+    'placeholder_title': ('Click on a word to explore', None),
+    'placeholder_text': ('Use this interactive Plutchik Model to learn more about your emotions!', None),
+    'similar_words_label': ('Similar words:', None),
+    'sensations_label': ('Typical sensations:', None),
+    'message_label': ('What is {emotion} telling you?', None),
+    'purpose_label': ('How can {emotion} help you?', None),
+    'change_intensity_text': ('Change Intensity', None),
+    'intensity_label': ('Intensity:', None),
+    'opposite_text': ('Explore the opposite:', None),
+    'learn_more_heading': ('Learn more:', None),
+    'eq_what_text': ('What is Emotional Intelligence?', 'https://www.youtube.com/watch?v=7iB__2vYMxM'),
+    'eq_iq_text': ('EQ & IQ', 'https://www.youtube.com/watch?v=5-6mHyFJhno'),
+    'seven_things_text': ('7 Things About Emotions', 'https://6seconds.org/2020/06/03/7-things-emotions-know/'),
+    'cta_intro': ('Want to start training your EQ?', None),
+    'cta_link_text': ('Start with the Practicing EQ Book', 'https://6seconds.org/practicing-eq-book/'),
+}
+
+# Client helpers of optional build outputs: config key -> (script, whether
+# a page with a data island uses it). The page loads them before its own
+# script when the config has the key.
+HELPER_SCRIPTS = {
+    'compact_json_file': ('js/emotions-compact.js', False),
+    'emotion_pages_dir': ('js/emotion-fragments.js', True),
+    'svg_hitmap_file': ('js/emotion-hitmap.js', True),
+}
+
+# Where the emotion name goes in labels such as message_label
+EMOTION_NAME_SPAN = "<span class='emotion-name'></span>"
+
+_XML_PROLOG_RE = re.compile(r'^\s*(<\?xml[^>]*\?>\s*)+')
+
+
+class PageError(ValueError):
+    """Content that cannot be inlined into a page safely"""
+
+
+def ui_value(ui_text, key):
+    """Return (text, url) for a UI key, falling back to the English default"""
+    entry = ui_text.get(key)
+    default_text, default_url = DEFAULT_UI_TEXT[key]
+    if not entry or not entry.get('text'):
+        return default_text, default_url
+    return entry['text'], entry.get('url') or default_url
+
+
+def ui_html(ui_text, key):
+    """HTML-escaped UI text, with {emotion} replaced by the emotion name span"""
+    text, _ = ui_value(ui_text, key)
+    return html.escape(text, quote=False).replace('{emotion}', EMOTION_NAME_SPAN)
+
+
+def ui_url(ui_text, key):
+    _, url = ui_value(ui_text, key)
+    return html.escape(url or '')
+
+
+def inline_svg(svg_text):
+    """Strip the XML declaration so an SVG file can sit inside HTML"""
+    return _XML_PROLOG_RE.sub('', svg_text).strip()
+
+
+def data_island(emotions, ui_text):
+    """Return the <script type="application/json"> element holding the page data
+
+    '<' only occurs inside JSON strings, so writing it as \\u003c keeps the
+    text from closing the script element without changing the parsed data.
+    """
+    payload = json.dumps({'emotions': emotions, 'links': emotion_links(emotions), 'ui': ui_text},
+                         ensure_ascii=False, separators=(',', ':'))
+    payload = payload.replace('<', '\\u003c')
+    return f'<script type="application/json" id="{DATA_ISLAND_ID}">{payload}</script>'
+
+
+def _inline_element(tag, text, source):
+    if re.search(rf'</{tag}', text, re.I):
+        raise PageError(f"{source} contains '</{tag}' and cannot be inlined")
+    return f"<{tag}>\n{text.strip()}\n        </{tag}>"
+
+
+def render_page(config, emotions, ui_text, svg_text, css_text=None, js_text=None,
+                template_path=TEMPLATE_PATH):
+    """Fill the page template and return the HTML
+
+    css_text / js_text are inlined when given; otherwise the page links to
+    the config's css_file / js_file. The HELPER_SCRIPTS of the config's
+    outputs are linked before the page script.
+    """
+    template = Template(Path(template_path).read_text(encoding='utf-8'))
+
+    if css_text is not None:
+        stylesheet = _inline_element('style', css_text, config['css_file'])
+    else:
+        stylesheet = f'<link rel="stylesheet" href="{html.escape(config["css_file"])}">'
+
+    if js_text is not None:
+        script = _inline_element('script', js_text, config['js_file'])
+    else:
+        script = f'<script src="{html.escape(config["js_file"])}"></script>'
+    for key, (helper, with_island) in reversed(HELPER_SCRIPTS.items()):
+        if config.get(key) and with_island:
+            script = f'<script src="{html.escape(helper)}"></script>\n        {script}'
+
+    return template.substitute(
+        LANG_CODE=html.escape(config['language_code']),
+        PAGE_TITLE=ui_html(ui_text, 'page_title'),
+        STYLESHEET=stylesheet,
+        SVG=inline_svg(svg_text),
+        PLACEHOLDER_TITLE=ui_html(ui_text, 'placeholder_title'),
+        PLACEHOLDER_TEXT=ui_html(ui_text, 'placeholder_text'),
+        SIMILAR_WORDS_LABEL=ui_html(ui_text, 'similar_words_label'),
+        SENSATIONS_LABEL=ui_html(ui_text, 'sensations_label'),
+        MESSAGE_LABEL=ui_html(ui_text, 'message_label'),
+        PURPOSE_LABEL=ui_html(ui_text, 'purpose_label'),
+        CHANGE_INTENSITY_TEXT=ui_html(ui_text, 'change_intensity_text'),
+        INTENSITY_LABEL=ui_html(ui_text, 'intensity_label'),
+        OPPOSITE_TEXT=ui_html(ui_text, 'opposite_text'),
+        LEARN_MORE_TEXT=ui_html(ui_text, 'learn_more_heading'),
+        EQ_QUESTION=ui_html(ui_text, 'eq_what_text'),
+        EQ_VIDEO_URL=ui_url(ui_text, 'eq_what_text'),
+        IQ_EQ_QUESTION=ui_html(ui_text, 'eq_iq_text'),
+        IQ_EQ_VIDEO_URL=ui_url(ui_text, 'eq_iq_text'),
+        SEVEN_THINGS_QUESTION=ui_html(ui_text, 'seven_things_text'),
+        SEVEN_THINGS_URL=ui_url(ui_text, 'seven_things_text'),
+        CTA_INTRO=ui_html(ui_text, 'cta_intro'),
+        CTA_TEXT=ui_html(ui_text, 'cta_link_text'),
+        CTA_URL=ui_url(ui_text, 'cta_link_text'),
+        DATA_ISLAND=data_island(emotions, ui_text),
+        SCRIPT=script,
+    )
+
+
+def compile_page(config, project_root, output_root=None, output_path=None,
+                 inline_css=True, inline_js=False, emotions=None, ui_text=None):
+    """Build a language's self-contained page from its built JSON and SVG
+
+    Built files (JSON, processed SVG) are read from output_root, hand-written
+    ones (CSS, JS) from project_root. emotions / ui_text can be passed in to
+    skip reading the JSON back. Returns the path written.
+    """
+    project_root = Path(project_root)
+    output_root = Path(output_root or project_root)
+
+    if emotions is None:
+        emotions = json.loads((output_root / config['json_file']).read_text(encoding='utf-8'))
+    if ui_text is None:
+        ui_path = output_root / config['ui_json_file'] if config.get('ui_json_file') else None
+        ui_text = json.loads(ui_path.read_text(encoding='utf-8')) if ui_path and ui_path.exists() else {}
+
+    svg_text = (output_root / config['svg_processed']).read_text(encoding='utf-8')
+    css_text = (project_root / config['css_file']).read_text(encoding='utf-8') if inline_css else None
+    js_text = (project_root / config['js_file']).read_text(encoding='utf-8') if inline_js else None
+
+    page = render_page(config, emotions, ui_text, svg_text, css_text, js_text)
+
+    output_path = Path(output_path or output_root / config['html_output'])
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(output_path, page)
+    return output_path
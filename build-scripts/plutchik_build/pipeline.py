@@ -0,0 +1,613 @@
+"""
+In-process build pipeline for a single language version
+
+Every stage runs in the current interpreter and the parsed emotions data,
+UI text and SVG tree are handed from stage to stage in memory. The
+subprocess path (one python3 per stage script) is kept for comparison.
+"""
+
+import contextlib
+import functools
+import io
+import json
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from pathlib import Path
+
+from .artifacts import stats_since
+from .compact import write_compact
+from .emotion_pages import INDEX_NAME as EMOTION_PAGES_INDEX, emotion_pages_files, run_emotion_pages_stage
+from .emotions import csv_to_json, read_emotions_csv
+from .graph import write_emotion_graph
+from .jsonio import write_atomic
+from .manifest import BuildManifest
+from .page import HELPER_SCRIPTS
+from .svg import load_svg, process_svg, process_svg_tree, write_svg
+from .svg_hitmap import DEFAULT_TOLERANCE as DEFAULT_HITMAP_TOLERANCE, print_hitmap_report, write_hitmap
+from .svg_identify import identify_layers_tree, print_identify_report
+from .svg_minify import DEFAULT_TOLERANCE, minify_svg_tree, print_minify_report
+from .svg_simplify import DEFAULT_PRECISION as DEFAULT_SIMPLIFY_PRECISION
+from .svg_simplify import print_simplify_report, simplify_svg_tree
+from .svg_split import load_svg_mapping
+from .svg_styles import canonicalize_svg_styles
+from .svg_stream import process_svg_stream
+from .svg_text import DEFAULT_FONT, print_text_labels_report, text_labels_tree
+from .ui_text import ui_csv_to_json
+
+# Project root (parent of build-scripts)
+BUILD_SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+PROJECT_ROOT = BUILD_SCRIPTS_DIR.parent
+# English emotions template, the colour and combo reference of svg_identify_layers
+TEMPLATE_CSV = Path('translations') / 'template.csv'
+# Config entries of the files a build writes under output_root. A stage
+# that adds an output adds its key here, so the directory is created and
+# the file is precompressed and fingerprinted with the others.
+OUTPUT_FILE_KEYS = ('json_file', 'ui_json_file', 'compact_json_file', 'svg_processed',
+                    'svg_hitmap_file')
+# Config entries of outputs that only record a build-time check and are
+# never served
+CHECK_FILE_KEYS = ('graph_file',)
+# Config entries of the hand-written site files the pages load
+SITE_FILE_KEYS = ('css_file', 'js_file')
+# Config entries of the stages and SVG steps the stage scripts of
+# build_language_subprocess() do not run
+SUBPROCESS_SKIPPED_KEYS = (
+    'graph_file', 'compact_json_file', 'emotion_pages_dir', 'svg_hitmap_file',
+    'svg_streaming', 'svg_identify_layers', 'svg_canonical_styles', 'svg_precision',
+    'svg_simplify_tolerance', 'svg_text_labels',
+)
+
+
+def load_config(config_path):
+    """Load a language configuration file"""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def mapping_path(config_path, config, project_root=None):
+    """SVG mapping of a language: 'svg_mapping_file' or <language>-svg-mapping.json
+
+    The path is resolved, like those of resolve_paths(), so the manifest
+    records the same input however the config path was spelled.
+    """
+    config_path = Path(config_path).resolve()
+    if config.get('svg_mapping_file'):
+        return Path(project_root or PROJECT_ROOT).resolve() / config['svg_mapping_file']
+    return config_path.with_name(config_path.name.replace('-config.json', '-svg-mapping.json'))
+
+
+def print_banner(description):
+    """Print the stage banner used by all build steps"""
+    print(f"\n{'='*60}")
+    print(f"📋 {description}")
+    print(f"{'='*60}")
+
+
+def run_stage(description, func, *args):
+    """Run a build stage in-process and handle errors
+
+    Returns a (success, value) tuple where value is whatever the stage
+    function returned.
+    """
+    print_banner(description)
+
+    try:
+        return True, func(*args)
+    except Exception:
+        print(f"❌ Error: {description} failed")
+        traceback.print_exc(file=sys.stdout)
+        return False, None
+
+
+def run_command(cmd, description):
+    """Run a shell command and handle errors"""
+    print_banner(description)
+
+    result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+
+    if result.stdout:
+        print(result.stdout)
+
+    if result.returncode != 0:
+        print(f"❌ Error: {description} failed")
+        print(result.stderr)
+        return False
+
+    return True
+
+
+def resolve_paths(config, project_root=None, output_root=None):
+    """Resolve config entries to absolute input and output paths
+
+    Inputs are read relative to project_root, outputs are written relative
+    to output_root (defaults to project_root). Both are resolved first:
+    the build manifest keys inputs by path, and a relative and an
+    absolute spelling of the same file must not look like a change.
+    """
+    project_root = Path(project_root or PROJECT_ROOT).resolve()
+    output_root = Path(output_root or project_root).resolve()
+
+    paths = {
+        'csv_file': project_root / config['csv_file'],
+        'json_file': output_root / config['json_file'],
+        'ui_csv_file': None,
+        'ui_json_file': None,
+        'graph_file': None,
+        'svg_input': project_root / config['svg_input'],
+        'svg_processed': output_root / config['svg_processed'],
+    }
+    if config.get('ui_csv_file'):
+        paths['ui_csv_file'] = project_root / config['ui_csv_file']
+        paths['ui_json_file'] = output_root / config['ui_json_file']
+    for key in ('graph_file', 'compact_json_file', 'emotion_pages_dir', 'svg_hitmap_file'):
+        paths[key] = output_root / config[key] if config.get(key) else None
+
+    for key in OUTPUT_FILE_KEYS + CHECK_FILE_KEYS:
+        if paths[key] is not None:
+            paths[key].parent.mkdir(parents=True, exist_ok=True)
+
+    return paths
+
+
+def site_files(config, project_root=None, output_root=None):
+    """Return (assets, pages): the static files a language config serves
+
+    Assets are the outputs of OUTPUT_FILE_KEYS, the config's stylesheet
+    and script, and the page.HELPER_SCRIPTS of its outputs. Pages are the
+    HTML page and everything in emotion_pages_dir; they keep their names
+    when fingerprinted because the scripts build fragment URLs at run time.
+    """
+    project_root = Path(project_root or PROJECT_ROOT).resolve()
+    output_root = Path(output_root or project_root).resolve()
+    assets = [output_root / config[key] for key in OUTPUT_FILE_KEYS if config.get(key)]
+    assets += [project_root / config[key] for key in SITE_FILE_KEYS if config.get(key)]
+    assets += [project_root / helper for key, (helper, _) in HELPER_SCRIPTS.items()
+               if config.get(key)]
+    pages = [project_root / config['html_output']] if config.get('html_output') else []
+    if config.get('emotion_pages_dir'):
+        pages += emotion_pages_files(output_root / config['emotion_pages_dir'])
+    return assets, pages
+
+
+def config_artifacts(config, project_root=None, output_root=None):
+    """Every static file a language config produces or serves"""
+    assets, pages = site_files(config, project_root, output_root)
+    return assets + pages
+
+
+def run_cached_stage(manifest, stage, description, func, inputs, output,
+                     config, config_keys, loader=None, profiler=None, cache=None):
+    """Run a stage unless the manifest shows its inputs are unchanged
+
+    When the stage is skipped, loader (if given) restores the stage's
+    in-memory value from its existing output. profiler, a StageProfiler,
+    records the cost of the stage. cache, an ArtifactStore, restores the
+    output of a stage that must run when an identical build stored it,
+    and stores what the stage builds otherwise; a restored stage has no
+    in-memory value. --force bypasses the cache. Returns (success, value).
+    """
+    fingerprint = manifest.fingerprint(stage, inputs, output, config, config_keys)
+    reason = manifest.rebuild_reason(stage, fingerprint)
+
+    if reason is None:
+        print(f"\n⏭  {description}: up to date, skipping")
+        manifest.skip(stage)
+        if profiler:
+            profiler.skip(stage)
+        return True, loader(output) if loader else None
+
+    key = cache.key(stage, fingerprint) if cache and not manifest.force else None
+    if key and cache.restore(key, output):
+        print(f"\n♻️  {description}: restored from the artifact cache ({reason})")
+        manifest.record(stage, fingerprint, reason, action='restored')
+        if profiler:
+            profiler.skip(stage, status='restored')
+        return True, None
+
+    if profiler:
+        func = profiler.wrap(stage, func)
+    ok, value = run_stage(f"{description} ({reason})", func, *inputs, output)
+    if ok:
+        manifest.record(stage, fingerprint, reason)
+        if cache:
+            cache.store(key or cache.key(stage, fingerprint), output)
+    return ok, value
+
+
+def run_svg_stage(svg_input, svg_processed, config, mapping_file=None, reference_file=None):
+    """Process the SVG, then apply the optional post-processing steps
+
+    "svg_identify_layers": true first gives the emotion layers their
+    English ids from their geometry and colour, against the emotions
+    template reference_file (see plutchik_build.svg_identify); it needs
+    the whole tree, so it overrides "svg_streaming".
+    "svg_streaming": true processes the file with bounded memory,
+    "svg_canonical_styles": true renames the Illustrator .cls-N classes to
+    language-independent names and "svg_precision": N rounds path
+    coordinates to N decimals (within "svg_tolerance", default 0.1).
+    "svg_text_labels": true replaces the outlined labels with <text> named
+    from mapping_file, in "svg_label_font" (see plutchik_build.svg_text).
+    "svg_simplify_tolerance": T simplifies the petal and ring outlines to
+    within T user units, leaving the labels alone (see
+    plutchik_build.svg_simplify; needs NumPy).
+    Returns the processed tree, or None when it was streamed and not
+    post-processed.
+    """
+    if config.get('svg_identify_layers', False):
+        tree = load_svg(svg_input)
+        identification = identify_layers_tree(tree, read_emotions_csv(reference_file))
+        print_identify_report(identification, Path(svg_input).name)
+        print()
+        process_svg_tree(tree)
+        write_svg(tree, svg_processed)
+    elif config.get('svg_streaming', False):
+        process_svg_stream(svg_input, svg_processed)
+        tree = None
+    else:
+        tree = process_svg(svg_input, svg_processed)
+
+    canonical = config.get('svg_canonical_styles', False)
+    precision = config.get('svg_precision')
+    text_labels = config.get('svg_text_labels', False)
+    simplify = config.get('svg_simplify_tolerance')
+    if not canonical and precision is None and not text_labels and simplify is None:
+        return tree
+
+    if tree is None:
+        tree = load_svg(svg_processed)
+    file_before = svg_processed.stat().st_size
+
+    if text_labels:
+        text_stats = text_labels_tree(tree, load_svg_mapping(mapping_file),
+                                      config.get('svg_label_font', DEFAULT_FONT))
+
+    if simplify is not None:
+        simplify_stats = simplify_svg_tree(
+            tree, simplify, DEFAULT_SIMPLIFY_PRECISION if precision is None else precision)
+
+    if canonical:
+        canonical_rules = canonicalize_svg_styles(tree)
+        print(f"\n🎨 Renamed style classes to {len(canonical_rules)} canonical classes")
+
+    if precision is not None:
+        stats = minify_svg_tree(tree, precision, config.get('svg_tolerance', DEFAULT_TOLERANCE))
+
+    write_svg(tree, svg_processed)
+
+    if text_labels:
+        print()
+        print_text_labels_report(text_stats, svg_processed.name)
+    if simplify is not None:
+        print()
+        print_simplify_report(simplify_stats, svg_processed.name)
+    if precision is not None:
+        print()
+        print_minify_report(stats, svg_processed.name, file_before, svg_processed.stat().st_size)
+    elif text_labels or simplify is not None:
+        print(f"   File: {file_before:,} → {svg_processed.stat().st_size:,} bytes")
+
+    return tree
+
+
+def run_svg_stage_files(svg_input, *files, config, mapping_file=None, reference_file=None):
+    """run_svg_stage() for a stage whose inputs are the SVG, the files it
+    reads (SVG mapping, emotions template) and the processed SVG last"""
+    return run_svg_stage(svg_input, files[-1], config, mapping_file, reference_file)
+
+
+def run_hitmap_stage(svg_processed, *files, config, mapping_file=None, tree=None):
+    """Write the hit map of the processed SVG (see plutchik_build.svg_hitmap)
+
+    The stage's inputs are the processed SVG, the SVG mapping that names
+    translated layers (if any) and the hit map last. Uses the tree the SVG
+    stage left in memory when there is one. "svg_hitmap_tolerance" is the
+    largest distance from a region's edge to the real outline.
+    """
+    if tree is None:
+        tree = load_svg(svg_processed)
+    mapping = load_svg_mapping(mapping_file) if mapping_file else None
+    hitmap_file = files[-1]
+    _, stats = write_hitmap(tree, hitmap_file,
+                            config.get('svg_hitmap_tolerance', DEFAULT_HITMAP_TOLERANCE),
+                            mapping=mapping)
+    print_hitmap_report(stats, Path(hitmap_file).name)
+
+
+def load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def run_emotions_output_stage(write, json_file, output, emotions=None):
+    """Run write(emotions, output) for a stage derived from the emotions JSON
+
+    Uses the emotions already in memory when the emotions stage produced
+    them, and only reads json_file otherwise.
+    """
+    if emotions is None:
+        emotions = load_json(json_file)
+    return write(emotions, output)
+
+
+def build_language(config_path, project_root=None, output_root=None, force=False,
+                   profiler=None, previous=None, cache=None):
+    """Build a complete language version from configuration
+
+    Stages whose inputs, config entries and code are unchanged since the
+    last build are skipped unless force is set. profiler, a StageProfiler
+    (see plutchik_build.profiling), records the cost of every stage.
+    previous, the result of an earlier build of the same config, lets
+    skipped stages keep their in-memory output instead of re-reading it.
+    cache, an ArtifactStore (see plutchik_build.artifacts), restores the
+    outputs of stages an identical build has already produced.
+    Returns a result dict holding the config, resolved paths, the build
+    'report', the artifact 'cache' counters of this build (None without a
+    cache) and the in-memory output of each stage ('emotions',
+    'ui_text', 'svg_tree'), or None if a stage failed. 'svg_tree' is None
+    when the SVG stage was skipped without a previous tree, or streamed
+    without minifying (see run_svg_stage()).
+    """
+
+    # Load configuration
+    print(f"\n🌍 Loading configuration from: {config_path}")
+    config = load_config(config_path)
+
+    lang_code = config['language_code']
+    lang_name = config['language_name']
+
+    print(f"\n{'='*60}")
+    print(f"Building Plutchik Webapp: {lang_name} ({lang_code})")
+    print(f"{'='*60}")
+
+    paths = resolve_paths(config, project_root, output_root)
+    manifest = BuildManifest.for_language(output_root or project_root or PROJECT_ROOT,
+                                          lang_code, force=force)
+    result = {
+        'config': config,
+        'paths': paths,
+        'report': manifest.report,
+        'cache': None,
+        'emotions': None,
+        'ui_text': None,
+        'svg_tree': None,
+    }
+
+    def warm_loader(key, loader=None):
+        """Reuse the previous build's value of key, else fall back to loader"""
+        if previous and previous.get(key) is not None:
+            return lambda output: previous[key]
+        return loader
+
+    cache_before = dict(cache.stats) if cache else None
+
+    # Step 1: Convert Emotions CSV to JSON
+    csv_file = paths['csv_file']
+    json_file = paths['json_file']
+
+    if csv_file.exists():
+        ok, result['emotions'] = run_cached_stage(
+            manifest, 'emotions',
+            f"Converting Emotions CSV to JSON for {lang_name}",
+            csv_to_json, [csv_file], json_file,
+            config, ['csv_file', 'json_file'], loader=warm_loader('emotions', load_json),
+            profiler=profiler, cache=cache)
+        if not ok:
+            return None
+    else:
+        print(f"⚠️  Emotions CSV file not found: {csv_file}")
+        print(f"   Skipping CSV conversion. Using existing JSON: {json_file}")
+
+    # Step 1.25: Resolve the emotion graph, failing on broken references
+    # (a build-time check; the graph file is not served)
+    graph_file = paths['graph_file']
+
+    if graph_file and json_file.exists():
+        ok, _ = run_cached_stage(
+            manifest, 'graph',
+            f"Resolving emotion graph for {lang_name}",
+            functools.partial(run_emotions_output_stage, write_emotion_graph,
+                              emotions=result['emotions']),
+            [json_file], graph_file,
+            config, ['json_file', 'graph_file'], profiler=profiler, cache=cache)
+        if not ok:
+            return None
+
+    # Step 1.3: Compact columnar encoding of the emotions
+    compact_json_file = paths['compact_json_file']
+
+    if compact_json_file and json_file.exists():
+        ok, _ = run_cached_stage(
+            manifest, 'compact',
+            f"Encoding compact emotions JSON for {lang_name}",
+            functools.partial(run_emotions_output_stage, write_compact,
+                              emotions=result['emotions']),
+            [json_file], compact_json_file,
+            config, ['json_file', 'compact_json_file'], profiler=profiler, cache=cache)
+        if not ok:
+            return None
+
+    # Step 1.5: Convert UI CSV to JSON
+    ui_csv_file = paths['ui_csv_file']
+    ui_json_file = paths['ui_json_file']
+
+    if ui_csv_file and ui_csv_file.exists():
+        ok, result['ui_text'] = run_cached_stage(
+            manifest, 'ui_text',
+            f"Converting UI CSV to JSON for {lang_name}",
+            ui_csv_to_json, [ui_csv_file], ui_json_file,
+            config, ['ui_csv_file', 'ui_json_file'], loader=warm_loader('ui_text', load_json),
+            profiler=profiler, cache=cache)
+        if not ok:
+            return None
+    elif ui_csv_file:
+        print(f"⚠️  UI CSV file not found: {ui_csv_file}")
+        print(f"   Skipping UI CSV conversion.")
+
+    # Step 1.75: Prerender the emotion detail fragments and pages
+    pages_dir = paths['emotion_pages_dir']
+
+    if pages_dir and json_file.exists():
+        ui_json_file = paths['ui_json_file'] if result['ui_text'] is None else None
+        if ui_json_file and not ui_json_file.exists():
+            ui_json_file = None
+        svg_mapping = mapping_path(config_path, config, project_root)
+        svg_mapping = svg_mapping if svg_mapping.exists() else None
+        ok, _ = run_cached_stage(
+            manifest, 'emotion_pages',
+            f"Prerendering emotion pages for {lang_name}",
+            functools.partial(run_emotion_pages_stage, config=config,
+                              ui_json_file=ui_json_file, mapping_file=svg_mapping,
+                              project_root=project_root or PROJECT_ROOT, output_root=output_root,
+                              emotions=result['emotions'], ui_text=result['ui_text']),
+            [p for p in (json_file, paths['ui_json_file'], svg_mapping) if p and p.exists()],
+            pages_dir / EMOTION_PAGES_INDEX,
+            config, ['json_file', 'ui_json_file', 'emotion_pages_dir', 'css_file',
+                     'html_output', 'svg_mapping_file'], profiler=profiler,
+            # The pages are a directory; only their index is the stage's output
+            cache=None)
+        if not ok:
+            return None
+
+    # Step 2: Process SVG
+    svg_input = paths['svg_input']
+    svg_processed = paths['svg_processed']
+
+    if svg_input.exists():
+        # With text labels the names come from the SVG mapping, and with
+        # identified layers the reference colours from the template, so
+        # editing them rebuilds the SVG stage like editing the artwork does
+        svg_inputs = [svg_input]
+        svg_files = {}
+        if config.get('svg_text_labels', False):
+            svg_files['mapping_file'] = ('svg_text_labels', 'the SVG mapping',
+                                         mapping_path(config_path, config, project_root))
+        if config.get('svg_identify_layers', False):
+            svg_files['reference_file'] = ('svg_identify_layers', 'the emotions template',
+                                           Path(project_root or PROJECT_ROOT).resolve() / TEMPLATE_CSV)
+        for option, needed, path in svg_files.values():
+            if not path.exists():
+                print(f"❌ {option} needs {needed}: {path} not found")
+                return None
+            svg_inputs.append(path)
+        svg_func = functools.partial(run_svg_stage_files, config=config,
+                                     **{key: path for key, (_, _, path) in svg_files.items()})
+        ok, result['svg_tree'] = run_cached_stage(
+            manifest, 'svg',
+            f"Processing SVG for {lang_name}",
+            svg_func,
+            svg_inputs, svg_processed,
+            config, ['svg_input', 'svg_processed', 'svg_streaming', 'svg_identify_layers',
+                     'svg_canonical_styles', 'svg_precision', 'svg_tolerance',
+                     'svg_simplify_tolerance', 'svg_text_labels', 'svg_label_font',
+                     'svg_mapping_file'],
+            loader=warm_loader('svg_tree'), profiler=profiler, cache=cache)
+        if not ok:
+            return None
+    else:
+        print(f"⚠️  SVG input file not found: {svg_input}")
+        print(f"   Skipping SVG processing. Using existing: {svg_processed}")
+
+    # Step 2.5: Hit map of the wheel for pointer events
+    hitmap_file = paths['svg_hitmap_file']
+
+    if hitmap_file and svg_processed.exists():
+        svg_mapping = mapping_path(config_path, config, project_root)
+        svg_mapping = svg_mapping if svg_mapping.exists() else None
+        ok, _ = run_cached_stage(
+            manifest, 'hitmap',
+            f"Building the wheel hit map for {lang_name}",
+            functools.partial(run_hitmap_stage, config=config, mapping_file=svg_mapping,
+                              tree=result['svg_tree']),
+            [p for p in (svg_processed, svg_mapping) if p], hitmap_file,
+            config, ['svg_processed', 'svg_hitmap_file', 'svg_hitmap_tolerance',
+                     'svg_mapping_file'], profiler=profiler, cache=cache)
+        if not ok:
+            return None
+
+    manifest.save()
+    if cache:
+        result['cache'] = stats_since(cache.stats, cache_before)
+    return result
+
+
+def build_language_subprocess(config_path, project_root=None, output_root=None):
+    """Build a language by spawning one python3 per stage script
+
+    This is the original build path, kept so the in-process pipeline can be
+    measured against it.
+    """
+    config = load_config(config_path)
+    lang_name = config['language_name']
+    paths = resolve_paths(config, project_root, output_root)
+    python = sys.executable or 'python3'
+
+    steps = [
+        ('csv-to-json.py', paths['csv_file'], paths['json_file'],
+         f"Converting Emotions CSV to JSON for {lang_name}"),
+        ('ui-csv-to-json.py', paths['ui_csv_file'], paths['ui_json_file'],
+         f"Converting UI CSV to JSON for {lang_name}"),
+        ('process-svg.py', paths['svg_input'], paths['svg_processed'],
+         f"Processing SVG for {lang_name}"),
+    ]
+
+    for script, source, target, description in steps:
+        if source is None or not source.exists():
+            continue
+        cmd = f"'{python}' '{BUILD_SCRIPTS_DIR / script}' '{source}' '{target}'"
+        if not run_command(cmd, description):
+            return False
+
+    return True
+
+
+def build_language_comparable(config_path, project_root=None, output_root=None):
+    """build_language() with only the stages build_language_subprocess() runs
+
+    The config is copied into output_root without the entries of the
+    other stages and of the SVG post-processing steps, which the stage
+    scripts do not run either, and built from there.
+    """
+    config = {key: value for key, value in load_config(config_path).items()
+              if key not in SUBPROCESS_SKIPPED_KEYS}
+    comparable_path = Path(output_root) / Path(config_path).name
+    write_atomic(comparable_path, json.dumps(config))
+    return build_language(comparable_path, project_root, output_root)
+
+
+def compare_with_subprocess(config_path, runs=3, project_root=None):
+    """Time the in-process pipeline against the subprocess path
+
+    Both variants run the same three stages (see
+    build_language_comparable()) and write into throwaway directories so
+    the real build outputs are left untouched. Returns a dict of best-of-N
+    timings in seconds.
+    """
+    timings = {'in_process': [], 'subprocess': []}
+    builders = {
+        'in_process': build_language_comparable,
+        'subprocess': build_language_subprocess,
+    }
+
+    for _ in range(runs):
+        for name, builder in builders.items():
+            with tempfile.TemporaryDirectory() as out_dir:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    start = time.perf_counter()
+                    ok = builder(config_path, project_root, out_dir)
+                    elapsed = time.perf_counter() - start
+            if not ok:
+                raise RuntimeError(f"{name} build failed for {config_path}")
+            timings[name].append(elapsed)
+
+    in_process = min(timings['in_process'])
+    subprocess_time = min(timings['subprocess'])
+    return {
+        'runs': runs,
+        'in_process': in_process,
+        'subprocess': subprocess_time,
+        'saved': subprocess_time - in_process,
+        'speedup': subprocess_time / in_process if in_process else float('inf'),
+    }
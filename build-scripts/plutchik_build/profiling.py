@@ -0,0 +1,173 @@
+"""
+Per-stage timing and memory instrumentation for language builds
+
+A StageProfiler is handed to build_language(); every stage that runs is
+wrapped so its wall time, CPU time and peak traced memory (tracemalloc)
+are recorded, and stages skipped by the build manifest are recorded as
+such. Selected stages can also be run under cProfile, each dumping a
+.pstats file that can be opened with python -m pstats or snakeviz.
+
+The profiles of one or more builds are written as a JSON trace:
+
+    {
+        "format": 1,
+        "created": "2026-10-18T12:00:00",
+        "python": "3.12.3",
+        "platform": "Linux-...",
+        "builds": [
+            {"config": "languages/spanish-config.json", "language": "es",
+             "ok": true, "wall_ms": 812.4, "cpu_ms": 790.1,
+             "stages": [
+                 {"stage": "emotions", "status": "rebuilt", "wall_ms": 21.7,
+                  "cpu_ms": 21.5, "peak_bytes": 402311, "pstats": null},
+                 {"stage": "graph", "status": "skipped", ...},
+                 ...
+             ]}
+        ]
+    }
+
+Timings are taken with tracemalloc running, which slows allocation-heavy
+stages down; compare traces with each other, not with unprofiled builds.
+"""
+
+import cProfile
+import json
+import platform
+import time
+import tracemalloc
+from pathlib import Path
+
+from .jsonio import write_atomic
+from .pipeline import PROJECT_ROOT, load_config
+
+TRACE_FORMAT = 1
+PROFILE_DIR = PROJECT_ROOT / '.build-profile'
+
+
+class StageProfiler:
+    """Records the cost of each stage of one language build"""
+
+    def __init__(self, language, cprofile_stages=(), pstats_dir=PROFILE_DIR):
+        self.language = language
+        self.cprofile_stages = set(cprofile_stages)
+        self.pstats_dir = Path(pstats_dir)
+        self.stages = []
+
+    def wants_cprofile(self, stage):
+        return stage in self.cprofile_stages or 'all' in self.cprofile_stages
+
+    def wrap(self, stage, func):
+        """Return func instrumented to record one entry for this stage"""
+        def profiled(*args):
+            return self.run(stage, func, *args)
+        return profiled
+
+    def run(self, stage, func, *args):
+        """Call func(*args) and record its wall time, CPU time and peak memory
+
+        The entry is recorded with status 'failed' if func raises; the
+        exception is passed on.
+        """
+        entry = {
+            'stage': stage,
+            'status': 'failed',
+            'wall_ms': None,
+            'cpu_ms': None,
+            'peak_bytes': None,
+            'pstats': None,
+        }
+        self.stages.append(entry)
+
+        profiler = cProfile.Profile() if self.wants_cprofile(stage) else None
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            if profiler:
+                profiler.enable()
+            try:
+                value = func(*args)
+            finally:
+                if profiler:
+                    profiler.disable()
+            entry['status'] = 'rebuilt'
+            return value
+        finally:
+            entry['wall_ms'] = (time.perf_counter() - wall_start) * 1000
+            entry['cpu_ms'] = (time.process_time() - cpu_start) * 1000
+            entry['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+            if started_tracing:
+                tracemalloc.stop()
+            if profiler:
+                self.pstats_dir.mkdir(parents=True, exist_ok=True)
+                pstats_path = self.pstats_dir / f"{self.language}-{stage}.pstats"
+                profiler.dump_stats(pstats_path)
+                entry['pstats'] = str(pstats_path)
+
+    def skip(self, stage, status='skipped'):
+        """Record a stage the build manifest found up to date
+
+        status is 'restored' for a stage restored from the artifact cache.
+        """
+        self.stages.append({
+            'stage': stage,
+            'status': status,
+            'wall_ms': 0.0,
+            'cpu_ms': 0.0,
+            'peak_bytes': 0,
+            'pstats': None,
+        })
+
+
+def profile_build(config_path, build, cprofile_stages=(), pstats_dir=PROFILE_DIR):
+    """Run build(profiler) under a new StageProfiler
+
+    build returns a truthy value on success. Returns (build's value, trace
+    entry); the entry holds the config, language code, 'ok', the whole
+    build's wall and CPU time and the per-stage entries.
+    """
+    language = load_config(config_path)['language_code']
+    profiler = StageProfiler(language, cprofile_stages, pstats_dir)
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    value = build(profiler)
+    return value, {
+        'config': str(config_path),
+        'language': language,
+        'ok': bool(value),
+        'wall_ms': (time.perf_counter() - wall_start) * 1000,
+        'cpu_ms': (time.process_time() - cpu_start) * 1000,
+        'stages': profiler.stages,
+    }
+
+
+def write_trace(builds, path):
+    """Write the JSON trace of the given build entries atomically"""
+    document = {
+        'format': TRACE_FORMAT,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'builds': builds,
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(path, json.dumps(document, indent=2) + '\n')
+    return document
+
+
+def print_profile(build):
+    """Print the per-stage table of one trace entry"""
+    print(f"\n⏱  Stage profile for {build['language']} ({build['config']})")
+    print(f"  {'stage':<10} {'status':<8} {'wall':>10} {'cpu':>10} {'peak mem':>12}")
+    for entry in build['stages']:
+        line = (f"  {entry['stage']:<10} {entry['status']:<8} {entry['wall_ms']:>8.1f}ms "
+                f"{entry['cpu_ms']:>8.1f}ms {entry['peak_bytes'] / 1024:>9.1f} KiB")
+        if entry['pstats']:
+            line += f"  → {entry['pstats']}"
+        print(line)
+    print(f"  {'total':<10} {'':<8} {build['wall_ms']:>8.1f}ms {build['cpu_ms']:>8.1f}ms")
@@ -0,0 +1,407 @@
+"""
+Local preview server for the built webapp
+
+A small asyncio HTTP/1.1 server for previewing index.html, index-es.html
+and index-it.html without an external file server. Files are served from
+an in-memory cache keyed by path; every request stats the file and reloads
+it when its modification time or size changed, so a rebuild (or
+build-language.py --watch) shows up on the next reload.
+
+Every response carries a strong ETag (a hash of the bytes sent), and
+requests whose If-None-Match matches get a 304. Text responses are sent
+gzip-compressed to clients that accept it, using the precompressed .gz
+sibling when it is up to date and compressing once into the cache
+otherwise.
+
+References to the remote copy of the data files (the S3 URL js/scripts.js
+fetches text.json from) are rewritten to the locally built file, so the
+preview shows the current build rather than the published data.
+
+benchmark() starts a server on a free port and measures latency and
+throughput of concurrent keep-alive clients for a set of paths.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import mimetypes
+import posixpath
+import re
+import statistics
+import time
+from email.utils import formatdate
+from pathlib import Path
+from urllib.parse import unquote
+
+from .bench import percentile
+from .fingerprint import REMOTE_PREFIXES, find_references
+from .pipeline import PROJECT_ROOT
+from .watch import file_stamp
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8000
+
+# Types worth compressing, and files too small to bother
+COMPRESSIBLE_SUFFIXES = {'.html', '.css', '.js', '.json', '.svg', '.txt', '.md', '.csv'}
+MIN_COMPRESS_SIZE = 256
+
+# Responses are only reused after revalidation, so edits show up at once
+CACHE_CONTROL = 'no-cache'
+
+REQUEST_TIMEOUT = 30
+
+CONTENT_TYPES = {
+    '.html': 'text/html; charset=utf-8',
+    '.css': 'text/css; charset=utf-8',
+    '.js': 'text/javascript; charset=utf-8',
+    '.json': 'application/json; charset=utf-8',
+    '.svg': 'image/svg+xml',
+    '.csv': 'text/csv; charset=utf-8',
+    '.md': 'text/markdown; charset=utf-8',
+    '.txt': 'text/plain; charset=utf-8',
+}
+
+STATUS_TEXT = {
+    200: 'OK',
+    304: 'Not Modified',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+}
+
+
+def content_type(path):
+    suffix = Path(path).suffix.lower()
+    if suffix in CONTENT_TYPES:
+        return CONTENT_TYPES[suffix]
+    return mimetypes.guess_type(str(path))[0] or 'application/octet-stream'
+
+
+def strong_etag(data):
+    return '"' + hashlib.sha256(data).hexdigest()[:20] + '"'
+
+
+def localize_remote_urls(text, root, remote_prefixes=REMOTE_PREFIXES):
+    """Point absolute URLs under a remote prefix at the local file, if it exists"""
+    for prefix in remote_prefixes:
+        pattern = re.compile(re.escape(prefix) + r'''([^"'\s<>()?#]+)''')
+
+        def replace(match):
+            rel_path = posixpath.normpath(match.group(1))
+            if (Path(root) / rel_path).is_file():
+                return '/' + rel_path
+            return match.group(0)
+
+        text = pattern.sub(replace, text)
+    return text
+
+
+class CachedFile:
+    """The bytes of one file as served, with their ETag and gzip variant"""
+
+    def __init__(self, path, stamp, body, rewrite, gzip_body=None):
+        self.path = path
+        self.stamp = stamp
+        self.body = body
+        self.etag = strong_etag(body)
+        self.content_type = content_type(path)
+        self.rewrite = rewrite
+        self.compressible = (path.suffix.lower() in COMPRESSIBLE_SUFFIXES
+                             and len(body) >= MIN_COMPRESS_SIZE)
+        self._gzip_body = gzip_body
+        self._gzip_etag = None
+
+    def gzip_variant(self):
+        """Return (gzip bytes, ETag), compressing on first use"""
+        if self._gzip_body is None:
+            self._gzip_body = gzip.compress(self.body, compresslevel=9, mtime=0)
+        if self._gzip_etag is None:
+            self._gzip_etag = strong_etag(self._gzip_body)
+        return self._gzip_body, self._gzip_etag
+
+
+class ArtifactCache:
+    """In-memory cache of the files under root, invalidated on change"""
+
+    def __init__(self, root=None, rewrite_remote=True, remote_prefixes=REMOTE_PREFIXES):
+        self.root = Path(root or PROJECT_ROOT).resolve()
+        self.rewrite_remote = rewrite_remote
+        self.remote_prefixes = remote_prefixes
+        self.entries = {}
+        self.stats = {'hits': 0, 'loads': 0}
+
+    def resolve(self, url_path):
+        """Map a URL path to a file under root, or None"""
+        rel_path = posixpath.normpath('/' + url_path).lstrip('/')
+        if any(part.startswith('.') for part in rel_path.split('/')):
+            # Build manifests, profiles and the git directory stay private
+            return None
+        if not rel_path or url_path.endswith('/'):
+            rel_path = posixpath.join(rel_path, 'index.html')
+        path = (self.root / rel_path).resolve()
+        if path != self.root and self.root not in path.parents:
+            return None
+        return path
+
+    def get(self, url_path):
+        """Return the CachedFile for a URL path, or None if there is no file"""
+        path = self.resolve(url_path)
+        if path is None:
+            return None
+        stamp = file_stamp(path)
+        if stamp is None:
+            self.entries.pop(path, None)
+            return None
+
+        entry = self.entries.get(path)
+        if entry is not None and entry.stamp == stamp:
+            self.stats['hits'] += 1
+            return entry
+
+        self.stats['loads'] += 1
+        entry = self.load(path, stamp)
+        self.entries[path] = entry
+        return entry
+
+    def load(self, path, stamp):
+        body = path.read_bytes()
+        rewrite = False
+        if self.rewrite_remote and path.suffix.lower() in ('.html', '.js', '.css'):
+            text = body.decode('utf-8', errors='surrogateescape')
+            localized = localize_remote_urls(text, self.root, self.remote_prefixes)
+            if localized != text:
+                body = localized.encode('utf-8', errors='surrogateescape')
+                rewrite = True
+
+        # An up-to-date precompressed sibling saves compressing here, unless
+        # the body was rewritten and no longer matches it
+        gzip_body = None
+        gz_path = path.with_name(path.name + '.gz')
+        gz_stamp = file_stamp(gz_path)
+        if not rewrite and gz_stamp is not None and gz_stamp[0] >= stamp[0]:
+            gzip_body = gz_path.read_bytes()
+
+        return CachedFile(path, stamp, body, rewrite, gzip_body)
+
+
+def accepts_gzip(headers):
+    for coding in headers.get('accept-encoding', '').split(','):
+        name, _, params = coding.strip().partition(';')
+        if name.strip().lower() in ('gzip', '*') and params.replace(' ', '') != 'q=0':
+            return True
+    return False
+
+
+def etag_matches(headers, etag):
+    value = headers.get('if-none-match')
+    if value is None:
+        return False
+    return value.strip() == '*' or etag in [tag.strip() for tag in value.split(',')]
+
+
+def respond(cache, method, target, headers):
+    """Build (status, headers, body) for one request"""
+    if method not in ('GET', 'HEAD'):
+        return 405, {'Allow': 'GET, HEAD'}, b''
+
+    url_path = unquote(target.split('?', 1)[0].split('#', 1)[0])
+    entry = cache.get(url_path)
+    if entry is None:
+        return 404, {'Content-Type': 'text/plain; charset=utf-8'}, b'Not Found\n'
+
+    body, etag = entry.body, entry.etag
+    response_headers = {
+        'Content-Type': entry.content_type,
+        'Cache-Control': CACHE_CONTROL,
+    }
+    if entry.compressible:
+        response_headers['Vary'] = 'Accept-Encoding'
+        if accepts_gzip(headers):
+            body, etag = entry.gzip_variant()
+            response_headers['Content-Encoding'] = 'gzip'
+    response_headers['ETag'] = etag
+
+    if etag_matches(headers, etag):
+        return 304, response_headers, b''
+    return 200, response_headers, body
+
+
+async def read_request(reader):
+    """Read one request head; returns (method, target, version, headers) or None"""
+    try:
+        head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), REQUEST_TIMEOUT)
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+            asyncio.TimeoutError, ConnectionError):
+        return None
+
+    lines = head.decode('latin-1').split('\r\n')
+    parts = lines[0].split()
+    if len(parts) != 3:
+        return 'BAD', '', 'HTTP/1.1', {}
+    headers = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(':')
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    return parts[0], parts[1], parts[2], headers
+
+
+async def handle_connection(cache, reader, writer, log=None):
+    """Serve requests on one connection until the client closes it"""
+    try:
+        while True:
+            request = await read_request(reader)
+            if request is None:
+                break
+            method, target, version, headers = request
+            if method == 'BAD':
+                status, response_headers, body = 400, {}, b''
+            else:
+                status, response_headers, body = respond(cache, method, target, headers)
+
+            # A rejected request may carry a body that was never read, so
+            # its connection cannot be reused
+            keep_alive = (version == 'HTTP/1.1' and status not in (400, 405)
+                          and headers.get('connection', '').lower() != 'close')
+            if status != 304:
+                response_headers['Content-Length'] = str(len(body))
+            response_headers['Date'] = formatdate(usegmt=True)
+            response_headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+
+            head = [f"HTTP/1.1 {status} {STATUS_TEXT[status]}"]
+            head += [f"{name}: {value}" for name, value in response_headers.items()]
+            writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1'))
+            if method != 'HEAD' and status != 304:
+                writer.write(body)
+            await writer.drain()
+            if log:
+                log(method, target, status, len(body))
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(cache, host=DEFAULT_HOST, port=DEFAULT_PORT, log=None):
+    return await asyncio.start_server(
+        lambda reader, writer: handle_connection(cache, reader, writer, log), host, port)
+
+
+def serve(root=None, host=DEFAULT_HOST, port=DEFAULT_PORT, rewrite_remote=True, quiet=False):
+    """Run the preview server until interrupted"""
+    cache = ArtifactCache(root, rewrite_remote)
+
+    def log(method, target, status, size):
+        print(f"  {status} {method} {target} ({size:,} bytes)")
+
+    async def main():
+        server = await start_server(cache, host, port, None if quiet else log)
+        print(f"🌐 Serving {cache.root} at http://{host}:{port}/ (Ctrl+C to stop)")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print(f"\n👋 Stopped serving")
+
+
+async def _client(host, port, paths, count, accept_gzip, revalidate, etags, latencies, sizes):
+    """Issue count requests per path on one keep-alive connection"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(count):
+            for path in paths:
+                lines = [f"GET /{path} HTTP/1.1", f"Host: {host}"]
+                if accept_gzip:
+                    lines.append('Accept-Encoding: gzip')
+                if revalidate and path in etags:
+                    lines.append(f"If-None-Match: {etags[path]}")
+                start = time.perf_counter()
+                writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+                await writer.drain()
+                head = await reader.readuntil(b'\r\n\r\n')
+                headers = {}
+                for line in head.decode('latin-1').split('\r\n')[1:]:
+                    name, sep, value = line.partition(':')
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                latencies[path].append(time.perf_counter() - start)
+                sizes[path] = len(body)
+                if 'etag' in headers:
+                    etags[path] = headers['etag']
+    finally:
+        writer.close()
+
+
+async def _benchmark(cache, paths, requests, concurrency, accept_gzip, revalidate):
+    server = await start_server(cache, DEFAULT_HOST, 0)
+    port = server.sockets[0].getsockname()[1]
+    etags = {}
+    async with server:
+        # One warm-up pass fills the cache and collects the ETags
+        warmup = {path: [] for path in paths}
+        await _client(DEFAULT_HOST, port, paths, 1, accept_gzip, False, etags, warmup, {})
+
+        latencies = {path: [] for path in paths}
+        sizes = {}
+        per_client = max(1, requests // concurrency)
+        start = time.perf_counter()
+        await asyncio.gather(*[
+            _client(DEFAULT_HOST, port, paths, per_client, accept_gzip, revalidate,
+                    dict(etags), latencies, sizes)
+            for _ in range(concurrency)
+        ])
+        elapsed = time.perf_counter() - start
+
+    total = sum(len(times) for times in latencies.values())
+    return {
+        'requests': total,
+        'elapsed': elapsed,
+        'requests_per_second': total / elapsed if elapsed else float('inf'),
+        'paths': {
+            path: {
+                'bytes': sizes.get(path, 0),
+                'median_ms': statistics.median(times) * 1000,
+                'p90_ms': percentile(sorted(times), 0.90) * 1000,
+                'p99_ms': percentile(sorted(times), 0.99) * 1000,
+            }
+            for path, times in latencies.items() if times
+        },
+    }
+
+
+def page_assets(pages, root=None):
+    """Return the pages plus every local file they load, directly or from scripts"""
+    root = Path(root or PROJECT_ROOT)
+    assets = {p.relative_to(root).as_posix() for p in root.rglob('*')
+              if p.is_file() and not any(part.startswith('.') for part in p.relative_to(root).parts)}
+    found = []
+    queue = [page for page in pages if page in assets]
+    while queue:
+        rel_path = queue.pop(0)
+        if rel_path in found:
+            continue
+        found.append(rel_path)
+        if Path(rel_path).suffix in ('.html', '.js', '.css'):
+            text = (root / rel_path).read_text(encoding='utf-8', errors='replace')
+            queue += sorted(find_references(rel_path, text, assets))
+    return found
+
+
+def benchmark(paths, root=None, requests=1000, concurrency=8, accept_gzip=True,
+              revalidate=False, rewrite_remote=True):
+    """Measure serving latency and throughput on a throwaway server
+
+    Every one of concurrency keep-alive clients requests each path
+    requests // concurrency times. With revalidate the clients send the
+    ETag they saw, so the run measures 304 responses. Returns a dict with
+    the request count, elapsed seconds, requests per second and per-path
+    response size and latency percentiles.
+    """
+    cache = ArtifactCache(root, rewrite_remote)
+    return asyncio.run(_benchmark(cache, list(paths), requests, concurrency,
+                                  accept_gzip, revalidate))
@@ -0,0 +1,237 @@
+"""
+Process Plutchik SVG with standardized English layer names and add interactive classes
+This works with any language - the layer names in the SVG should always be in English,
+only the visible text should be in the target language.
+"""
+
+import xml.etree.ElementTree as ET
+
+from .jsonio import atomic_output
+
+# Register SVG namespace
+ET.register_namespace('', 'http://www.w3.org/2000/svg')
+
+# Standardized English layer names for base emotions (24)
+BASE_EMOTIONS = [
+    'serenity', 'joy', 'ecstasy',
+    'acceptance', 'trust', 'admiration',
+    'apprehension', 'fear', 'terror',
+    'distraction', 'surprise', 'amazement',
+    'pensiveness', 'sadness', 'grief',
+    'boredom', 'disgust', 'loathing',
+    'annoyance', 'anger', 'rage',
+    'interest', 'anticipation', 'vigilance'
+]
+
+# Standardized English layer names for intermediate/combination emotions (8)
+INTERMEDIATE_EMOTIONS = [
+    'aggressiveness', 'optimism', 'contempt',
+    'awe', 'love', 'remorse',
+    'disapproval', 'submission'
+]
+
+# Emotions that have double background shapes (need special handling)
+DOUBLE_BACKGROUND_EMOTIONS = ['annoyance', 'apprehension']
+
+SVG_NS = '{http://www.w3.org/2000/svg}'
+SVG_G = f'{SVG_NS}g'
+SVG_PATH = f'{SVG_NS}path'
+SVG_RECT = f'{SVG_NS}rect'
+
+
+def index_emotion_layers(root, emotions):
+    """Index emotion layers and their shapes in a single tree traversal
+
+    Returns (groups, paths, rects): groups maps each emotion id to the first
+    element carrying it (in document order, the root itself excluded), and
+    paths / rects map it to that element's descendant <path> / <rect>
+    elements in document order. Shapes inside nested emotion layers are
+    listed under every enclosing layer, exactly like a per-layer
+    .//path search.
+    """
+    wanted = set(emotions)
+    groups = {}
+    paths = {}
+    rects = {}
+
+    # Iterative depth-first walk; each stack entry carries the emotion
+    # layers that enclose the element
+    stack = [(child, ()) for child in reversed(root)]
+    while stack:
+        element, enclosing = stack.pop()
+
+        tag = element.tag
+        if tag == SVG_PATH:
+            for emotion in enclosing:
+                paths[emotion].append(element)
+        elif tag == SVG_RECT:
+            for emotion in enclosing:
+                rects[emotion].append(element)
+
+        element_id = element.get('id')
+        if element_id in wanted and element_id not in groups:
+            groups[element_id] = element
+            paths[element_id] = []
+            rects[element_id] = []
+            enclosing = enclosing + (element_id,)
+
+        if len(element):
+            stack.extend((child, enclosing) for child in reversed(element))
+
+    return groups, paths, rects
+
+
+def load_svg(input_path):
+    """Parse an SVG file and return its ElementTree"""
+    return ET.parse(input_path)
+
+
+def write_svg(tree, output_path):
+    """Write an SVG ElementTree with an XML declaration, atomically"""
+    with atomic_output(output_path, 'wb') as f:
+        tree.write(f, encoding='utf-8', xml_declaration=True)
+
+
+def add_container_classes(group, emotion):
+    """Mark an emotion layer as a clickable emotion container"""
+    current_class = group.get('class', '')
+    group.set('class', f"{current_class} emotion-container {emotion}".strip())
+
+
+def mark_bounding_box(rect):
+    """Mark the rect of an intermediate emotion as its click target"""
+    # Add white background class for clickability
+    rect.set('class', 'intermediate-word-bounding-box')
+
+
+def classify_path(path, emotion, position):
+    """Add classes to the path at index position within an emotion layer
+
+    The first path is the petal shape (base emotions) or part of the label
+    graphic (intermediate emotions); every later path is a label glyph.
+    """
+    is_intermediate = emotion in INTERMEDIATE_EMOTIONS
+    current_class = path.get('class', '')
+
+    if position == 0:
+        if is_intermediate:
+            # For intermediate emotions, first path is part of the text/graphic
+            path.set('class', f"{current_class} intermediate-letter {emotion}".strip())
+        else:
+            # For base emotions, add petal-shape, filled-shape, and emotion-color classes
+            path.set('class', f"{current_class} petal-shape filled-shape {emotion}-color {emotion}".strip())
+    elif is_intermediate:
+        # Intermediate emotions get "intermediate-letter {emotion}" classes
+        if 'intermediate-letter' not in current_class:
+            path.set('class', f"{current_class} intermediate-letter {emotion}".strip())
+    else:
+        # Base emotions get "central-letter" class
+        if 'central-letter' not in current_class:
+            path.set('class', f"{current_class} central-letter".strip())
+
+
+def fix_double_background(path, emotion):
+    """Turn the second background path of a double-background emotion
+    from a letter back into a filled petal shape
+
+    Returns True if the path was changed.
+    """
+    current_class = path.get('class', '')
+    if 'central-letter' not in current_class:
+        return False
+
+    # Replace central-letter with petal-shape filled-shape
+    new_class = current_class.replace('central-letter', f'petal-shape filled-shape {emotion}-color {emotion}')
+    path.set('class', new_class)
+    return True
+
+
+def process_svg_tree(tree):
+    """Add interactive classes to a parsed SVG tree in place and return it"""
+
+    root = tree.getroot()
+
+    all_emotions = BASE_EMOTIONS + INTERMEDIATE_EMOTIONS
+    processed_count = 0
+
+    # One traversal finds every emotion layer and its paths and rects
+    groups, group_paths, group_rects = index_emotion_layers(root, all_emotions)
+
+    # Process each emotion
+    for emotion in all_emotions:
+        group = groups.get(emotion)
+
+        if group is None:
+            print(f"⚠️  Could not find layer: {emotion}")
+            continue
+
+        print(f"✓ Found: {emotion}")
+
+        # Determine if this is an intermediate emotion
+        is_intermediate = emotion in INTERMEDIATE_EMOTIONS
+
+        # Add classes to the group element
+        add_container_classes(group, emotion)
+
+        # For intermediate emotions, check if there's a rect (clickable target area)
+        rects = group_rects[emotion]
+        if rects and is_intermediate:
+            mark_bounding_box(rects[0])
+            print(f"  → Added bounding box class to rect")
+
+        # The first path is the petal shape, the rest are text paths
+        paths = group_paths[emotion]
+        for position, path in enumerate(paths):
+            classify_path(path, emotion, position)
+
+        if paths:
+            print(f"  → Added classes to {'graphic path' if is_intermediate else 'petal shape'}")
+        if len(paths) > 1:
+            letter_type = "intermediate" if is_intermediate else "text"
+            print(f"  → Added classes to {len(paths) - 1} {letter_type} paths")
+
+        processed_count += 1
+
+    print(f"\n✅ Processed {processed_count} emotions")
+
+    # Special fix for emotions with double background shapes
+    print(f"\n🔧 Applying double-background fix for {', '.join(DOUBLE_BACKGROUND_EMOTIONS)}...")
+    for emotion in DOUBLE_BACKGROUND_EMOTIONS:
+        group = groups.get(emotion)
+        if group is None:
+            print(f"⚠️  Could not find: {emotion}")
+            continue
+
+        print(f"✓ Fixing: {emotion}")
+
+        # Find the nested group that contains the two background shapes
+        nested_groups = [child for child in group if child.tag == SVG_G]
+        if nested_groups:
+            bg_group = nested_groups[0]  # First nested group has the backgrounds
+
+            # Get all paths in this group
+            paths = [child for child in bg_group if child.tag == SVG_PATH]
+
+            # Second path needs to be changed from central-letter to filled-shape
+            if len(paths) >= 2 and fix_double_background(paths[1], emotion):
+                print(f"  → Fixed second background path")
+
+    return tree
+
+
+def process_svg(input_path, output_path):
+    """Process SVG and add interactive classes
+
+    Returns the processed tree so later stages can use it without
+    parsing the output file again.
+    """
+
+    # Parse the SVG file
+    tree = load_svg(input_path)
+    process_svg_tree(tree)
+
+    # Write the modified SVG
+    write_svg(tree, output_path)
+    print(f"\n✅ Saved to: {output_path}")
+
+    return tree
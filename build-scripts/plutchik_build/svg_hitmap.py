@@ -0,0 +1,258 @@
+"""
+Hit map of the wheel: one polygon lookup instead of hit-testing every path
+
+The page binds a jQuery click handler to every element carrying an
+emotion's class, so the browser hit-tests the full-detail petal paths and
+every label glyph on each pointer event. hitmap_tree() reduces a
+processed SVG to what pointer events need:
+
+    {"viewBox": [x, y, width, height], "tolerance": 0.5,
+     "regions": [{"emotion": "joy", "bbox": [x0, y0, x1, y1],
+                  "rings": [[x, y, x, y, ...], ...]}, ...]}
+
+- every petal-shape path of a base emotion and every
+  intermediate-word-bounding-box rect of an intermediate one is a
+  region, in the user space of the viewBox (transforms applied);
+- outlines are sampled in bulk with NumPy and simplified with
+  Ramer-Douglas-Peucker, so no point of the real outline is further
+  than the tolerance from the region's edge;
+- regions are listed topmost first (reverse document order): the first
+  region whose rings contain a point (even-odd rule) is the element the
+  browser would have hit.
+
+The middle and outer petals are concave where they wrap the inner ring
+(their area is 92-93% of their convex hull), so they are kept as
+simplified outlines rather than hulls, which would take clicks from the
+inner petals. Label glyphs mostly lie on their petal or inside their
+bounding box; a label that reaches outside adds the convex hull of its
+glyphs. js/emotion-hitmap.js resolves pointer events against the map.
+NumPy is needed to build the map.
+"""
+
+import copy
+import gzip
+import json
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .jsonio import write_atomic
+from .svg import BASE_EMOTIONS, INTERMEDIATE_EMOTIONS, SVG_PATH, SVG_RECT
+from .svg_identify import parse_transform, sample_segments, shape_segments, transformed_segments
+from .svg_simplify import simplify_ring
+from .svg_split import is_label, rename_layers
+
+DEFAULT_TOLERANCE = 0.5
+DEFAULT_PRECISION = 1
+# Samples per cubic segment before simplifying
+OUTLINE_SAMPLES = 16
+BOUNDING_BOX_CLASS = 'intermediate-word-bounding-box'
+PETAL_CLASS = 'petal-shape'
+
+
+def convex_hull(points):
+    """Convex hull of (n, 2) points (monotone chain), counter-clockwise"""
+    ordered = sorted(set(map(tuple, points.tolist())))
+    if len(ordered) <= 2:
+        return np.array(ordered)
+
+    def chain(candidates):
+        hull = []
+        for x, y in candidates:
+            while len(hull) >= 2:
+                (ax, ay), (bx, by) = hull[-2], hull[-1]
+                if (bx - ax) * (y - ay) - (by - ay) * (x - ax) > 0:
+                    break
+                hull.pop()
+            hull.append((x, y))
+        return hull[:-1]
+
+    return np.array(chain(ordered) + chain(reversed(ordered)))
+
+
+def grow_hull(hull, distance):
+    """Move every edge of a counter-clockwise convex hull out by distance
+
+    Glyph points lie on the hull's edges; growing it by one rounding step
+    keeps them inside once the vertices are rounded.
+    """
+    if len(hull) < 3:
+        return hull
+    edges = np.roll(hull, -1, axis=0) - hull
+    normals = np.column_stack([edges[:, 1], -edges[:, 0]]) / np.hypot(*edges.T)[:, None]
+    before = np.roll(normals, 1, axis=0)
+    # Miter offset: distance along both adjacent edge normals
+    return hull + distance * (normals + before) / (1 + (normals * before).sum(axis=1))[:, None]
+
+
+def contains(rings, points):
+    """Even-odd test of many (n, 2) points against rings of (m, 2) points"""
+    inside = np.zeros(len(points), dtype=bool)
+    x, y = points[:, 0:1], points[:, 1:2]
+    for ring in rings:
+        xi, yi = ring[:, 0], ring[:, 1]
+        xj, yj = np.roll(xi, 1), np.roll(yi, 1)
+        straddles = (yi > y) != (yj > y)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            crossing_x = (xj - xi) * (y - yi) / (yj - yi) + xi
+        inside ^= (np.count_nonzero(straddles & (x < crossing_x), axis=1) % 2).astype(bool)
+    return inside
+
+
+def hit_shapes(root):
+    """The hit-testable shapes of every emotion, in document order
+
+    Returns [(emotion, element, 3x3 matrix)]: petal-shape paths of base
+    emotions, bounding-box rects of intermediate ones and label glyph
+    paths, each with the transform from its element up to the root.
+    """
+    emotions = set(BASE_EMOTIONS + INTERMEDIATE_EMOTIONS)
+    shapes = []
+    stack = [(child, np.identity(3), None) for child in reversed(root)]
+    while stack:
+        element, matrix, emotion = stack.pop()
+        transform = element.get('transform')
+        if transform:
+            matrix = matrix @ parse_transform(transform)
+        if element.get('id') in emotions:
+            emotion = element.get('id')
+        if emotion is not None:
+            classes = (element.get('class') or '').split()
+            if ((element.tag == SVG_PATH and PETAL_CLASS in classes and emotion in BASE_EMOTIONS)
+                    or (element.tag == SVG_RECT and BOUNDING_BOX_CLASS in classes)
+                    or (element.tag == SVG_PATH and is_label(element))):
+                shapes.append((emotion, element, matrix))
+        stack.extend((child, matrix, emotion) for child in reversed(element))
+    return shapes
+
+
+def _number(value, precision):
+    value = round(float(value), precision)
+    return int(value) if value == int(value) else value
+
+
+def _region(emotion, rings, precision):
+    everything = np.vstack(rings)
+    low, high = everything.min(axis=0), everything.max(axis=0)
+    return {
+        'emotion': emotion,
+        'bbox': [_number(v, precision) for v in (*low, *high)],
+        'rings': [[_number(v, precision) for v in ring.ravel()] for ring in rings],
+    }
+
+
+def hitmap_tree(tree, tolerance=DEFAULT_TOLERANCE, precision=DEFAULT_PRECISION, mapping=None):
+    """Build the hit map of a processed SVG tree
+
+    mapping (English layer id -> emotion name) renames translated layer
+    ids first, on a copy, so every language's map names the English ids.
+    A label whose glyphs reach outside its emotion's regions gets the
+    convex hull of its glyphs as one more region, at the label's place
+    in the paint order. Returns (hitmap, stats) where stats counts the
+    regions, the label regions and the outline points before and after
+    simplifying.
+    """
+    if np is None:
+        raise ImportError("building the hit map needs NumPy (pip install numpy)")
+    if mapping:
+        tree = copy.deepcopy(tree)
+        rename_layers(tree, mapping)
+    root = tree.getroot()
+    stats = {'regions': 0, 'label_regions': 0, 'sampled_points': 0, 'points': 0,
+             'emotions': set()}
+
+    bodies = []
+    body_rings = {}
+    labels = {}
+    for order, (emotion, element, matrix) in enumerate(hit_shapes(root)):
+        outlines = [sample_segments(segments, OUTLINE_SAMPLES)
+                    for segments in transformed_segments(shape_segments(element), matrix)]
+        if not outlines:
+            continue
+        if is_label(element):
+            first, points = labels.get(emotion, (order, []))
+            labels[emotion] = (first, points + outlines)
+            continue
+        rings = [simplify_ring(points, tolerance) for points in outlines]
+        stats['sampled_points'] += sum(len(points) for points in outlines)
+        stats['points'] += sum(len(ring) for ring in rings)
+        bodies.append((order, emotion, rings))
+        body_rings.setdefault(emotion, []).extend(rings)
+
+    for emotion, (first, outlines) in labels.items():
+        points = np.vstack(outlines)
+        if emotion in body_rings and contains(body_rings[emotion], points).all():
+            continue
+        hull = grow_hull(convex_hull(points), 10.0 ** -precision)
+        bodies.append((first, emotion, [hull]))
+        stats['label_regions'] += 1
+        stats['points'] += len(hull)
+
+    # Topmost first: the browser hits the last painted element
+    bodies.sort(key=lambda body: body[0], reverse=True)
+    regions = [_region(emotion, rings, precision) for _, emotion, rings in bodies]
+    stats['emotions'] = {region['emotion'] for region in regions}
+    stats['regions'] = len(regions)
+    view_box = [_number(v, precision) for v in (root.get('viewBox') or '').replace(',', ' ').split()]
+    return {'viewBox': view_box, 'tolerance': tolerance, 'regions': regions}, stats
+
+
+def _in_rings(rings, x, y):
+    """Even-odd test of a point against flat [x, y, ...] rings"""
+    inside = False
+    for ring in rings:
+        xs, ys = ring[0::2], ring[1::2]
+        j = len(xs) - 1
+        for i in range(len(xs)):
+            if (ys[i] > y) != (ys[j] > y) and x < (xs[j] - xs[i]) * (y - ys[i]) / (ys[j] - ys[i]) + xs[i]:
+                inside = not inside
+            j = i
+    return inside
+
+
+def emotion_at(hitmap, x, y):
+    """The emotion the hit map puts at user-space point (x, y), or None
+
+    The same lookup as emotion_at() in js/emotion-hitmap.js.
+    """
+    for region in hitmap['regions']:
+        x0, y0, x1, y1 = region['bbox']
+        if x0 <= x <= x1 and y0 <= y <= y1 and _in_rings(region['rings'], x, y):
+            return region['emotion']
+    return None
+
+
+def hitmap_json(hitmap):
+    return json.dumps(hitmap, separators=(',', ':'))
+
+
+def write_hitmap(tree, hitmap_path, tolerance=DEFAULT_TOLERANCE, precision=DEFAULT_PRECISION,
+                 mapping=None):
+    """Write the hit map of a processed SVG tree atomically
+
+    Returns (hitmap, stats) with the file's 'bytes' and 'gzip_bytes'
+    added to stats.
+    """
+    hitmap, stats = hitmap_tree(tree, tolerance, precision, mapping)
+    data = hitmap_json(hitmap).encode('utf-8')
+    hitmap_path = Path(hitmap_path)
+    hitmap_path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(hitmap_path, data)
+    stats['bytes'] = len(data)
+    stats['gzip_bytes'] = len(gzip.compress(data, 9))
+    return hitmap, stats
+
+
+def print_hitmap_report(stats, label):
+    """Print what write_hitmap() produced"""
+    emotions = len(BASE_EMOTIONS) + len(INTERMEDIATE_EMOTIONS)
+    print(f"🎯 {label}: {stats['regions']} hit regions for {len(stats['emotions'])}/{emotions} emotions "
+          f"({stats['label_regions']} for labels)")
+    print(f"   Outline points: {stats['sampled_points']:,} sampled → {stats['points']:,} kept")
+    print(f"   File: {stats['bytes']:,} bytes ({stats['gzip_bytes']:,} gzipped)")
+    missing = [e for e in BASE_EMOTIONS + INTERMEDIATE_EMOTIONS if e not in stats['emotions']]
+    if missing:
+        print(f"   ⚠️  No region for: {', '.join(missing)}")
@@ -0,0 +1,549 @@
+"""
+Identify the emotion layers of an SVG export from their geometry and colour
+
+process_svg_tree() finds each emotion by its layer id, so every layer of
+the artwork has to be named with the exact English id. Exports where the
+layers are unnamed, named after the translation ("gioia") or simply
+wrong are identified here instead:
+
+- the emotion layers are the top-level groups holding both label glyphs
+  (dark fills) and a body: coloured petal shapes for the 24 base
+  emotions, white bounding-box rects for the 8 intermediate ones;
+- fills are resolved through the .cls-N rules of the <style> sheet, the
+  style attribute, presentation attributes and inheritance;
+- every shape of every layer is parsed into cubic segments (lines and
+  quadratics are raised to cubics, transforms applied) and evaluated in
+  one NumPy pass; area centroids come from the shoelace sums over the
+  sampled outlines;
+- around the wheel centre, the base layers fall into 8 sectors (the
+  wheel's rotation is the 8-fold circular mean of their angles) and 3
+  rings (inner = high intensity); each intermediate layer sits between
+  two sectors;
+- the reference colours of the English template choose which sector is
+  which family (and whether the wheel runs clockwise), over all 24 base
+  layers at once, so a language that recolours a petal or two still
+  lines up. Each intermediate emotion is the one whose combo emotions
+  are the families on both sides of it.
+
+identify_layers_tree() then sets the English ids, so the result goes
+through process_svg_tree() like correctly named artwork. Layers that
+cannot be placed, or collide with a better match, keep their id and are
+reported. NumPy is only needed here; without it ImportError is raised.
+"""
+
+import math
+import re
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .svg import BASE_EMOTIONS, INTERMEDIATE_EMOTIONS, SVG_G, SVG_NS, SVG_PATH, SVG_RECT
+from .svg_minify import SVG_POLYGON, SVG_POLYLINE, parse_path
+from .svg_split import is_label
+from .svg_styles import SVG_STYLE, effective_declarations, parse_css_rules
+
+SECTORS = 8
+SECTOR_DEGREES = 360 / SECTORS
+# The base emotions in wheel order, one (low, medium, high) triple per family
+FAMILIES = [BASE_EMOTIONS[i:i + 3] for i in range(0, len(BASE_EMOTIONS), 3)]
+# Points sampled along each segment; enough for centroids within 0.1 px
+SEGMENT_SAMPLES = 8
+# Fills darker than this relative luminance are label glyphs
+LABEL_LUMINANCE = 0.25
+# Fills with every channel above this are the white bounding boxes
+WHITE_LEVEL = 0.95
+# An emotion layer has one petal or box (two for the double-background
+# emotions); a layer with more is background artwork
+MAX_BODY_SHAPES = 4
+
+NAMED_COLORS = {'black': (0, 0, 0), 'white': (255, 255, 255)}
+_NUMBER_RE = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+_TRANSFORM_RE = re.compile(r'(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)')
+_RGB_RE = re.compile(r'rgb\(\s*([^)]*)\)')
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("identifying SVG layers needs NumPy (pip install numpy)")
+
+
+def parse_color(value):
+    """(r, g, b) of a #rgb, #rrggbb, rgb() or black/white fill, else None"""
+    value = (value or '').strip().lower()
+    if value.startswith('#'):
+        digits = value[1:]
+        if len(digits) == 3:
+            digits = ''.join(c * 2 for c in digits)
+        if len(digits) == 6:
+            try:
+                return tuple(int(digits[i:i + 2], 16) for i in (0, 2, 4))
+            except ValueError:
+                return None
+        return None
+    match = _RGB_RE.match(value)
+    if match:
+        parts = [p.strip() for p in match.group(1).split(',')]
+        if len(parts) == 3:
+            return tuple(round(float(p[:-1]) * 2.55) if p.endswith('%') else int(float(p))
+                         for p in parts)
+    return NAMED_COLORS.get(value)
+
+
+def luminance(rgb):
+    r, g, b = (c / 255 for c in rgb)
+    return 0.2126 * r + 0.7152 * g + 0.0722 * b
+
+
+def parse_transform(text):
+    """3x3 affine matrix of an SVG transform attribute"""
+    matrix = np.identity(3)
+    for name, args in _TRANSFORM_RE.findall(text or ''):
+        values = [float(v) for v in _NUMBER_RE.findall(args)]
+        step = np.identity(3)
+        if name == 'matrix' and len(values) == 6:
+            a, b, c, d, e, f = values
+            step[:2] = [[a, c, e], [b, d, f]]
+        elif name == 'translate' and values:
+            step[0, 2] = values[0]
+            step[1, 2] = values[1] if len(values) > 1 else 0.0
+        elif name == 'scale' and values:
+            step[0, 0] = values[0]
+            step[1, 1] = values[1] if len(values) > 1 else values[0]
+        elif name == 'rotate' and values:
+            angle = math.radians(values[0])
+            cos, sin = math.cos(angle), math.sin(angle)
+            step[:2, :2] = [[cos, -sin], [sin, cos]]
+            if len(values) == 3:
+                cx, cy = values[1], values[2]
+                step[:2, 2] = [cx - cos * cx + sin * cy, cy - sin * cx - cos * cy]
+        elif name == 'skewX' and values:
+            step[0, 1] = math.tan(math.radians(values[0]))
+        elif name == 'skewY' and values:
+            step[1, 0] = math.tan(math.radians(values[0]))
+        matrix = matrix @ step
+    return matrix
+
+
+def _line(x0, y0, x1, y1):
+    return [x0, y0, x0, y0, x1, y1, x1, y1]
+
+
+def shape_segments(element):
+    """Outline of a path, rect, polygon or polyline as cubic segments
+
+    Returns a list of subpaths, each a list of [x0, y0, x1, y1, x2, y2,
+    x3, y3] control points. Arcs are taken as straight lines, which only
+    moves the centroid of the few shapes that have them slightly.
+    """
+    tag = element.tag
+    if tag == SVG_RECT:
+        x = float(element.get('x', 0))
+        y = float(element.get('y', 0))
+        w = float(element.get('width', 0))
+        h = float(element.get('height', 0))
+        corners = [(x, y), (x + w, y), (x + w, y + h), (x, y + h), (x, y)]
+        return [[_line(*corners[i], *corners[i + 1]) for i in range(4)]]
+    if tag in (SVG_POLYGON, SVG_POLYLINE):
+        values = [float(v) for v in _NUMBER_RE.findall(element.get('points', ''))]
+        points = list(zip(values[0::2], values[1::2]))
+        if tag == SVG_POLYGON and points:
+            points.append(points[0])
+        return [[_line(*points[i], *points[i + 1]) for i in range(len(points) - 1)]]
+
+    subpaths = []
+    current = []
+    x = y = start_x = start_y = 0.0
+    for command, args in parse_path(element.get('d', '')):
+        if command == 'M':
+            if current:
+                subpaths.append(current)
+            current = []
+            x, y = start_x, start_y = args
+            continue
+        if command == 'Z':
+            if (x, y) != (start_x, start_y):
+                current.append(_line(x, y, start_x, start_y))
+            x, y = start_x, start_y
+            continue
+        if command == 'C':
+            current.append([x, y, *args])
+        elif command == 'Q':
+            qx, qy, ex, ey = args
+            current.append([x, y, x + 2 / 3 * (qx - x), y + 2 / 3 * (qy - y),
+                            ex + 2 / 3 * (qx - ex), ey + 2 / 3 * (qy - ey), ex, ey])
+        else:
+            current.append(_line(x, y, args[-2], args[-1]))
+        x, y = args[-2], args[-1]
+    if current:
+        subpaths.append(current)
+    return subpaths
+
+
+def _layer_root(root):
+    """The element whose child groups are the layers, and its transform
+
+    Descends through wrapper groups that hold nothing but a single group.
+    """
+    node = root
+    matrix = np.identity(3)
+    while True:
+        children = [child for child in node if child.tag not in (f'{SVG_NS}defs', SVG_STYLE)]
+        if len(children) == 1 and children[0].tag == SVG_G:
+            node = children[0]
+            matrix = matrix @ parse_transform(node.get('transform'))
+        else:
+            return node, matrix
+
+
+def _style_rules(root):
+    rules = []
+    for style in root.iter(SVG_STYLE):
+        rules.extend(parse_css_rules(style.text or ''))
+    return rules
+
+
+def _own_fill(element, class_fill):
+    """The fill an element sets itself, by CSS precedence, or None
+
+    class_fill(class attribute) resolves the fill of the style classes.
+    """
+    for declaration in (element.get('style') or '').split(';'):
+        prop, _, value = declaration.partition(':')
+        if prop.strip() == 'fill':
+            return value.strip()
+    classes = element.get('class')
+    if classes:
+        fill = class_fill(classes)
+        if fill is not None:
+            return fill
+    return element.get('fill')
+
+
+SHAPE_TAGS = {SVG_PATH, SVG_RECT, SVG_POLYGON, SVG_POLYLINE}
+
+
+def layer_shapes(root):
+    """Collect the shapes of every top-level layer
+
+    Returns [(layer, [(element, kind, rgb, matrix), ...]), ...] in document
+    order, where kind is 'label', 'box', 'petal' or None (unfilled or
+    other shapes).
+    """
+    rules = _style_rules(root)
+    class_fills = {}
+
+    def class_fill(classes):
+        # Exports reuse a few dozen class lists for hundreds of shapes
+        if classes not in class_fills:
+            class_fills[classes] = dict(effective_declarations(rules, classes.split())).get('fill')
+        return class_fills[classes]
+
+    parent, parent_matrix = _layer_root(root)
+    layers = []
+    for layer in parent:
+        if layer.tag != SVG_G:
+            continue
+        shapes = []
+        stack = [(layer, parent_matrix, 'black')]
+        while stack:
+            element, matrix, inherited = stack.pop()
+            transform = element.get('transform')
+            if transform:
+                matrix = matrix @ parse_transform(transform)
+            fill = _own_fill(element, class_fill) or inherited
+            if element.tag in SHAPE_TAGS:
+                rgb = parse_color(fill)
+                if is_label(element) or (rgb is not None and luminance(rgb) < LABEL_LUMINANCE):
+                    kind = 'label'
+                elif rgb is None:
+                    kind = None
+                elif min(rgb) >= WHITE_LEVEL * 255:
+                    kind = 'box' if element.tag == SVG_RECT else None
+                else:
+                    kind = 'petal'
+                shapes.append((element, kind, rgb, matrix))
+            stack.extend((child, matrix, fill) for child in reversed(element))
+        layers.append((layer, shapes))
+    return layers
+
+
+def transformed_segments(subpaths, matrix):
+    """(n, 4, 2) control point arrays of shape_segments() subpaths, in
+    the user space of the 3x3 matrix; empty subpaths are dropped"""
+    return [np.asarray(subpath, dtype=float).reshape(-1, 4, 2) @ matrix[:2, :2].T + matrix[:2, 2]
+            for subpath in subpaths if subpath]
+
+
+def sample_segments(segments, samples=SEGMENT_SAMPLES):
+    """Points at t = 1/samples .. 1 of every (n, 4, 2) cubic segment, in order"""
+    # Cubic Bernstein weights: (samples, 4)
+    t = np.arange(1, samples + 1) / samples
+    u = 1 - t
+    bernstein = np.stack([u ** 3, 3 * u * u * t, 3 * u * t * t, t ** 3], axis=1)
+    return np.einsum('sk,nkd->nsd', bernstein, segments).reshape(-1, 2)
+
+
+def shape_geometry(shapes, samples=SEGMENT_SAMPLES):
+    """Signed areas and area centroids of shapes, computed in bulk
+
+    shapes is a list of (segments per subpath, 3x3 matrix). Returns
+    (areas, centroids) arrays; a shape without area gets the mean of its
+    points as centroid.
+    """
+    segments = []
+    subpath_ids = []
+    shape_of_subpath = []
+    for shape_index, (subpaths, matrix) in enumerate(shapes):
+        for points in transformed_segments(subpaths, matrix):
+            segments.append(points)
+            subpath_ids.append(np.full(len(points), len(shape_of_subpath)))
+            shape_of_subpath.append(shape_index)
+
+    count = len(shapes)
+    if not segments:
+        return np.zeros(count), np.zeros((count, 2))
+    segments = np.concatenate(segments)
+    subpath_ids = np.concatenate(subpath_ids)
+    shape_of_subpath = np.asarray(shape_of_subpath)
+
+    points = sample_segments(segments, samples)
+    point_subpath = np.repeat(subpath_ids, samples)
+
+    # Each point's successor on its closed subpath
+    successor = np.arange(1, len(points) + 1)
+    ends = np.flatnonzero(np.diff(point_subpath, append=-1))
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    successor[ends] = starts
+
+    x, y = points[:, 0], points[:, 1]
+    nx, ny = x[successor], y[successor]
+    cross = x * ny - nx * y
+    point_shape = shape_of_subpath[point_subpath]
+
+    areas = np.bincount(point_shape, cross, minlength=count) / 2
+    moment_x = np.bincount(point_shape, (x + nx) * cross, minlength=count) / 6
+    moment_y = np.bincount(point_shape, (y + ny) * cross, minlength=count) / 6
+    sizes = np.bincount(point_shape, minlength=count)
+    mean_x = np.bincount(point_shape, x, minlength=count) / np.maximum(sizes, 1)
+    mean_y = np.bincount(point_shape, y, minlength=count) / np.maximum(sizes, 1)
+
+    flat = np.abs(areas) < 1e-9
+    safe = np.where(flat, 1.0, areas)
+    centroids = np.stack([np.where(flat, mean_x, moment_x / safe),
+                          np.where(flat, mean_y, moment_y / safe)], axis=1)
+    return areas, centroids
+
+
+def _rings(radii, iterations=20):
+    """Ring of each radius (0 inner .. 2 outer) by 1-D k-means"""
+    centres = np.quantile(radii, [0.0, 0.5, 1.0])
+    for _ in range(iterations):
+        ring = np.argmin(np.abs(radii[:, None] - centres[None, :]), axis=1)
+        updated = np.array([radii[ring == k].mean() if np.any(ring == k) else centres[k]
+                            for k in range(3)])
+        if np.allclose(updated, centres):
+            break
+        centres = updated
+    return np.argsort(np.argsort(centres))[ring]
+
+
+def fit_wheel(centroids, iterations=10):
+    """Centre of the wheel and the ring of each base layer centroid
+
+    The rings are concentric circles. Starting from the mean, the rings
+    are assigned by radius and one centre shared by the three circles is
+    fitted by least squares (x² + y² = 2·cx·x + 2·cy·y + c_ring), so
+    missing layers do not pull the centre off like they pull the mean.
+    """
+    centre = centroids.mean(0)
+    rings = _rings(np.hypot(*(centroids - centre).T))
+    if len(centroids) < 6:
+        return centre, rings
+    for _ in range(iterations):
+        design = np.column_stack([2 * centroids, np.identity(3)[rings]])
+        solution = np.linalg.lstsq(design, (centroids ** 2).sum(1), rcond=None)[0]
+        converged = np.allclose(solution[:2], centre, atol=1e-3)
+        centre = solution[:2]
+        rings = _rings(np.hypot(*(centroids - centre).T))
+        if converged:
+            break
+    return centre, rings
+
+
+def _dyads(reference):
+    """Intermediate emotion of each pair of neighbouring families"""
+    family_of = {family[1]: index for index, family in enumerate(FAMILIES)}
+    dyads = {}
+    for emotion in INTERMEDIATE_EMOTIONS:
+        combo = reference.get(emotion, {})
+        pair = frozenset(family_of.get(combo.get(key)) for key in ('combo-emotion-0', 'combo-emotion-1'))
+        if None not in pair and len(pair) == 2:
+            dyads[pair] = emotion
+    return dyads
+
+
+def identify_layers(tree, reference):
+    """Work out the English id of every emotion layer of a parsed SVG
+
+    reference is the English emotions template (read_emotions_csv() of
+    translations/template.csv): its "color" values and combo emotions.
+    Returns a dict with 'layers' (English id -> layer element), 'shapes'
+    (English id -> {'petal': n, 'label': n, 'box': n}), 'unresolved'
+    (layers that look like emotion layers but got no id, with a reason),
+    'centre', 'rotation' (angle of the first family's sector, in degrees
+    of user space where y points down, so -90 is straight up) and
+    'clockwise'.
+    """
+    _require_numpy()
+    root = tree.getroot()
+
+    candidates = []
+    geometry_input = []
+    for layer, shapes in layer_shapes(root):
+        kinds = [kind for _, kind, _, _ in shapes]
+        if 'label' not in kinds or ('petal' not in kinds and 'box' not in kinds):
+            continue
+        kind = 'base' if 'petal' in kinds else 'intermediate'
+        body = 'petal' if kind == 'base' else 'box'
+        if kinds.count(body) > MAX_BODY_SHAPES:
+            continue
+        first = len(geometry_input)
+        bodies = [(element, rgb) for element, shape_kind, rgb, matrix in shapes if shape_kind == body]
+        geometry_input.extend((shape_segments(element), matrix)
+                              for element, shape_kind, _, matrix in shapes if shape_kind == body)
+        counts = {name: kinds.count(name) for name in ('petal', 'label', 'box')}
+        candidates.append({'layer': layer, 'kind': kind, 'bodies': bodies,
+                           'slice': slice(first, len(geometry_input)), 'counts': counts})
+
+    result = {'layers': {}, 'shapes': {}, 'unresolved': [], 'centre': None,
+              'rotation': None, 'clockwise': None}
+    base = [c for c in candidates if c['kind'] == 'base']
+    if not base:
+        result['unresolved'] = [(c['layer'], "no base emotion layers to orient the wheel")
+                                for c in candidates]
+        return result
+
+    areas, centroids = shape_geometry(geometry_input)
+    weights = np.abs(areas)
+    for candidate in candidates:
+        part = candidate['slice']
+        w = weights[part]
+        if w.sum() > 0:
+            candidate['centroid'] = (centroids[part] * w[:, None]).sum(0) / w.sum()
+        else:
+            candidate['centroid'] = centroids[part].mean(0)
+        # The layer's colour is the fill of its largest body shape
+        candidate['rgb'] = candidate['bodies'][int(np.argmax(w))][1] if len(w) else None
+
+    base_centroids = np.array([c['centroid'] for c in base])
+    centre, rings = fit_wheel(base_centroids)
+    offsets = base_centroids - centre
+    angles = np.degrees(np.arctan2(offsets[:, 1], offsets[:, 0]))
+
+    # The sectors repeat every 45 degrees: their phase is the circular mean of 8 * angle
+    phase = np.radians(angles * SECTORS)
+    rotation = math.degrees(math.atan2(np.sin(phase).mean(), np.cos(phase).mean())) / SECTORS
+    sectors = np.round((angles - rotation) / SECTOR_DEGREES).astype(int) % SECTORS
+
+    # Colour distance of every base layer to every base emotion: (layers, 24)
+    colors = np.array([c['rgb'] for c in base], dtype=float)
+    reference_colors = np.array([parse_color(reference.get(e, {}).get('color')) or (128, 128, 128)
+                                 for e in BASE_EMOTIONS], dtype=float)
+    distances = np.linalg.norm(colors[:, None, :] - reference_colors[None, :, :], axis=2)
+
+    # Every hypothesis: first family's sector (start) and direction
+    starts = np.tile(np.arange(SECTORS), 2)
+    directions = np.repeat([1, -1], SECTORS)
+    families = (starts[:, None] + directions[:, None] * sectors[None, :]) % SECTORS
+    # Triples run low, medium, high: the outer ring is the low intensity
+    emotion_index = families * 3 + (2 - rings[None, :])
+    costs = distances[np.arange(len(base))[None, :], emotion_index].sum(axis=1)
+    best = int(np.argmin(costs))
+    start, direction = int(starts[best]), int(directions[best])
+
+    claims = {}
+    for i, candidate in enumerate(base):
+        emotion = BASE_EMOTIONS[emotion_index[best, i]]
+        claims.setdefault(emotion, []).append((distances[i, emotion_index[best, i]], candidate))
+
+    dyads = _dyads(reference)
+    for candidate in candidates:
+        if candidate['kind'] != 'intermediate':
+            continue
+        dx, dy = candidate['centroid'] - centre
+        angle = math.degrees(math.atan2(dy, dx))
+        gap = int(math.floor(((angle - rotation) % 360) / SECTOR_DEGREES)) % SECTORS
+        pair = frozenset(((start + direction * gap) % SECTORS, (start + direction * (gap + 1)) % SECTORS))
+        emotion = dyads.get(pair)
+        if emotion is None:
+            result['unresolved'].append((candidate['layer'], "no intermediate emotion between "
+                                         f"{' and '.join(FAMILIES[f][1] for f in sorted(pair))}"))
+            continue
+        # Closer to the middle of the gap is the better claim
+        offset = abs(((angle - rotation) % SECTOR_DEGREES) - SECTOR_DEGREES / 2)
+        claims.setdefault(emotion, []).append((offset, candidate))
+
+    for emotion, claimants in claims.items():
+        claimants.sort(key=lambda claim: claim[0])
+        winner = claimants[0][1]
+        result['layers'][emotion] = winner['layer']
+        result['shapes'][emotion] = winner['counts']
+        for _, loser in claimants[1:]:
+            result['unresolved'].append((loser['layer'], f"also placed as {emotion}, a closer match won"))
+
+    result['centre'] = (float(centre[0]), float(centre[1]))
+    # The first family's sector k solves start + direction * k = 0 (mod 8)
+    first_sector = (-start * direction) % SECTORS
+    result['rotation'] = (rotation + first_sector * SECTOR_DEGREES + 180) % 360 - 180
+    result['clockwise'] = direction == 1
+    return result
+
+
+def identify_layers_tree(tree, reference):
+    """Give every identified emotion layer its English id, in place
+
+    Elements that carry an English emotion id without being identified
+    as that emotion lose the id, so process_svg_tree() never picks a
+    wrong layer. Returns the identification with 'renamed' ([(old id,
+    English id)], old id None for unnamed layers) and 'elapsed' added.
+    """
+    start = time.perf_counter()
+    result = identify_layers(tree, reference)
+    identified = {id(layer): emotion for emotion, layer in result['layers'].items()}
+    english = set(BASE_EMOTIONS + INTERMEDIATE_EMOTIONS)
+
+    for element in tree.getroot().iter():
+        if element.get('id') in english and id(element) not in identified:
+            del element.attrib['id']
+
+    renamed = []
+    for emotion, layer in result['layers'].items():
+        old_id = layer.get('id')
+        if old_id != emotion:
+            renamed.append((old_id, emotion))
+        layer.set('id', emotion)
+
+    result['renamed'] = renamed
+    result['elapsed'] = time.perf_counter() - start
+    return result
+
+
+def print_identify_report(result, label):
+    """Print what identify_layers_tree() did to one SVG"""
+    total = len(BASE_EMOTIONS) + len(INTERMEDIATE_EMOTIONS)
+    print(f"🧭 {label}: identified {len(result['layers'])}/{total} emotion layers "
+          f"in {result.get('elapsed', 0) * 1000:.0f} ms")
+    if result['centre'] is not None:
+        x, y = result['centre']
+        print(f"   Wheel centre ({x:.1f}, {y:.1f}), {FAMILIES[0][1]} at {result['rotation']:.1f}°, "
+              f"{'clockwise' if result['clockwise'] else 'counter-clockwise'}")
+    for old_id, emotion in result.get('renamed', []):
+        print(f"   {old_id or '(unnamed)'} → {emotion}")
+    for layer, reason in result['unresolved']:
+        print(f"   ⚠️  {layer.get('id') or '(unnamed layer)'}: {reason}")
+    missing = [e for e in BASE_EMOTIONS + INTERMEDIATE_EMOTIONS if e not in result['layers']]
+    if missing:
+        print(f"   ⚠️  Not found: {', '.join(missing)}")
@@ -0,0 +1,384 @@
+"""
+Minify SVG path data
+
+Path data is parsed into absolute segments, rounded to a fixed number of
+decimals and written back in whichever form is shortest: absolute or
+relative, H/V for axis-aligned lines, S/T when the control point is a
+reflection of the previous one, repeated command letters omitted and only
+the separators that are really needed.
+
+Relative coordinates are computed from the rounded position the browser
+will actually reach, so rounding errors never accumulate along a path.
+Every rewritten path is parsed again and compared point by point with the
+original; a path whose deviation exceeds the tolerance is left untouched.
+"""
+
+import re
+from pathlib import Path
+
+from .svg import SVG_NS, load_svg, write_svg
+
+SVG_POLYGON = f'{SVG_NS}polygon'
+SVG_POLYLINE = f'{SVG_NS}polyline'
+
+DEFAULT_PRECISION = 1
+DEFAULT_TOLERANCE = 0.1
+
+# Number of arguments per command
+ARG_COUNTS = {'M': 2, 'L': 2, 'H': 1, 'V': 1, 'C': 6, 'S': 4, 'Q': 4, 'T': 2, 'A': 7, 'Z': 0}
+
+_COMMAND_RE = re.compile(r'[MmZzLlHhVvCcSsQqTtAa]')
+_NUMBER_RE = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+_FLAG_RE = re.compile(r'[01]')
+_SEPARATOR_RE = re.compile(r'[\s,]*')
+
+
+class PathSyntaxError(ValueError):
+    """Path data that cannot be parsed"""
+
+
+def _tokenize(d):
+    """Yield (command, args) pairs exactly as written, implicit repeats split out"""
+    pos = 0
+    length = len(d)
+    command = None
+
+    while True:
+        pos = _SEPARATOR_RE.match(d, pos).end()
+        if pos >= length:
+            return
+
+        match = _COMMAND_RE.match(d, pos)
+        if match:
+            command = match.group()
+            pos = match.end()
+        elif command is None:
+            raise PathSyntaxError(f"path data must start with a command: {d[:20]!r}")
+        elif command in 'Zz':
+            raise PathSyntaxError(f"unexpected number after Z at {pos}")
+        elif command in 'Mm':
+            # Coordinates after a moveto are implicit lineto commands
+            command = 'l' if command == 'm' else 'L'
+
+        count = ARG_COUNTS[command.upper()]
+        args = []
+        for i in range(count):
+            pos = _SEPARATOR_RE.match(d, pos).end()
+            # Arc flags are single characters and may be written without separators
+            pattern = _FLAG_RE if command in 'Aa' and i in (3, 4) else _NUMBER_RE
+            match = pattern.match(d, pos)
+            if not match:
+                raise PathSyntaxError(f"expected {count} numbers after {command!r} at {pos}")
+            args.append(float(match.group()))
+            pos = match.end()
+
+        yield command, args
+
+        if command in 'Mm':
+            # Further pairs belong to an implicit lineto
+            command = 'l' if command == 'm' else 'L'
+
+
+def parse_path(d):
+    """Parse path data into absolute segments using only M, L, C, Q, A and Z"""
+    segments = []
+    x = y = 0.0
+    start_x = start_y = 0.0
+    prev_cmd = None
+    ctrl_x = ctrl_y = 0.0
+
+    for command, args in _tokenize(d):
+        upper = command.upper()
+        relative = command != upper
+
+        if upper == 'Z':
+            segments.append(('Z', []))
+            x, y = start_x, start_y
+            prev_cmd = 'Z'
+            continue
+
+        if upper == 'H':
+            args = [args[0] + x if relative else args[0], y]
+            upper, relative = 'L', False
+        elif upper == 'V':
+            args = [x, args[0] + y if relative else args[0]]
+            upper, relative = 'L', False
+        elif upper == 'A':
+            if relative:
+                args = args[:5] + [args[5] + x, args[6] + y]
+        elif relative:
+            args = [v + (y if i % 2 else x) for i, v in enumerate(args)]
+
+        if upper == 'S':
+            if prev_cmd == 'C':
+                rx, ry = 2 * x - ctrl_x, 2 * y - ctrl_y
+            else:
+                rx, ry = x, y
+            args = [rx, ry] + args
+            upper = 'C'
+        elif upper == 'T':
+            if prev_cmd == 'Q':
+                rx, ry = 2 * x - ctrl_x, 2 * y - ctrl_y
+            else:
+                rx, ry = x, y
+            args = [rx, ry] + args
+            upper = 'Q'
+
+        if upper == 'C':
+            ctrl_x, ctrl_y = args[2], args[3]
+        elif upper == 'Q':
+            ctrl_x, ctrl_y = args[0], args[1]
+
+        segments.append((upper, args))
+        x, y = args[-2], args[-1]
+        if upper == 'M':
+            start_x, start_y = x, y
+        prev_cmd = upper
+
+    return segments
+
+
+def format_number(value, precision):
+    """Shortest decimal form of value rounded to precision decimals"""
+    text = f"{value:.{precision}f}" if precision > 0 else f"{round(value):d}"
+    if '.' in text:
+        text = text.rstrip('0').rstrip('.')
+    if text.startswith('0.'):
+        text = text[1:]
+    elif text.startswith('-0.'):
+        text = '-' + text[2:]
+    if text in ('-0', '', '-'):
+        text = '0'
+    return text
+
+
+def _join_numbers(numbers):
+    """Join formatted numbers with the fewest separators"""
+    out = []
+    prev = None
+    for number in numbers:
+        if prev is not None:
+            if not (number[0] == '-' or (number[0] == '.' and '.' in prev)):
+                out.append(' ')
+        out.append(number)
+        prev = number
+    return ''.join(out)
+
+
+class _PathWriter:
+    """Emit segments in the shortest form, tracking the rendered position"""
+
+    def __init__(self, precision):
+        self.precision = precision
+        self.parts = []
+        self.last_letter = None
+        self.last_number = None
+        self.x = self.y = 0.0
+        self.start_x = self.start_y = 0.0
+        self.prev_cmd = None
+        self.ctrl_x = self.ctrl_y = 0.0
+
+    def round(self, value):
+        return round(value, self.precision)
+
+    def fmt(self, values):
+        return [format_number(v, self.precision) for v in values]
+
+    def emit(self, letter, numbers):
+        if letter == self.last_letter and letter not in 'Mm' and numbers:
+            # Repeated command: the letter can be omitted
+            first = numbers[0]
+            if not (first[0] == '-' or (first[0] == '.' and '.' in self.last_number)):
+                self.parts.append(' ')
+        else:
+            self.parts.append(letter)
+        self.parts.append(_join_numbers(numbers))
+        self.last_letter = letter
+        self.last_number = numbers[-1] if numbers else None
+
+    def choose(self, abs_letter, abs_values, rel_values):
+        """Emit whichever of the absolute and relative forms is shorter"""
+        abs_numbers = self.fmt(abs_values)
+        rel_numbers = self.fmt(rel_values)
+        abs_len = len(_join_numbers(abs_numbers)) + (abs_letter != self.last_letter)
+        rel_letter = abs_letter.lower()
+        rel_len = len(_join_numbers(rel_numbers)) + (rel_letter != self.last_letter)
+        if rel_len < abs_len:
+            self.emit(rel_letter, rel_numbers)
+        else:
+            self.emit(abs_letter, abs_numbers)
+
+    def rel(self, values):
+        """Relative form of absolute rounded coordinate pairs"""
+        return [self.round(v - (self.y if i % 2 else self.x)) for i, v in enumerate(values)]
+
+    def segment(self, command, args):
+        r = self.round
+        if command == 'Z':
+            self.emit('z', [])
+            self.x, self.y = self.start_x, self.start_y
+            self.prev_cmd = 'Z'
+            return
+
+        if command == 'A':
+            end = [r(args[5]), r(args[6])]
+            head = [r(args[0]), r(args[1]), r(args[2]), int(args[3]), int(args[4])]
+            self.choose('A', head + end, head + self.rel(end))
+        else:
+            values = [r(v) for v in args]
+            if command == 'M':
+                self.choose('M', values, self.rel(values))
+            elif command == 'L':
+                nx, ny = values
+                if ny == self.y:
+                    self.choose('H', [nx], [self.round(nx - self.x)])
+                elif nx == self.x:
+                    self.choose('V', [ny], [self.round(ny - self.y)])
+                else:
+                    self.choose('L', values, self.rel(values))
+            elif command in 'CQ':
+                reflect = (self.prev_cmd == command)
+                rx = self.round(2 * self.x - self.ctrl_x) if reflect else self.x
+                ry = self.round(2 * self.y - self.ctrl_y) if reflect else self.y
+                if values[0] == rx and values[1] == ry:
+                    short = 'S' if command == 'C' else 'T'
+                    self.choose(short, values[2:], self.rel(values[2:]))
+                else:
+                    self.choose(command, values, self.rel(values))
+                ctrl = values[2:4] if command == 'C' else values[0:2]
+                self.ctrl_x, self.ctrl_y = ctrl
+
+        self.x, self.y = (r(args[-2]), r(args[-1]))
+        if command == 'M':
+            self.start_x, self.start_y = self.x, self.y
+        self.prev_cmd = command
+
+    def text(self):
+        return ''.join(self.parts)
+
+
+def format_path(segments, precision):
+    """Write absolute segments as the shortest path data string"""
+    writer = _PathWriter(precision)
+    for command, args in segments:
+        writer.segment(command, args)
+    return writer.text()
+
+
+def minify_path(d, precision=DEFAULT_PRECISION):
+    """Return minified path data for d"""
+    return format_path(parse_path(d), precision)
+
+
+def max_deviation(d_a, d_b):
+    """Largest coordinate difference between two equivalent paths
+
+    Returns infinity if the paths do not have the same segment structure.
+    """
+    a = parse_path(d_a)
+    b = parse_path(d_b)
+    if len(a) != len(b):
+        return float('inf')
+
+    worst = 0.0
+    for (cmd_a, args_a), (cmd_b, args_b) in zip(a, b):
+        if cmd_a != cmd_b:
+            return float('inf')
+        if cmd_a == 'A' and (args_a[3] != args_b[3] or args_a[4] != args_b[4]):
+            return float('inf')
+        for va, vb in zip(args_a, args_b):
+            worst = max(worst, abs(va - vb))
+    return worst
+
+
+def minify_points(points, precision=DEFAULT_PRECISION):
+    """Round and compact a polygon/polyline points list"""
+    values = [float(v) for v in _NUMBER_RE.findall(points)]
+    return _join_numbers([format_number(round(v, precision), precision) for v in values])
+
+
+def minify_svg_tree(tree, precision=DEFAULT_PRECISION, tolerance=DEFAULT_TOLERANCE):
+    """Minify every path and polygon in a tree in place
+
+    Returns a stats dict with the path data size before and after, the
+    number of paths rewritten and kept, and the largest deviation of any
+    rewritten path.
+    """
+    stats = {
+        'paths': 0,
+        'kept': 0,
+        'bytes_before': 0,
+        'bytes_after': 0,
+        'max_deviation': 0.0,
+    }
+
+    for element in tree.getroot().iter():
+        tag = element.tag
+        if tag in (SVG_POLYGON, SVG_POLYLINE):
+            attr = 'points'
+        elif element.get('d') is not None:
+            attr = 'd'
+        else:
+            continue
+
+        original = element.get(attr)
+        if original is None:
+            continue
+
+        try:
+            if attr == 'd':
+                minified = minify_path(original, precision)
+                deviation = max_deviation(original, minified)
+            else:
+                minified = minify_points(original, precision)
+                before = [float(v) for v in _NUMBER_RE.findall(original)]
+                after = [float(v) for v in _NUMBER_RE.findall(minified)]
+                deviation = max((abs(a - b) for a, b in zip(before, after)), default=0.0)
+        except PathSyntaxError:
+            minified, deviation = original, float('inf')
+
+        stats['paths'] += 1
+        stats['bytes_before'] += len(original)
+        if deviation > tolerance or len(minified) >= len(original):
+            stats['kept'] += 1
+            stats['bytes_after'] += len(original)
+            continue
+
+        element.set(attr, minified)
+        stats['bytes_after'] += len(minified)
+        stats['max_deviation'] = max(stats['max_deviation'], deviation)
+
+    return stats
+
+
+def print_minify_report(stats, label, file_before=None, file_after=None):
+    """Print the bytes saved by minifying one SVG"""
+    saved = stats['bytes_before'] - stats['bytes_after']
+    percent = 100 * saved / stats['bytes_before'] if stats['bytes_before'] else 0
+    print(f"🗜  Minified path data in {label}")
+    print(f"   Paths:         {stats['paths']} ({stats['kept']} left unchanged)")
+    print(f"   Path data:     {stats['bytes_before']:,} → {stats['bytes_after']:,} bytes "
+          f"(-{saved:,}, {percent:.1f}%)")
+    if file_before is not None and file_after is not None:
+        file_saved = file_before - file_after
+        print(f"   File:          {file_before:,} → {file_after:,} bytes (-{file_saved:,})")
+    print(f"   Max deviation: {stats['max_deviation']:.4f}")
+
+
+def minify_svg(input_path, output_path, precision=DEFAULT_PRECISION,
+               tolerance=DEFAULT_TOLERANCE, tree=None):
+    """Minify the path data of an SVG file and report the bytes saved
+
+    If tree is given it is used instead of parsing input_path (it must
+    hold the same document). Returns (tree, stats).
+    """
+    file_before = Path(input_path).stat().st_size
+    if tree is None:
+        tree = load_svg(input_path)
+
+    stats = minify_svg_tree(tree, precision, tolerance)
+    write_svg(tree, output_path)
+
+    print_minify_report(stats, Path(output_path).name, file_before,
+                        Path(output_path).stat().st_size)
+    return tree, stats
@@ -0,0 +1,360 @@
+"""
+Simplify petal and ring outlines to a tolerance (Ramer-Douglas-Peucker)
+
+Every path of the wheel that is not a label glyph is simplified: the
+petal-shape and filled-shape paths of the emotion layers and the
+coloured and stroked rings, dividers and arrows of the background.
+Label glyphs (central-letter, intermediate-letter and the dark title
+fills) are never touched. Each path is simplified two ways and the
+shorter result is kept:
+
+- curves: a cubic or quadratic segment whose control points lie within
+  half the tolerance of its chord becomes a line, and every run of lines
+  is simplified with Ramer-Douglas-Peucker to the other half;
+- polyline: each subpath is flattened to within FLATNESS and simplified
+  with Ramer-Douglas-Peucker.
+
+The written path is parsed again, both outlines are flattened with NumPy
+and the samples of each are measured against the other polyline, subpath
+by subpath.
+A path that would move by more than the tolerance, or would not get
+fewer vertices and bytes, is left unchanged. The tolerance is in user
+units of the viewBox (a CSS pixel at the wheel's natural size); the
+scale of an element's transforms is taken into account.
+"""
+
+import math
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .svg import SVG_PATH, load_svg, write_svg
+from .svg_identify import layer_shapes, shape_segments
+from .svg_minify import SVG_POLYGON, SVG_POLYLINE, format_path, minify_points, parse_path
+
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_PRECISION = 2
+# Largest distance between a curve and its flattened or compared samples
+FLATNESS = 0.01
+
+
+def _rdp(points, keep, first, last, tolerance):
+    """Mark in keep the points Ramer-Douglas-Peucker keeps between first and last"""
+    stack = [(first, last)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        start, end = points[first], points[last]
+        inner = points[first + 1:last]
+        chord = end - start
+        length = np.hypot(*chord)
+        if length == 0:
+            distances = np.hypot(*(inner - start).T)
+        else:
+            distances = np.abs(chord[0] * (inner[:, 1] - start[1])
+                               - chord[1] * (inner[:, 0] - start[0])) / length
+        index = int(np.argmax(distances))
+        if distances[index] > tolerance:
+            split = first + 1 + index
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+
+
+def simplify_polyline(points, tolerance):
+    """Ramer-Douglas-Peucker simplification of an open (n, 2) polyline
+
+    The first and last points are always kept. Returns the kept points in
+    order.
+    """
+    if len(points) <= 2:
+        return points
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+    _rdp(points, keep, 0, len(points) - 1, tolerance)
+    return points[keep]
+
+
+def simplify_ring(points, tolerance):
+    """Ramer-Douglas-Peucker simplification of a closed ring of points
+
+    The ring is split at its first point and the point farthest from it,
+    and each half is simplified on its own. Returns the kept points, in
+    order, without repeating the first one.
+    """
+    if len(points) <= 3:
+        return points
+    far = int(np.argmax(np.hypot(*(points - points[0]).T)))
+    ring = np.vstack([points, points[:1]])
+    keep = np.zeros(len(ring), dtype=bool)
+    keep[[0, far, len(ring) - 1]] = True
+    _rdp(ring, keep, 0, far, tolerance)
+    _rdp(ring, keep, far, len(ring) - 1, tolerance)
+    return ring[:-1][keep[:-1]]
+
+
+def sample_outline(segments, flatness=FLATNESS):
+    """Points along (n, 4, 2) cubic segments, within flatness of the curve
+
+    Each segment gets the number of samples Wang's formula gives for its
+    second differences, so lines get one and tight curves many. Returns
+    the start point followed by the samples, in order.
+    """
+    second = np.maximum(np.hypot(*(segments[:, 0] - 2 * segments[:, 1] + segments[:, 2]).T),
+                        np.hypot(*(segments[:, 1] - 2 * segments[:, 2] + segments[:, 3]).T))
+    counts = np.maximum(1, np.ceil(np.sqrt(0.75 * second / flatness))).astype(int)
+    owner = np.repeat(np.arange(len(segments)), counts)
+    offsets = np.cumsum(counts) - counts
+    t = (np.arange(counts.sum()) - offsets[owner] + 1) / counts[owner]
+    u = 1 - t
+    bernstein = np.stack([u ** 3, 3 * u * u * t, 3 * u * t * t, t ** 3], axis=1)
+    samples = np.einsum('sk,skd->sd', bernstein, segments[owner])
+    return np.vstack([segments[0, 0], samples])
+
+
+def max_distance_to_polyline(points, polyline, limit):
+    """Largest distance of (n, 2) points to the nearest segment of a polyline
+
+    Only segments whose bounding box grown by limit holds a point are
+    measured (found by a sweep over the points sorted by x), so the result
+    is exact up to limit and infinity beyond it.
+    """
+    start = polyline[:-1] if len(polyline) > 1 else polyline
+    end = polyline[1:] if len(polyline) > 1 else polyline
+    low = np.minimum(start, end) - limit
+    high = np.maximum(start, end) + limit
+
+    order = np.argsort(points[:, 0], kind='stable')
+    xs = points[order, 0]
+    first = np.searchsorted(xs, low[:, 0], side='left')
+    counts = np.searchsorted(xs, high[:, 0], side='right') - first
+    segment = np.repeat(np.arange(len(start)), counts)
+    point = order[np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts - first, counts)]
+    near = (points[point, 1] >= low[segment, 1]) & (points[point, 1] <= high[segment, 1])
+    segment, point = segment[near], point[near]
+
+    edge = end[segment] - start[segment]
+    offset = points[point] - start[segment]
+    t = np.clip((offset * edge).sum(axis=1) / np.maximum((edge * edge).sum(axis=1), 1e-300), 0, 1)
+    distances = np.hypot(*(offset - t[:, None] * edge).T)
+    nearest = np.full(len(points), np.inf)
+    np.minimum.at(nearest, point, distances)
+    return float(nearest.max()) if len(points) else 0.0
+
+
+def outline_deviation(subpaths_a, subpaths_b, limit):
+    """Largest distance between two shape_segments() outlines
+
+    Subpaths are compared pairwise, the samples of each against the
+    polyline of the other; returns infinity if their number differs or
+    the distance exceeds limit.
+    """
+    if len(subpaths_a) != len(subpaths_b):
+        return math.inf
+    worst = 0.0
+    for a, b in zip(subpaths_a, subpaths_b):
+        points_a = sample_outline(np.asarray(a, dtype=float).reshape(-1, 4, 2))
+        points_b = sample_outline(np.asarray(b, dtype=float).reshape(-1, 4, 2))
+        worst = max(worst, max_distance_to_polyline(points_a, points_b, limit),
+                    max_distance_to_polyline(points_b, points_a, limit))
+        if worst > limit:
+            return math.inf
+    return worst
+
+
+def _subpaths(segments):
+    """Split parse_path() segments into (start, segments, closed) subpaths"""
+    subpaths = []
+    for command, args in segments:
+        if command == 'M':
+            subpaths.append(((args[0], args[1]), [], False))
+        elif command == 'Z':
+            if subpaths:
+                start, body, _ = subpaths[-1]
+                subpaths[-1] = (start, body, True)
+        elif subpaths:
+            subpaths[-1][1].append((command, args))
+    return subpaths
+
+
+def _is_flat(start, args, tolerance):
+    """Whether the control points of a C or Q segment are within tolerance of its chord"""
+    (x0, y0), (x1, y1) = start, args[-2:]
+    dx, dy = x1 - x0, y1 - y0
+    length2 = dx * dx + dy * dy
+    for x, y in zip(args[0:-2:2], args[1:-2:2]):
+        t = min(max(((x - x0) * dx + (y - y0) * dy) / length2, 0), 1) if length2 else 0
+        if math.hypot(x - x0 - t * dx, y - y0 - t * dy) > tolerance:
+            return False
+    return True
+
+
+def _curves_candidate(subpaths, tolerance):
+    segments = []
+    for start, body, closed in subpaths:
+        segments.append(('M', list(start)))
+        run = [start]
+        for command, args in body:
+            end = tuple(args[-2:])
+            if command == 'L' or (command in 'CQ' and _is_flat(run[-1], args, tolerance / 2)):
+                run.append(end)
+                continue
+            segments.extend(('L', p) for p in
+                            simplify_polyline(np.array(run, dtype=float), tolerance / 2)[1:].tolist())
+            segments.append((command, args))
+            run = [end]
+        segments.extend(('L', p) for p in
+                        simplify_polyline(np.array(run, dtype=float), tolerance / 2)[1:].tolist())
+        if closed:
+            segments.append(('Z', []))
+    return segments
+
+
+def _polyline_candidate(subpaths, outline, tolerance):
+    segments = []
+    outline = iter(outline)
+    for start, body, closed in subpaths:
+        segments.append(('M', list(start)))
+        if body:
+            points = sample_outline(np.asarray(next(outline), dtype=float).reshape(-1, 4, 2))
+            kept = simplify_polyline(points, tolerance)[1:]
+            if closed and len(kept) and tuple(kept[-1]) == tuple(start):
+                kept = kept[:-1]
+            segments.extend(('L', p) for p in kept.tolist())
+        if closed:
+            segments.append(('Z', []))
+    return segments
+
+
+def vertex_count(segments):
+    """On-curve and control points of parse_path() segments"""
+    return sum(1 if command == 'A' else len(args) // 2 for command, args in segments)
+
+
+def simplify_element(element, tolerance, precision=DEFAULT_PRECISION):
+    """Simplify the outline of one path, polygon or polyline in place
+
+    tolerance is in the element's own units. Returns (vertices before,
+    vertices after, deviation); the element is unchanged (and deviation
+    0) when no simplified form is within tolerance and smaller.
+    """
+    tag = element.tag
+    attr = 'd' if tag == SVG_PATH else 'points'
+    original = element.get(attr) or ''
+    outline = shape_segments(element)
+
+    if tag == SVG_PATH:
+        segments = parse_path(original)
+        if any(command == 'A' for command, _ in segments):
+            return vertex_count(segments), vertex_count(segments), 0.0
+        before = vertex_count(segments)
+        subpaths = _subpaths(segments)
+        # Flattening is budgeted a rounding step less than the tolerance
+        flat_tolerance = max(tolerance - 10.0 ** -precision, tolerance / 2)
+        candidates = [_curves_candidate(subpaths, tolerance - 10.0 ** -precision),
+                      _polyline_candidate(subpaths, outline, flat_tolerance)]
+        texts = [(format_path(candidate, precision), vertex_count(candidate))
+                 for candidate in candidates]
+    else:
+        points = sample_outline(np.asarray(outline[0], dtype=float).reshape(-1, 4, 2)) \
+            if outline else np.zeros((0, 2))
+        if tag == SVG_POLYGON:
+            points = points[:-1]
+            kept = simplify_ring(points, tolerance - 10.0 ** -precision)
+        else:
+            kept = simplify_polyline(points, tolerance - 10.0 ** -precision)
+        before = len(points)
+        texts = [(minify_points(' '.join(f"{x!r},{y!r}" for x, y in kept.tolist()), precision),
+                  len(kept))]
+
+    for text, after in sorted(texts, key=lambda item: len(item[0])):
+        if after >= before or len(text) >= len(original):
+            continue
+        deviation = outline_deviation(outline, shape_segments(ET.Element(tag, {attr: text})),
+                                      tolerance)
+        if deviation <= tolerance:
+            element.set(attr, text)
+            return before, after, deviation
+    return before, before, 0.0
+
+
+def simplify_svg_tree(tree, tolerance=DEFAULT_TOLERANCE, precision=DEFAULT_PRECISION):
+    """Simplify the petal and ring outlines of a tree in place
+
+    Returns a stats dict with per-layer 'layers' (layer id -> paths,
+    rewritten, vertices and bytes before and after) and the totals, plus
+    the largest deviation of any rewritten path in user units.
+    """
+    if np is None:
+        raise ImportError("simplifying outlines needs NumPy (pip install numpy)")
+    keys = ('paths', 'rewritten', 'vertices_before', 'vertices_after',
+            'bytes_before', 'bytes_after')
+    stats = dict.fromkeys(keys, 0)
+    stats.update({'layers': {}, 'max_deviation': 0.0, 'tolerance': tolerance})
+
+    for index, (layer, shapes) in enumerate(layer_shapes(tree.getroot())):
+        layer_stats = dict.fromkeys(keys, 0)
+        for element, kind, _, matrix in shapes:
+            if kind in ('label', 'box') or element.tag not in (SVG_PATH, SVG_POLYGON, SVG_POLYLINE):
+                continue
+            attr = 'd' if element.tag == SVG_PATH else 'points'
+            bytes_before = len(element.get(attr) or '')
+            # Largest stretch of the element's transforms
+            scale = float(np.linalg.norm(matrix[:2, :2], 2)) or 1.0
+            before, after, deviation = simplify_element(element, tolerance / scale, precision)
+            layer_stats['paths'] += 1
+            layer_stats['rewritten'] += after < before
+            layer_stats['vertices_before'] += before
+            layer_stats['vertices_after'] += after
+            layer_stats['bytes_before'] += bytes_before
+            layer_stats['bytes_after'] += len(element.get(attr) or '')
+            stats['max_deviation'] = max(stats['max_deviation'], deviation * scale)
+        if layer_stats['paths']:
+            stats['layers'][layer.get('id') or f"layer {index + 1}"] = layer_stats
+            for key in keys:
+                stats[key] += layer_stats[key]
+    return stats
+
+
+def print_simplify_report(stats, label, file_before=None, file_after=None):
+    """Print the vertices and bytes saved per layer by simplify_svg_tree()"""
+    def percent(before, after):
+        return 100 * (before - after) / before if before else 0
+
+    print(f"📐 Simplified petal and ring outlines in {label} (tolerance {stats['tolerance']})")
+    width = max([len(name) for name in stats['layers']] + [5])
+    for name, layer in stats['layers'].items():
+        print(f"   {name:<{width}}  {layer['rewritten']:>3}/{layer['paths']:<3} paths  "
+              f"{layer['vertices_before']:>5} → {layer['vertices_after']:<5} vertices  "
+              f"{layer['bytes_before']:>6,} → {layer['bytes_after']:<6,} bytes")
+    print(f"   {'Total':<{width}}  {stats['rewritten']:>3}/{stats['paths']:<3} paths  "
+          f"{stats['vertices_before']:>5} → {stats['vertices_after']:<5} vertices "
+          f"(-{percent(stats['vertices_before'], stats['vertices_after']):.1f}%)  "
+          f"{stats['bytes_before']:,} → {stats['bytes_after']:,} bytes "
+          f"(-{percent(stats['bytes_before'], stats['bytes_after']):.1f}%)")
+    if file_before is not None and file_after is not None:
+        print(f"   File: {file_before:,} → {file_after:,} bytes (-{file_before - file_after:,})")
+    within = "✓" if stats['max_deviation'] <= stats['tolerance'] else "❌"
+    print(f"   Max deviation: {stats['max_deviation']:.4f} {within}")
+
+
+def simplify_svg(input_path, output_path, tolerance=DEFAULT_TOLERANCE,
+                 precision=DEFAULT_PRECISION, tree=None):
+    """Simplify the outlines of an SVG file and report the savings
+
+    If tree is given it is used instead of parsing input_path. Returns
+    (tree, stats).
+    """
+    file_before = Path(input_path).stat().st_size
+    if tree is None:
+        tree = load_svg(input_path)
+    stats = simplify_svg_tree(tree, tolerance, precision)
+    write_svg(tree, output_path)
+    print_simplify_report(stats, Path(output_path).name, file_before,
+                          Path(output_path).stat().st_size)
+    return tree, stats
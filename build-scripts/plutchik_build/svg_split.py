@@ -0,0 +1,253 @@
+"""
+Split a processed SVG into shared wheel geometry and per-language labels
+
+Every language version of the wheel draws the same petals, rings, arrows
+and click targets; only the label glyph paths (classes central-letter and
+intermediate-letter) differ. split_svg_tree() moves the labels out of a
+processed tree:
+
+- the geometry sheet is the tree without its labels, with the standard
+  English layer ids, and is the same file for every language;
+- the label layer holds one <g data-label-slot="..."> per run of label
+  paths, and is all a language adds on top.
+
+Where a run of labels was removed, the geometry keeps an empty
+<g data-label-slot="..."/> placeholder, so compose_svg() can put each
+label back at its exact place in the document: hover rules like
+.emotion-container:hover .intermediate-letter need the labels inside their
+emotion layer, and paint order must not change.
+
+An SVG whose layers carry translated ids (the Italian source) is renamed to
+the English ids first, using the language's SVG mapping (English layer id
+-> emotion name). Geometry written by one language is compared with every
+other language within a tolerance before it is shared.
+"""
+
+import copy
+import json
+import re
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from .svg import BASE_EMOTIONS, INTERMEDIATE_EMOTIONS, SVG_G, load_svg, write_svg
+from .svg_minify import PathSyntaxError, max_deviation
+
+SLOT_ATTR = 'data-label-slot'
+LABEL_CLASSES = {'central-letter', 'intermediate-letter'}
+DEFAULT_TOLERANCE = 0.05
+
+# Attributes whose numbers may differ by the tolerance between languages
+NUMERIC_ATTRIBUTES = {'d', 'points', 'transform', 'x', 'y', 'width', 'height',
+                      'cx', 'cy', 'r', 'rx', 'ry', 'x1', 'y1', 'x2', 'y2'}
+
+_NUMBER_RE = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+
+
+class GeometryMismatchError(ValueError):
+    """The geometry of two language versions differs beyond the tolerance"""
+
+    def __init__(self, problems):
+        self.problems = problems
+        super().__init__(f"{len(problems)} geometry difference(s): " + '; '.join(problems[:5]))
+
+
+def is_label(element):
+    return bool(LABEL_CLASSES.intersection((element.get('class') or '').split()))
+
+
+def load_svg_mapping(path):
+    """Read an SVG mapping (English layer id -> emotion name)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def rename_layers(tree, mapping):
+    """Rename translated layer ids and emotion classes to the English ids in place
+
+    Elements whose id is an emotion name of the mapping get the English id;
+    class tokens naming such an emotion (and its "-color" variant) are
+    renamed the same way. Returns the number of layers renamed.
+    """
+    english = set(BASE_EMOTIONS + INTERMEDIATE_EMOTIONS)
+    to_english = {name: svg_id for svg_id, name in mapping.items()
+                  if svg_id in english and name not in english}
+    tokens = dict(to_english)
+    tokens.update({f"{name}-color": f"{svg_id}-color" for name, svg_id in to_english.items()})
+
+    renamed = 0
+    for element in tree.getroot().iter():
+        element_id = element.get('id')
+        if element_id in to_english:
+            element.set('id', to_english[element_id])
+            renamed += 1
+        classes = element.get('class')
+        if classes:
+            element.set('class', ' '.join(tokens.get(token, token) for token in classes.split()))
+    return renamed
+
+
+def split_svg_tree(tree):
+    """Return (geometry tree, labels tree) for a processed SVG tree
+
+    The input tree is not modified. Each run of consecutive label siblings
+    becomes one slot named after its emotion layer ("<id>-<n>"); slots
+    outside any emotion layer are named "wheel-<n>".
+    """
+    root = copy.deepcopy(tree.getroot())
+    labels_root = ET.Element(root.tag, {key: value for key, value in root.attrib.items()
+                                        if key in ('viewBox', 'width', 'height')})
+    emotions = set(BASE_EMOTIONS + INTERMEDIATE_EMOTIONS)
+    counters = {}
+
+    stack = [(root, 'wheel')]
+    while stack:
+        parent, layer = stack.pop()
+        children = list(parent)
+        run = []
+        nested = []
+        for child in children + [None]:
+            if child is not None and is_label(child):
+                run.append(child)
+                continue
+            if run:
+                counters[layer] = counters.get(layer, 0) + 1
+                slot = f"{layer}-{counters[layer]}"
+                index = list(parent).index(run[0])
+                placeholder = ET.Element(SVG_G, {SLOT_ATTR: slot})
+                placeholder.tail = run[-1].tail
+                for label in run:
+                    parent.remove(label)
+                parent.insert(index, placeholder)
+
+                group = ET.SubElement(labels_root, SVG_G, {SLOT_ATTR: slot})
+                group.extend(run)
+                run = []
+            if child is not None and len(child):
+                child_id = child.get('id')
+                nested.append((child, child_id if child_id in emotions else layer))
+        # Visit nested layers in document order
+        stack.extend(reversed(nested))
+
+    return ET.ElementTree(root), ET.ElementTree(labels_root)
+
+
+def compose_svg(geometry_tree, labels_tree):
+    """Put the labels back into a copy of the geometry and return the tree
+
+    Each placeholder is replaced by the label paths of its slot; slots the
+    label layer does not fill are dropped.
+    """
+    root = copy.deepcopy(geometry_tree.getroot())
+    slots = {group.get(SLOT_ATTR): list(group) for group in labels_tree.getroot()
+             if group.get(SLOT_ATTR)}
+
+    for parent in list(root.iter()):
+        for placeholder in [child for child in parent if child.get(SLOT_ATTR)]:
+            index = list(parent).index(placeholder)
+            labels = [copy.deepcopy(label) for label in slots.get(placeholder.get(SLOT_ATTR), [])]
+            if labels:
+                labels[-1].tail = placeholder.tail
+            elif index:
+                parent[index - 1].tail = placeholder.tail
+            parent.remove(placeholder)
+            for offset, label in enumerate(labels):
+                parent.insert(index + offset, label)
+
+    return ET.ElementTree(root)
+
+
+def _numbers_deviation(a, b):
+    """Largest difference between the numbers of two attribute values
+
+    Returns infinity if the text around the numbers differs.
+    """
+    if _NUMBER_RE.sub('#', a) != _NUMBER_RE.sub('#', b):
+        return float('inf')
+    pairs = zip(_NUMBER_RE.findall(a), _NUMBER_RE.findall(b))
+    return max((abs(float(x) - float(y)) for x, y in pairs), default=0.0)
+
+
+def attribute_deviation(name, a, b):
+    if a == b:
+        return 0.0
+    if a is None or b is None or name not in NUMERIC_ATTRIBUTES:
+        return float('inf')
+    if name == 'd':
+        try:
+            return max_deviation(a, b)
+        except PathSyntaxError:
+            pass
+    return _numbers_deviation(a, b)
+
+
+def _location(element, ancestors):
+    named = [e.get('id') for e in ancestors + [element] if e.get('id')]
+    tag = element.tag.rsplit('}', 1)[-1]
+    return f"{'/'.join(named) or 'svg'} <{tag}>"
+
+
+def compare_geometry(a, b, tolerance=DEFAULT_TOLERANCE):
+    """List every difference between two geometry trees beyond tolerance"""
+    problems = []
+    stack = [(a.getroot(), b.getroot(), [])]
+    while stack:
+        element_a, element_b, ancestors = stack.pop()
+        where = _location(element_a, ancestors)
+        if element_a.tag != element_b.tag:
+            problems.append(f"{where}: element differs from <{element_b.tag.rsplit('}', 1)[-1]}>")
+            continue
+        for name in sorted(set(element_a.attrib) | set(element_b.attrib)):
+            deviation = attribute_deviation(name, element_a.get(name), element_b.get(name))
+            if deviation > tolerance:
+                detail = 'differs' if deviation == float('inf') else f"deviates by {deviation:.3f}"
+                problems.append(f"{where}: {name} {detail}")
+        if (element_a.text or '').strip() != (element_b.text or '').strip():
+            problems.append(f"{where}: text differs")
+        if len(element_a) != len(element_b):
+            problems.append(f"{where}: {len(element_a)} children vs {len(element_b)}")
+            continue
+        stack.extend((child_a, child_b, ancestors + [element_a])
+                     for child_a, child_b in zip(element_a, element_b))
+    return problems
+
+
+def split_svg(svg_path, labels_path, geometry_path, mapping=None,
+              tolerance=DEFAULT_TOLERANCE, tree=None):
+    """Write the label layer of a processed SVG and share its geometry
+
+    If geometry_path exists, this language's geometry must match it within
+    tolerance (GeometryMismatchError otherwise) and it is left as is;
+    otherwise it is written. mapping (English layer id -> emotion name)
+    renames translated layer ids first. If tree is given it is used
+    instead of parsing svg_path. Returns a dict of byte sizes and counts.
+    """
+    tree = copy.deepcopy(tree) if tree is not None else load_svg(svg_path)
+    renamed = rename_layers(tree, mapping) if mapping else 0
+    geometry, labels = split_svg_tree(tree)
+
+    geometry_path = Path(geometry_path)
+    shared = geometry_path.exists()
+    if shared:
+        problems = compare_geometry(load_svg(geometry_path), geometry, tolerance)
+        if problems:
+            raise GeometryMismatchError(problems)
+    else:
+        write_svg(geometry, geometry_path)
+    write_svg(labels, labels_path)
+
+    stats = {
+        'renamed': renamed,
+        'slots': len(labels.getroot()),
+        'labels': sum(len(group) for group in labels.getroot()),
+        'svg_bytes': Path(svg_path).stat().st_size,
+        'geometry_bytes': geometry_path.stat().st_size,
+        'labels_bytes': Path(labels_path).stat().st_size,
+        'geometry_reused': shared,
+    }
+    print(f"✂️  Split {Path(svg_path).name}: {stats['labels']} label paths in "
+          f"{stats['slots']} slots" + (f", {renamed} layers renamed to English ids" if renamed else ''))
+    action = 'matches' if shared else 'written to'
+    print(f"   Geometry: {action} {geometry_path} ({stats['geometry_bytes']:,} bytes)")
+    print(f"   Labels:   {labels_path} ({stats['labels_bytes']:,} bytes, "
+          f"{100 * stats['labels_bytes'] / stats['svg_bytes']:.0f}% of the full SVG)")
+    return stats
@@ -0,0 +1,288 @@
+"""
+Streaming SVG processing for large artwork
+
+Elements are classified as they are parsed and written out straight away,
+then dropped from memory, so peak memory depends on the nesting depth of
+the document rather than its size. The output is byte-identical to
+process_svg() (ElementTree.write); documents where that cannot be
+guaranteed up front are handed to the tree-based mode instead.
+"""
+
+import io
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from .jsonio import atomic_output
+from .svg import (
+    BASE_EMOTIONS,
+    INTERMEDIATE_EMOTIONS,
+    DOUBLE_BACKGROUND_EMOTIONS,
+    SVG_G,
+    SVG_PATH,
+    SVG_RECT,
+    add_container_classes,
+    classify_path,
+    fix_double_background,
+    index_emotion_layers,
+    mark_bounding_box,
+    process_svg,
+)
+
+CHUNK_SIZE = 1 << 16
+
+ALL_EMOTIONS = BASE_EMOTIONS + INTERMEDIATE_EMOTIONS
+EMOTION_ORDER = {emotion: i for i, emotion in enumerate(ALL_EMOTIONS)}
+
+# Prefixes ElementTree.write gives the namespaces a root may declare: the
+# default SVG namespace plutchik_build.svg registers, and xml, which
+# ElementTree always knows. Any other namespace would get an invented
+# ns<N> prefix in tree mode, so it is not streamed.
+NAMESPACE_PREFIXES = {
+    'http://www.w3.org/2000/svg': '',
+    'http://www.w3.org/XML/1998/namespace': 'xml',
+}
+
+# Entities ElementTree.write uses in attribute values on top of &, < and >
+_ATTRIB_ENTITIES = {'"': '&quot;', '\r': '&#13;', '\n': '&#10;', '\t': '&#09;'}
+
+
+def _escape_cdata(text):
+    return escape(text)
+
+
+def _escape_attrib(text):
+    # Always double quotes, as ElementTree writes them, so not quoteattr()
+    return escape(text, _ATTRIB_ENTITIES)
+
+
+class StreamingUnsupported(Exception):
+    """The document cannot be streamed with output identical to tree mode"""
+
+
+class _Layer:
+    """Per-emotion state while the layer's element is open"""
+
+    __slots__ = ('emotion', 'element', 'paths', 'has_rect', 'bg_group', 'bg_paths')
+
+    def __init__(self, emotion, element):
+        self.emotion = emotion
+        self.element = element
+        self.paths = 0
+        self.has_rect = False
+        self.bg_group = None
+        self.bg_paths = 0
+
+
+def _classify(element, parent, layers, found):
+    """Apply every class rule for element at its start event
+
+    layers are the emotion layers enclosing element. Rules run in the same
+    order as process_svg_tree(): per emotion in ALL_EMOTIONS order, then
+    the double-background fix. Returns the layers enclosing element's
+    children.
+    """
+    rules = []
+    tag = element.tag
+
+    for layer in layers:
+        if tag == SVG_PATH:
+            rules.append((EMOTION_ORDER[layer.emotion], classify_path, layer.emotion, layer.paths))
+            layer.paths += 1
+        elif tag == SVG_RECT and not layer.has_rect:
+            layer.has_rect = True
+            if layer.emotion in INTERMEDIATE_EMOTIONS:
+                rules.append((EMOTION_ORDER[layer.emotion], mark_bounding_box))
+
+    emotion = element.get('id')
+    if emotion in EMOTION_ORDER and emotion not in found and parent is not None:
+        layer = _Layer(emotion, element)
+        found[emotion] = layer
+        rules.append((EMOTION_ORDER[emotion], add_container_classes, emotion))
+        child_layers = layers + (layer,)
+    else:
+        child_layers = layers
+
+    rules.sort(key=lambda rule: rule[0])
+    for _, rule, *args in rules:
+        rule(element, *args)
+
+    # Double-background fix: second direct path of the layer's first direct <g>
+    for layer in layers:
+        if layer.emotion not in DOUBLE_BACKGROUND_EMOTIONS:
+            continue
+        if tag == SVG_G and parent is layer.element and layer.bg_group is None:
+            layer.bg_group = element
+        elif tag == SVG_PATH and parent is layer.bg_group:
+            layer.bg_paths += 1
+            if layer.bg_paths == 2:
+                fix_double_background(element, layer.emotion)
+
+    return child_layers
+
+
+class _StreamWriter:
+    """Serialize elements from start/end events the way ElementTree does"""
+
+    def __init__(self, write):
+        self.write = write
+        self.qnames = {}
+        self.declared = {}
+        self.used = set()
+        self.open_tag = None      # element whose start tag still needs '>' or ' />'
+        self.finished = None      # last closed element whose tail is pending
+        self.stack = []
+
+    def qname(self, name):
+        """Map {uri}local to ElementTree's serialized name"""
+        if name in self.qnames:
+            return self.qnames[name]
+        if name[:1] == '{':
+            uri, local = name[1:].split('}', 1)
+            if uri not in self.declared:
+                raise StreamingUnsupported(f"namespace not declared on the root: {uri}")
+            self.used.add(uri)
+            prefix = self.declared[uri]
+            qname = f"{prefix}:{local}" if prefix else local
+        else:
+            qname = name
+        self.qnames[name] = qname
+        return qname
+
+    def declare(self, uris):
+        """Declare the root's namespaces with the prefixes ElementTree would write"""
+        for uri in uris:
+            prefix = NAMESPACE_PREFIXES.get(uri)
+            if prefix is None:
+                # ElementTree would invent an ns<N> prefix by discovery order
+                raise StreamingUnsupported(f"no known prefix for namespace: {uri}")
+            self.declared[uri] = prefix
+
+    def _flush_pending(self):
+        if self.open_tag is not None:
+            self.write('>')
+            if self.open_tag.text:
+                self.write(_escape_cdata(self.open_tag.text))
+            self.open_tag = None
+        elif self.finished is not None:
+            self._release_finished()
+
+    def _release_finished(self):
+        element = self.finished
+        if element.tail:
+            self.write(_escape_cdata(element.tail))
+        if self.stack:
+            # Drop the finished subtree so memory stays bounded
+            self.stack[-1].remove(element)
+        self.finished = None
+
+    def start(self, element):
+        self._flush_pending()
+
+        self.write('<' + self.qname(element.tag))
+        if not self.stack:
+            for uri, prefix in sorted(self.declared.items(), key=lambda x: x[1]):
+                if prefix:
+                    prefix = ':' + prefix
+                self.write(f' xmlns{prefix}="{_escape_attrib(uri)}"')
+        for key, value in element.items():
+            self.write(f' {self.qname(key)}="{_escape_attrib(value)}"')
+
+        self.open_tag = element
+        self.stack.append(element)
+
+    def end(self, element):
+        if self.open_tag is element:
+            if element.text:
+                self.write('>' + _escape_cdata(element.text) + '</' + self.qname(element.tag) + '>')
+            else:
+                self.write(' />')
+            self.open_tag = None
+        else:
+            if self.finished is not None:
+                self._release_finished()
+            self.write('</' + self.qname(element.tag) + '>')
+        self.stack.pop()
+        self.finished = element
+
+    def close(self):
+        if self.finished is not None:
+            self._release_finished()
+        unused = set(self.declared) - self.used
+        if unused:
+            raise StreamingUnsupported(f"unused namespace declared on the root: {sorted(unused)}")
+
+
+def _stream(input_path, text_out, chunk_size):
+    """Classify and write the document in one pass; returns found layers"""
+    parser = ET.XMLPullParser(events=('start', 'end', 'start-ns'))
+    writer = _StreamWriter(text_out.write)
+
+    found = {}                # emotion -> _Layer (first occurrence only)
+    enclosing = []            # per open element: layers enclosing its children
+    root_namespaces = []
+    started = False
+
+    with open(input_path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if chunk:
+                parser.feed(chunk)
+            else:
+                parser.close()
+
+            for event, item in parser.read_events():
+                if event == 'start':
+                    if not started:
+                        writer.declare(root_namespaces)
+                        started = True
+                    layers = enclosing[-1] if enclosing else ()
+                    parent = writer.stack[-1] if writer.stack else None
+                    enclosing.append(_classify(item, parent, layers, found))
+                    writer.start(item)
+                elif event == 'end':
+                    enclosing.pop()
+                    writer.end(item)
+                elif started:
+                    # Tree mode hoists nested declarations to the root
+                    raise StreamingUnsupported(f"namespace declared below the root: {item[1]}")
+                else:
+                    root_namespaces.append(item[1])
+
+            if not chunk:
+                break
+
+    writer.close()
+    return found
+
+
+def process_svg_stream(input_path, output_path, chunk_size=CHUNK_SIZE):
+    """Process an SVG while streaming it from input to output
+
+    Produces exactly the same bytes as process_svg(). If the document uses
+    namespaces in a way that would make the streamed output differ, falls
+    back to process_svg(). Returns the list of emotion layers found.
+    """
+    output_path = Path(output_path)
+
+    try:
+        with atomic_output(output_path, 'wb') as raw:
+            # Same wrapper settings ElementTree.write uses
+            with io.TextIOWrapper(raw, encoding='utf-8', errors='xmlcharrefreplace',
+                                  newline='\n') as text_out:
+                text_out.write("<?xml version='1.0' encoding='utf-8'?>\n")
+                found = _stream(input_path, text_out, chunk_size)
+    except StreamingUnsupported as e:
+        print(f"⚠️  Cannot stream {input_path}: {e}")
+        print(f"   Falling back to tree-based processing")
+        tree = process_svg(input_path, output_path)
+        groups = index_emotion_layers(tree.getroot(), ALL_EMOTIONS)[0]
+        return [emotion for emotion in ALL_EMOTIONS if emotion in groups]
+
+    for emotion in ALL_EMOTIONS:
+        if emotion not in found:
+            print(f"⚠️  Could not find layer: {emotion}")
+    print(f"\n✅ Processed {len(found)} emotions (streaming)")
+    print(f"\n✅ Saved to: {output_path}")
+
+    return [emotion for emotion in ALL_EMOTIONS if emotion in found]
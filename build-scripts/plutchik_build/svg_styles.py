@@ -0,0 +1,238 @@
+"""
+Language-independent style classes for the processed SVGs
+
+Illustrator numbers its .cls-N rules differently in every export, even when
+the palettes match. canonicalize_svg_styles() works out the declarations
+each element actually gets from its style classes and renames the classes
+after a hash of those declarations, so identical styling gets the same
+class name in every language. The canonical rules of all languages can
+then be written to one shared stylesheet that browsers cache once.
+
+Canonicalizing is idempotent: canonical rules hash to their own names.
+"""
+
+import hashlib
+import re
+from pathlib import Path
+
+from .jsonio import write_atomic
+from .svg import SVG_NS, load_svg, write_svg
+
+SVG_STYLE = f'{SVG_NS}style'
+SVG_DEFS = f'{SVG_NS}defs'
+
+DEFAULT_PREFIX = 'pw'
+
+_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+_RULE_RE = re.compile(r'([^{}]+)\{([^{}]*)\}')
+_CLASS_SELECTOR_RE = re.compile(r'^\.(-?[_a-zA-Z][\w-]*)$')
+
+
+class UnsupportedStyles(ValueError):
+    """A <style> block this stage cannot rewrite safely"""
+
+
+def parse_css_rules(css_text):
+    """Parse flat CSS into [(selectors, [(property, value), ...]), ...]
+
+    Only plain rule sets are supported; at-rules raise UnsupportedStyles.
+    """
+    css_text = _COMMENT_RE.sub('', css_text)
+    if '@' in css_text:
+        raise UnsupportedStyles("at-rules are not supported")
+
+    rules = []
+    consumed = 0
+    for match in _RULE_RE.finditer(css_text):
+        if css_text[consumed:match.start()].strip():
+            raise UnsupportedStyles(f"cannot parse CSS near: {css_text[consumed:match.start()][:40]!r}")
+        consumed = match.end()
+
+        selectors = [s.strip() for s in match.group(1).split(',') if s.strip()]
+        declarations = []
+        for declaration in match.group(2).split(';'):
+            if not declaration.strip():
+                continue
+            prop, _, value = declaration.partition(':')
+            declarations.append((prop.strip().lower(), normalize_value(value)))
+        rules.append((selectors, declarations))
+
+    if css_text[consumed:].strip():
+        raise UnsupportedStyles(f"cannot parse CSS near: {css_text[consumed:][:40]!r}")
+    return rules
+
+
+def normalize_value(value):
+    """Collapse whitespace and case so equal values compare equal"""
+    value = ' '.join(value.split()).lower()
+    # Illustrator writes .5px; keep one spelling of leading-zero numbers
+    return re.sub(r'(?<![\w.])\.(\d)', r'0.\1', value)
+
+
+def class_selectors(rules):
+    """Return the class names used as simple .name selectors
+
+    Raises UnsupportedStyles for any other kind of selector, since renaming
+    classes could then change what it matches.
+    """
+    names = set()
+    for selectors, _ in rules:
+        for selector in selectors:
+            match = _CLASS_SELECTOR_RE.match(selector)
+            if not match:
+                raise UnsupportedStyles(f"only simple class selectors are supported: {selector!r}")
+            names.add(match.group(1))
+    return names
+
+
+def effective_declarations(rules, classes):
+    """Declarations an element with the given style classes ends up with
+
+    Rules are replayed in source order, which is how the cascade resolves
+    equal-specificity class selectors.
+    """
+    wanted = {f'.{name}' for name in classes}
+    result = {}
+    for selectors, declarations in rules:
+        if wanted.intersection(selectors):
+            for prop, value in declarations:
+                result[prop] = value
+    return tuple(sorted(result.items()))
+
+
+def canonical_name(declarations, prefix=DEFAULT_PREFIX, length=6):
+    """Class name derived from the declarations it carries"""
+    text = ';'.join(f'{prop}:{value}' for prop, value in declarations)
+    return f"{prefix}-{hashlib.sha1(text.encode('utf-8')).hexdigest()[:length]}"
+
+
+def format_rules(canonical_rules, indent=''):
+    """Format {name: declarations} as one compact rule per line"""
+    lines = []
+    for name in sorted(canonical_rules):
+        body = ';'.join(f'{prop}:{value}' for prop, value in canonical_rules[name])
+        lines.append(f"{indent}.{name}{{{body}}}")
+    return '\n'.join(lines)
+
+
+def _style_elements(tree):
+    return [element for element in tree.getroot().iter(SVG_STYLE)]
+
+
+def canonicalize_svg_styles(tree, prefix=DEFAULT_PREFIX):
+    """Rename the style classes of a tree to canonical names in place
+
+    Every distinct combination of style classes on an element becomes one
+    canonical class holding its effective declarations. The <style> block
+    is rewritten to the canonical rules. Returns {name: declarations}.
+    """
+    style_elements = _style_elements(tree)
+    css_text = ''.join(element.text or '' for element in style_elements)
+    rules = parse_css_rules(css_text)
+    style_classes = class_selectors(rules)
+
+    canonical_rules = {}
+    renames = {}
+
+    for element in tree.getroot().iter():
+        class_attr = element.get('class')
+        if not class_attr:
+            continue
+        tokens = class_attr.split()
+        styled = tuple(t for t in tokens if t in style_classes)
+        if not styled:
+            continue
+
+        if styled not in renames:
+            declarations = effective_declarations(rules, styled)
+            name = canonical_name(declarations, prefix)
+            if canonical_rules.get(name, declarations) != declarations:
+                raise UnsupportedStyles(f"class name collision for {name}")
+            canonical_rules[name] = declarations
+            renames[styled] = name
+
+        # The canonical class takes the place of the first style class
+        new_tokens = []
+        for token in tokens:
+            if token in style_classes:
+                if token == styled[0]:
+                    new_tokens.append(renames[styled])
+            else:
+                new_tokens.append(token)
+        element.set('class', ' '.join(new_tokens))
+
+    for i, element in enumerate(style_elements):
+        element.text = f"\n{format_rules(canonical_rules, '      ')}\n    " if i == 0 else ''
+
+    return canonical_rules
+
+
+def strip_styles(tree):
+    """Remove <style> elements (and a <defs> left empty) from a tree"""
+    root = tree.getroot()
+    for parent in list(root.iter()):
+        for child in list(parent):
+            if child.tag == SVG_STYLE:
+                parent.remove(child)
+    for child in list(root):
+        if child.tag == SVG_DEFS and len(child) == 0:
+            root.remove(child)
+
+
+def read_stylesheet_rules(css_path, prefix=DEFAULT_PREFIX):
+    """Read canonical rules back from a shared stylesheet, if it exists"""
+    try:
+        css_text = Path(css_path).read_text(encoding='utf-8')
+    except FileNotFoundError:
+        return {}
+
+    canonical_rules = {}
+    for selectors, declarations in parse_css_rules(css_text):
+        for selector in selectors:
+            if selector.startswith(f'.{prefix}-'):
+                canonical_rules[selector[1:]] = tuple(sorted(declarations))
+    return canonical_rules
+
+
+def write_stylesheet(canonical_rules, css_path):
+    """Write the shared stylesheet atomically"""
+    css_path = Path(css_path)
+    css_path.parent.mkdir(parents=True, exist_ok=True)
+    header = "/* Shared Plutchik wheel styles - generated by build-scripts/share-svg-styles.py */\n"
+    write_atomic(css_path, header + format_rules(canonical_rules) + '\n')
+
+
+def share_svg_styles(svg_paths, css_path, output_dir=None, strip=True,
+                     prefix=DEFAULT_PREFIX, keep_existing=False):
+    """Canonicalize the style classes of several SVGs into one stylesheet
+
+    Each SVG is rewritten in place, or into output_dir if given. With strip
+    the <style> block is removed from the written SVGs, so they rely on the
+    shared stylesheet. keep_existing merges the rules already in css_path,
+    for SVGs that were stripped on an earlier run. Returns a per-file
+    report list.
+    """
+    shared = read_stylesheet_rules(css_path, prefix) if keep_existing else {}
+    report = []
+
+    for svg_path in svg_paths:
+        svg_path = Path(svg_path)
+        tree = load_svg(svg_path)
+        rules_before = len(parse_css_rules(''.join(e.text or '' for e in _style_elements(tree))))
+        canonical_rules = canonicalize_svg_styles(tree, prefix)
+        shared.update(canonical_rules)
+
+        if strip:
+            strip_styles(tree)
+
+        output_path = Path(output_dir) / svg_path.name if output_dir else svg_path
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        write_svg(tree, output_path)
+        report.append({
+            'svg': str(output_path),
+            'rules_before': rules_before,
+            'classes': len(canonical_rules),
+        })
+
+    write_stylesheet(shared, css_path)
+    return report, shared
@@ -0,0 +1,269 @@
+"""
+Replace outlined label glyphs with <text> elements
+
+The Illustrator exports outline every emotion label into one <path> per
+letter (classes central-letter / intermediate-letter). text_labels_tree()
+measures each label from its glyphs and replaces them with a single
+<text> element holding the emotion name from the language's SVG mapping
+(English layer id -> emotion name):
+
+- the orientation comes from the rotate() of the layer's
+  intermediate-word-bounding-box rect when there is one, otherwise from
+  the line through the glyph centres (snapped to horizontal when it is
+  within SNAP_DEGREES, to absorb the uneven letter heights);
+- the baseline is the median bottom of the glyphs and the font size the
+  lower-quartile glyph height (the x-height) over X_HEIGHT, so
+  descenders and accents do not skew either;
+- when the name has as many letters as the label has glyphs, textLength
+  stretches it over the measured width; otherwise (the translation
+  changed since the artwork was drawn) it is centred at its natural width
+  and a warning is reported.
+
+The <text> keeps the glyph classes, so the .central-letter and
+.intermediate-letter fill and hover rules apply unchanged. Labels whose
+glyphs are not laid out along one straight line (curved or multi-line
+text) are left outlined.
+"""
+
+import math
+import re
+import statistics
+import xml.etree.ElementTree as ET
+
+from .svg import BASE_EMOTIONS, INTERMEDIATE_EMOTIONS, SVG_NS, SVG_RECT
+from .svg_minify import format_number, parse_path
+from .svg_split import is_label
+
+SVG_TEXT = f'{SVG_NS}text'
+
+DEFAULT_FONT = 'Helvetica, Arial, sans-serif'
+# x-height of DEFAULT_FONT as a fraction of the font size
+X_HEIGHT = 0.52
+SNAP_DEGREES = 4.0
+# Largest distance of a glyph centre from the label's line, in font sizes
+MAX_LINE_DEVIATION = 0.5
+# Points sampled along each curve segment when measuring glyphs
+CURVE_SAMPLES = 8
+
+_ROTATE_RE = re.compile(r'rotate\(\s*([-+]?(?:\d+\.?\d*|\.\d+))')
+
+
+def glyph_points(d):
+    """Points on the outline of path data, sampling curves"""
+    points = []
+    x = y = 0.0
+    for command, args in parse_path(d):
+        if command == 'Z':
+            continue
+        if command == 'C':
+            x1, y1, x2, y2, x3, y3 = args
+            for i in range(1, CURVE_SAMPLES + 1):
+                t = i / CURVE_SAMPLES
+                u = 1 - t
+                points.append((u ** 3 * x + 3 * u * u * t * x1 + 3 * u * t * t * x2 + t ** 3 * x3,
+                               u ** 3 * y + 3 * u * u * t * y1 + 3 * u * t * t * y2 + t ** 3 * y3))
+        elif command == 'Q':
+            x1, y1, x2, y2 = args
+            for i in range(1, CURVE_SAMPLES + 1):
+                t = i / CURVE_SAMPLES
+                u = 1 - t
+                points.append((u * u * x + 2 * u * t * x1 + t * t * x2,
+                               u * u * y + 2 * u * t * y1 + t * t * y2))
+        else:
+            points.append((args[-2], args[-1]))
+        x, y = args[-2], args[-1]
+    return points
+
+
+def _rotate(points, degrees):
+    """Rotate points by -degrees, into the frame of a label rotated by degrees"""
+    cos = math.cos(math.radians(degrees))
+    sin = math.sin(math.radians(degrees))
+    return [(px * cos + py * sin, -px * sin + py * cos) for px, py in points]
+
+
+def _centre(points):
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    return (min(xs) + max(xs)) / 2, (min(ys) + max(ys)) / 2
+
+
+def fit_angle(centres):
+    """Angle in degrees (-90, 90] of the line through the glyph centres"""
+    if len(centres) < 2:
+        return 0.0
+    mx = sum(x for x, _ in centres) / len(centres)
+    my = sum(y for _, y in centres) / len(centres)
+    sxx = sum((x - mx) ** 2 for x, _ in centres)
+    syy = sum((y - my) ** 2 for _, y in centres)
+    sxy = sum((x - mx) * (y - my) for x, y in centres)
+    angle = math.degrees(0.5 * math.atan2(2 * sxy, sxx - syy))
+    if angle <= -90:
+        angle += 180
+    return 0.0 if abs(angle) < SNAP_DEGREES else angle
+
+
+def rect_angle(rect):
+    """The rotate() angle of a rect's transform, or None"""
+    match = _ROTATE_RE.search(rect.get('transform') or '')
+    return float(match.group(1)) if match else None
+
+
+def label_layout(glyphs, angle=None):
+    """Measure a label from its glyph paths
+
+    Returns a dict with the angle, the left end x and baseline y in the
+    rotated frame, the width, the font size, the glyph count and the
+    largest distance of a glyph centre from the line (in font sizes).
+    angle is fitted through the glyph centres when not given. Returns None
+    when no glyph has a usable outline.
+    """
+    outlines = [glyph_points(glyph.get('d', '')) for glyph in glyphs]
+    outlines = [points for points in outlines if points]
+    if not outlines:
+        return None
+    if angle is None:
+        angle = fit_angle([_centre(points) for points in outlines])
+
+    boxes = []
+    for points in outlines:
+        if angle:
+            points = _rotate(points, angle)
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        boxes.append((min(xs), min(ys), max(xs), max(ys)))
+
+    left = min(box[0] for box in boxes)
+    right = max(box[2] for box in boxes)
+    # Most letters are x-height tall; ascenders, descenders and accents
+    # only make glyphs taller, so the lower quartile is the x-height
+    heights = sorted(box[3] - box[1] for box in boxes)
+    font_size = heights[len(heights) // 4] / X_HEIGHT
+    middles = [(box[1] + box[3]) / 2 for box in boxes]
+    line = statistics.median(middles)
+    return {
+        'angle': angle,
+        'x': left,
+        'y': statistics.median(box[3] for box in boxes),
+        'width': right - left,
+        'font_size': font_size,
+        'glyphs': len(boxes),
+        'deviation': max(abs(m - line) for m in middles) / font_size if font_size else 0.0,
+    }
+
+
+def text_element(name, layout, classes, font_family=DEFAULT_FONT, precision=2):
+    """Build the <text> element drawing name at a measured layout"""
+    def number(value):
+        return format_number(value, precision)
+
+    letters = len(name.replace(' ', ''))
+    attrib = {'class': classes}
+    if letters == layout['glyphs']:
+        attrib.update({
+            'x': number(layout['x']),
+            'y': number(layout['y']),
+            'textLength': number(layout['width']),
+            'lengthAdjust': 'spacingAndGlyphs',
+        })
+    else:
+        attrib.update({
+            'x': number(layout['x'] + layout['width'] / 2),
+            'y': number(layout['y']),
+            'text-anchor': 'middle',
+        })
+    attrib['font-size'] = number(layout['font_size'])
+    attrib['font-family'] = font_family
+    if layout['angle']:
+        attrib['transform'] = f"rotate({number(layout['angle'])})"
+    element = ET.Element(SVG_TEXT, attrib)
+    element.text = name
+    return element
+
+
+def label_glyphs(root, layer_ids):
+    """Map each layer id to its label paths and rects, in document order
+
+    Unlike index_emotion_layers(), an element belongs only to its nearest
+    enclosing layer. Returns ({id: [label paths]}, {id: [rects]}, parents)
+    where parents maps every element to its parent.
+    """
+    wanted = set(layer_ids)
+    labels = {}
+    rects = {}
+    parents = {}
+    stack = [(child, root, None) for child in reversed(root)]
+    while stack:
+        element, parent, layer = stack.pop()
+        parents[element] = parent
+        element_id = element.get('id')
+        if element_id in wanted:
+            layer = element_id
+            labels.setdefault(layer, [])
+            rects.setdefault(layer, [])
+        if layer is not None:
+            if element.tag == SVG_RECT:
+                rects[layer].append(element)
+            elif is_label(element):
+                labels[layer].append(element)
+        stack.extend((child, element, layer) for child in reversed(element))
+    return labels, rects, parents
+
+
+def text_labels_tree(tree, mapping, font_family=DEFAULT_FONT, precision=2):
+    """Replace the outlined labels of a processed tree with <text> in place
+
+    mapping maps English layer ids to the emotion names; layers whose id
+    already is an emotion name of the mapping (translated ids) are named
+    after their id. Returns a stats dict with the labels and glyphs
+    replaced and the warnings (name / glyph count mismatches, labels left
+    outlined).
+    """
+    names = dict(mapping)
+    names.update({name: name for name in mapping.values()})
+    english = BASE_EMOTIONS + INTERMEDIATE_EMOTIONS
+    layer_ids = english + [name for svg_id, name in mapping.items()
+                           if svg_id in english and name not in english]
+
+    labels, rects, parents = label_glyphs(tree.getroot(), layer_ids)
+    stats = {'labels': 0, 'glyphs': 0, 'warnings': []}
+
+    for layer_id, glyphs in labels.items():
+        if not glyphs:
+            continue
+        name = names.get(layer_id)
+        if name is None:
+            stats['warnings'].append(f"{layer_id}: no name in the mapping, label left outlined")
+            continue
+        angles = [a for a in map(rect_angle, rects[layer_id]) if a is not None]
+        layout = label_layout(glyphs, angles[0] if angles else None)
+        if layout is None:
+            stats['warnings'].append(f"{layer_id}: no glyph outline could be read, label left outlined")
+            continue
+        if layout['deviation'] > MAX_LINE_DEVIATION:
+            stats['warnings'].append(f"{layer_id}: glyphs are not on one line, label left outlined")
+            continue
+        letters = len(name.replace(' ', ''))
+        if letters != layout['glyphs']:
+            stats['warnings'].append(f"{layer_id}: {name!r} has {letters} letters but the "
+                                     f"artwork {layout['glyphs']} glyphs, centred instead")
+
+        text = text_element(name, layout, glyphs[0].get('class'), font_family, precision)
+        parent = parents[glyphs[0]]
+        text.tail = glyphs[-1].tail
+        parent.insert(list(parent).index(glyphs[0]), text)
+        for glyph in glyphs:
+            parents[glyph].remove(glyph)
+        stats['labels'] += 1
+        stats['glyphs'] += len(glyphs)
+
+    return stats
+
+
+def print_text_labels_report(stats, label, file_before=None, file_after=None):
+    print(f"🔤 {label}: {stats['glyphs']} glyph paths replaced by {stats['labels']} <text> labels")
+    if file_before is not None and file_after is not None:
+        print(f"   File: {file_before:,} → {file_after:,} bytes "
+              f"({100 * (file_before - file_after) / file_before:.0f}% smaller)")
+    for warning in stats['warnings']:
+        print(f"   ⚠️  {warning}")
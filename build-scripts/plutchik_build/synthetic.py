@@ -0,0 +1,75 @@
+"""
+Synthetic, scaled-up build inputs for benchmarking
+
+Real inputs are small, so benchmarks also run against copies enlarged by a
+factor. Enlarged inputs keep the original content first, so every stage
+still finds the same emotion layers and rows. SVG trees are enlarged in
+memory; CSVs are written to a new file, since their stages read from disk.
+"""
+
+import copy
+import csv
+import xml.etree.ElementTree as ET
+
+
+def enlarge_svg_tree(tree, factor):
+    """Return a copy of tree with its top-level content repeated factor times
+
+    Copies have their id attributes removed so the emotion layers stay
+    unique, but every traversal still has to walk all of the extra
+    elements.
+    """
+    root = copy.deepcopy(tree.getroot())
+    originals = list(root)
+
+    for _ in range(factor - 1):
+        for child in originals:
+            duplicate = copy.deepcopy(child)
+            for element in duplicate.iter():
+                element.attrib.pop('id', None)
+            root.append(duplicate)
+
+    return ET.ElementTree(root)
+
+
+def _write_enlarged_csv(csv_path, output_path, factor, rename):
+    """Repeat the data rows of a CSV factor times, renaming each copy"""
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames
+        rows = list(reader)
+
+    with open(output_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+        for copy_number in range(2, factor + 1):
+            for row in rows:
+                writer.writerow(rename(dict(row), copy_number))
+
+
+def enlarge_emotions_csv(csv_path, output_path, factor):
+    """Write an emotions CSV with every row repeated factor times
+
+    Copy N of an emotion is named "<name> N" and its references point at
+    copy N of their targets, so the enlarged file is still consistent.
+    """
+    reference_columns = ['+intense', '-intense', 'opposite', 'combo-emotion-0', 'combo-emotion-1']
+
+    def rename(row, copy_number):
+        for column in ['emotion'] + reference_columns:
+            if row.get(column):
+                row[column] = f"{row[column]} {copy_number}"
+        return row
+
+    _write_enlarged_csv(csv_path, output_path, factor, rename)
+
+
+def enlarge_ui_csv(csv_path, output_path, factor):
+    """Write a UI CSV with every key repeated factor times as "<key>_N\""""
+
+    def rename(row, copy_number):
+        row['key'] = f"{row['key']}_{copy_number}"
+        return row
+
+    _write_enlarged_csv(csv_path, output_path, factor, rename)
@@ -0,0 +1,55 @@
+"""
+Convert UI text CSV to the JSON format used by the webapp
+"""
+
+import csv
+
+from .jsonio import write_json
+
+
+def ui_entry_from_row(row):
+    """Return (key, {text, url}) for one UI CSV row"""
+
+    key = row['key'].strip()
+    text = row['text'].strip()
+    url = row['url'].strip()
+
+    # Store both text and URL
+    return key, {
+        'text': text,
+        'url': url if url else None
+    }
+
+
+def read_ui_csv(csv_file_path):
+    """Parse a UI text CSV file and return the key -> {text, url} dict"""
+
+    ui_data = {}
+
+    with open(csv_file_path, 'r', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile)
+
+        for row in reader:
+            key, entry = ui_entry_from_row(row)
+            ui_data[key] = entry
+
+    return ui_data
+
+
+def ui_csv_to_json(csv_file_path, json_file_path):
+    """Convert UI CSV to JSON format
+
+    Returns the parsed UI dict so callers can reuse it without reading
+    the JSON file back from disk.
+    """
+
+    ui_data = read_ui_csv(csv_file_path)
+
+    # Write to JSON file
+    write_json(ui_data, json_file_path)
+
+    print(f"✅ Converted {len(ui_data)} UI elements from CSV to JSON")
+    print(f"   Input:  {csv_file_path}")
+    print(f"   Output: {json_file_path}")
+
+    return ui_data
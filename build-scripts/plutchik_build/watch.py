@@ -0,0 +1,190 @@
+"""
+Watch mode: rebuild a language as soon as one of its inputs changes
+
+The watcher polls the modification time and size of every input named by
+the watched language configs (the config file itself, the emotions CSV,
+the UI CSV, the source SVG and, when a stage reads them, the SVG mapping
+and the emotions template). A changed file is mapped to the locales that
+read it and the stages it feeds; only those locales are rebuilt, and the
+build manifest makes sure only the affected stages run.
+
+State is kept warm between rebuilds: the interpreter and its imports, the
+loaded configs, and each locale's last build result. Stages that are not
+affected keep their in-memory output (parsed emotions, UI text, SVG tree)
+instead of reading it back from disk, and the graph and compact stages
+consume the freshly converted emotions directly.
+"""
+
+import contextlib
+import io
+import os
+import stat
+import time
+from pathlib import Path
+
+from .pipeline import PROJECT_ROOT, TEMPLATE_CSV, build_language, load_config, mapping_path
+
+WATCH_INTERVAL = 0.25
+
+# Config key of an input -> stages that read it, in build order
+INPUT_STAGES = {
+    'csv_file': ('emotions', 'graph', 'compact', 'emotion_pages'),
+    'ui_csv_file': ('ui_text', 'emotion_pages'),
+    'svg_input': ('svg', 'hitmap'),
+}
+ALL_STAGES = ('emotions', 'graph', 'compact', 'ui_text', 'emotion_pages', 'svg', 'hitmap')
+
+
+def file_stamp(path):
+    """(mtime in ns, size) of a file, or None if it is not a regular file"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def locale_inputs(config_path, config, project_root=None):
+    """Map every input of one config to the stages it affects"""
+    project_root = Path(project_root or PROJECT_ROOT)
+    inputs = {Path(config_path).resolve(): ALL_STAGES}
+    for key, stages in INPUT_STAGES.items():
+        if config.get(key):
+            inputs[(project_root / config[key]).resolve()] = stages
+    # The emotion pages, the <text> labels and the hit map's layer ids come from the SVG mapping
+    mapping_stages = tuple(stage for stage, key in (('emotion_pages', 'emotion_pages_dir'),
+                                                    ('svg', 'svg_text_labels'),
+                                                    ('hitmap', 'svg_hitmap_file'))
+                           if config.get(key))
+    if mapping_stages:
+        inputs[mapping_path(config_path, config, project_root).resolve()] = mapping_stages
+    # Identified layers are matched against the template's colours
+    if config.get('svg_identify_layers'):
+        inputs[(project_root / TEMPLATE_CSV).resolve()] = ('svg', 'hitmap')
+    return inputs
+
+
+class Watcher:
+    """Polls the inputs of a set of language configs and rebuilds on change"""
+
+    def __init__(self, config_paths, project_root=None, interval=WATCH_INTERVAL, force=False,
+                 cache=None):
+        self.config_paths = [Path(p).resolve() for p in config_paths]
+        self.project_root = project_root
+        self.interval = interval
+        self.force = force
+        self.cache = cache
+        self.results = {}
+        self.inputs = {}
+        self.stamps = {}
+        for config_path in self.config_paths:
+            self.index(config_path)
+
+    def index(self, config_path):
+        """(Re)load a config and record which of its inputs to watch"""
+        for path, owners in list(self.inputs.items()):
+            owners[:] = [(owner, stages) for owner, stages in owners if owner != config_path]
+            if not owners:
+                del self.inputs[path]
+        try:
+            config = load_config(config_path)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Cannot read {config_path}: {e}")
+            config = {}
+        for path, stages in locale_inputs(config_path, config, self.project_root).items():
+            self.inputs.setdefault(path, []).append((config_path, stages))
+            if path not in self.stamps:
+                self.stamps[path] = file_stamp(path)
+
+    def poll(self):
+        """Return the watched files whose stamp changed since the last poll"""
+        changed = []
+        for path in list(self.inputs):
+            stamp = file_stamp(path)
+            if stamp != self.stamps.get(path):
+                self.stamps[path] = stamp
+                changed.append(path)
+        return changed
+
+    def affected(self, changed_paths):
+        """Map changed files to {config path: set of affected stages}"""
+        affected = {}
+        for path in changed_paths:
+            for config_path, stages in self.inputs.get(path, []):
+                affected.setdefault(config_path, set()).update(stages)
+        return affected
+
+    def build(self, config_path, reload_config=False):
+        """Rebuild one locale quietly; returns (ok, elapsed seconds, report, log)
+
+        With reload_config the config is indexed again and nothing is kept
+        from the previous build, since its inputs and outputs may have moved.
+        """
+        if reload_config:
+            self.index(config_path)
+            self.results.pop(config_path, None)
+
+        log = io.StringIO()
+        start = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(log):
+                result = build_language(config_path, self.project_root, force=self.force,
+                                        previous=self.results.get(config_path), cache=self.cache)
+        except Exception as e:
+            result = None
+            log.write(f"❌ {type(e).__name__}: {e}\n")
+        elapsed = time.perf_counter() - start
+
+        if result:
+            self.results[config_path] = result
+            return True, elapsed, result['report'], log.getvalue()
+        return False, elapsed, [], log.getvalue()
+
+    def rebuild(self, affected, changed_paths=()):
+        """Rebuild every affected locale and print one line per locale"""
+        for config_path, stages in affected.items():
+            name = config_path.stem.replace('-config', '')
+            if stages:
+                ordered = [stage for stage in ALL_STAGES if stage in stages]
+                print(f"   → {name}: {', '.join(ordered)}")
+            ok, elapsed, report, log = self.build(config_path, config_path in changed_paths)
+            if not ok:
+                print(log)
+                print(f"❌ {name}: build failed after {elapsed * 1000:.0f} ms")
+                continue
+            rebuilt = [stage for stage, action, _ in report if action == 'rebuilt']
+            restored = [stage for stage, action, _ in report if action == 'restored']
+            line = f"✅ {name}: {', '.join(rebuilt) or 'nothing'} rebuilt"
+            if restored:
+                line += f", {', '.join(restored)} restored from the artifact cache"
+            print(f"{line} in {elapsed * 1000:.0f} ms")
+        if self.cache:
+            self.cache.evict()
+
+    def run(self, cycles=None):
+        """Build every locale once, then poll until interrupted
+
+        cycles limits the number of polls (None polls forever).
+        """
+        print(f"👀 Warming up {len(self.config_paths)} language(s)")
+        self.rebuild({config_path: set() for config_path in self.config_paths})
+        self.force = False
+
+        print(f"\n👀 Watching {len(self.inputs)} input files "
+              f"(every {self.interval * 1000:.0f} ms, Ctrl+C to stop)")
+        count = 0
+        try:
+            while cycles is None or count < cycles:
+                count += 1
+                time.sleep(self.interval)
+                changed = self.poll()
+                if not changed:
+                    continue
+                print()
+                for path in changed:
+                    print(f"📝 Changed: {path}")
+                self.rebuild(self.affected(changed), changed)
+        except KeyboardInterrupt:
+            print(f"\n👋 Stopped watching")
@@ -0,0 +1,367 @@
+"""
+Ingest one wide translation sheet into every locale's JSON in one pass
+
+A translation vendor delivers a single sheet with one column per language
+instead of one emotions CSV and one UI CSV per language:
+
+    section,key,field,es,it,...
+    emotion,joy,emotion,alegría,gioia          <- the emotion's name
+    emotion,joy,intensity,medio,medio
+    emotion,joy,similar-words,Felicidad,Felicità
+    ...
+    ui,page_title,text,Rueda de Emociones de Plutchik,Modello di Plutchik
+    ui,cta_link_text,url,https://esp.6seconds.org/...,https://...
+
+key is the English emotion id (or UI key) and field an emotions CSV column
+(or 'text' / 'url' for UI rows). Every column that is not section, key,
+field, description or notes is a language code. The rows of one key must
+be contiguous.
+
+Everything a translator does not change comes from the English template
+(translations/template.csv and ui-template.csv): the type, colours and
+references of each emotion, and UI URLs. A row overrides any template
+field, colours included. Reference fields (+intense, opposite,
+combo-emotion-0, ...) without a row of their own are translated through
+each language's emotion names. The emotion objects are built by
+the same emotion_from_row() / ui_entry_from_row() as the per-language CSVs.
+
+ingest_wide_sheet() reads the sheet once, row by row, and keeps only the
+key being read plus the emotion names of every language. Each finished
+emotion or UI key is appended to every language's text-*.json and
+ui-text-*.json through a JsonObjectWriter; an emotion that refers to one
+whose name has not been read yet waits until it has. Members therefore
+follow the sheet's row order in every language, not the order of each
+language's own CSV; the pages look emotions up by name, so only the key
+order of the JSON differs. The writers commit together at the end: all
+files are completed first and the previous ones are restored if a rename
+fails, so every language is updated or none is (short of the process
+dying between two renames).
+"""
+
+import csv
+import os
+import shutil
+from pathlib import Path
+
+from .emotions import emotion_from_row
+from .jsonio import JsonObjectWriter, atomic_output
+from .ui_text import ui_entry_from_row
+
+META_COLUMNS = ('section', 'key', 'field', 'description', 'notes')
+NAME_FIELD = 'emotion'
+REFERENCE_FIELDS = ('+intense', '-intense', 'opposite', 'combo-emotion-0', 'combo-emotion-1')
+# Template fields that are not text: a sheet row may still override them
+STRUCTURE_FIELDS = ('type', 'petal-color', 'color')
+UI_FIELDS = ('text', 'url')
+
+
+class WideSheetError(ValueError):
+    """A wide sheet that cannot be ingested"""
+
+
+def read_template(csv_file_path, key='emotion'):
+    """Rows of an English template CSV by their key column, in file order"""
+    with open(csv_file_path, 'r', encoding='utf-8', newline='') as f:
+        return {row[key].strip(): row for row in csv.DictReader(f)}
+
+
+def _raise_file_limit(needed):
+    """Raise the soft open-file limit to cover needed handles, if possible"""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != resource.RLIM_INFINITY and soft < needed:
+        target = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+
+
+class _LocaleWriters:
+    """One emotions and one UI JsonObjectWriter per language"""
+
+    def __init__(self, outputs):
+        self.locales = list(outputs)
+        _raise_file_limit(2 * len(self.locales) + 64)
+        self.emotions = []
+        self.ui = []
+        try:
+            for locale in self.locales:
+                json_file, ui_json_file = outputs[locale]
+                for path in (json_file, ui_json_file):
+                    Path(path).parent.mkdir(parents=True, exist_ok=True)
+                self.emotions.append(JsonObjectWriter(json_file))
+                self.ui.append(JsonObjectWriter(ui_json_file))
+        except BaseException:
+            self.abort()
+            raise
+
+    def commit(self):
+        """Move every language's files into place, or none of them
+
+        Every temporary file is completed before any is renamed, and each
+        file being replaced keeps a hard-linked backup until all renames
+        have succeeded; a failed rename puts the previous files back.
+        """
+        writers = self.emotions + self.ui
+        try:
+            for writer in writers:
+                writer.finish()
+        except BaseException:
+            self.abort()
+            raise
+
+        backups = {}
+        replaced = []
+        try:
+            for writer in writers:
+                if writer.path.exists():
+                    backup = writer.path.with_name(f".{writer.path.name}.{os.getpid()}.bak")
+                    backup.unlink(missing_ok=True)
+                    try:
+                        os.link(writer.path, backup)
+                    except OSError:
+                        shutil.copy2(writer.path, backup)
+                    backups[writer.path] = backup
+            for writer in writers:
+                os.replace(writer.tmp_path, writer.path)
+                replaced.append(writer)
+        except BaseException:
+            for writer in replaced:
+                if writer.path in backups:
+                    os.replace(backups.pop(writer.path), writer.path)
+                else:
+                    writer.path.unlink(missing_ok=True)
+            for writer in writers:
+                if writer not in replaced:
+                    writer.tmp_path.unlink(missing_ok=True)
+            raise
+        finally:
+            for backup in backups.values():
+                backup.unlink(missing_ok=True)
+
+    def abort(self):
+        for writer in self.emotions + self.ui:
+            writer.abort()
+
+
+class WideSheetIngest:
+    """Turns the keys of a wide sheet into every language's JSON members
+
+    locales are the language columns in writer order, templates the
+    (emotion, UI) template rows by key and writers a _LocaleWriters.
+    """
+
+    def __init__(self, locales, templates, writers):
+        self.locales = locales
+        self.emotion_template, self.ui_template = templates
+        self.writers = writers
+        self.names = {}
+        self.pending = []
+        self.done = set()
+        self.stats = {'emotions': 0, 'ui': 0, 'rows': 0,
+                      'untranslated': {locale: 0 for locale in locales}}
+
+    def emotion(self, key, fields):
+        """Queue a finished emotion and write every emotion that can be"""
+        if key not in self.emotion_template:
+            raise WideSheetError(f"emotion {key!r} is not in the template")
+        if NAME_FIELD not in fields:
+            raise WideSheetError(f"emotion {key!r} has no '{NAME_FIELD}' row")
+        for field in fields:
+            if field not in self.emotion_template[key]:
+                raise WideSheetError(f"emotion {key!r}: unknown field {field!r}")
+        self.names[key] = fields[NAME_FIELD]
+        self.pending.append((key, fields))
+        self.flush()
+
+    def _missing_references(self, key, fields):
+        template = self.emotion_template[key]
+        return [template[field].strip() for field in REFERENCE_FIELDS
+                if field not in fields and template.get(field, '').strip()
+                and template[field].strip() not in self.names]
+
+    def flush(self):
+        """Write queued emotions in order, up to the first unresolved one"""
+        while self.pending and not self._missing_references(*self.pending[0]):
+            key, fields = self.pending.pop(0)
+            self._write_emotion(key, fields)
+
+    def _write_emotion(self, key, fields):
+        template = self.emotion_template[key]
+        for i, locale in enumerate(self.locales):
+            row = dict(template)
+            for field in template:
+                if field in fields:
+                    row[field] = fields[field][i]
+                elif field in REFERENCE_FIELDS and template[field].strip():
+                    row[field] = self.names[template[field].strip()][i]
+                elif field not in STRUCTURE_FIELDS and template[field].strip():
+                    self.stats['untranslated'][locale] += 1
+            if not row[NAME_FIELD].strip():
+                raise WideSheetError(f"emotion {key!r} has no name in column {locale!r}")
+            name, emotion_obj = emotion_from_row(row)
+            self.writers.emotions[i].add(name, emotion_obj)
+        self.done.add(key)
+        self.stats['emotions'] += 1
+
+    def ui(self, key, fields):
+        template = self.ui_template.get(key, {'key': key, 'text': '', 'url': ''})
+        for field in fields:
+            if field not in UI_FIELDS:
+                raise WideSheetError(f"UI key {key!r}: unknown field {field!r}")
+        for i, locale in enumerate(self.locales):
+            row = dict(template)
+            for field in UI_FIELDS:
+                if field in fields:
+                    row[field] = fields[field][i]
+                elif field == 'text':
+                    self.stats['untranslated'][locale] += 1
+            ui_key, entry = ui_entry_from_row(row)
+            self.writers.ui[i].add(ui_key, entry)
+        self.stats['ui'] += 1
+
+    def finish(self):
+        if self.pending:
+            waiting = ', '.join(key for key, _ in self.pending)
+            missing = sorted({ref for key, fields in self.pending
+                              for ref in self._missing_references(key, fields)})
+            raise WideSheetError(f"{waiting} refer to emotions the sheet never names: "
+                                 f"{', '.join(missing)}")
+
+
+def sheet_locales(header):
+    """The language columns of a sheet header"""
+    return [column for column in header if column not in META_COLUMNS]
+
+
+def ingest_wide_sheet(sheet_path, outputs, emotion_template_path, ui_template_path):
+    """Write every language's emotions and UI JSON from one wide sheet
+
+    outputs maps each language column to ingest to (json_file,
+    ui_json_file); the sheet may have more columns. Returns a stats dict
+    with the emotions and UI keys written, the rows read and the number
+    of untranslated fields per language. Raises WideSheetError and leaves
+    every output untouched if the sheet is invalid.
+    """
+    templates = (read_template(emotion_template_path), read_template(ui_template_path, 'key'))
+
+    with open(sheet_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = [column.strip() for column in next(reader, [])]
+        for column in ('section', 'key', 'field'):
+            if column not in header:
+                raise WideSheetError(f"{sheet_path}: no '{column}' column")
+        section_col, key_col, field_col = (header.index(c) for c in ('section', 'key', 'field'))
+        missing = [locale for locale in outputs if locale not in header]
+        if missing:
+            raise WideSheetError(f"{sheet_path}: no column for {', '.join(missing)}")
+        locales = list(outputs)
+        columns = [header.index(locale) for locale in locales]
+
+        writers = _LocaleWriters(outputs)
+        ingest = WideSheetIngest(locales, templates, writers)
+        try:
+            current = None
+            fields = {}
+            seen = set()
+            for line, row in enumerate(reader, start=2):
+                if not any(cell.strip() for cell in row):
+                    continue
+                row = row + [''] * (len(header) - len(row))
+                section = row[section_col].strip()
+                key = (section, row[key_col].strip())
+                if key != current:
+                    if current is not None:
+                        _finish_key(ingest, current, fields)
+                    if key in seen:
+                        raise WideSheetError(f"{sheet_path}:{line}: rows of {key[1]!r} "
+                                             f"are not contiguous")
+                    if section not in ('emotion', 'ui'):
+                        raise WideSheetError(f"{sheet_path}:{line}: unknown section {section!r}")
+                    seen.add(key)
+                    current, fields = key, {}
+                field = row[field_col].strip()
+                if field in fields:
+                    raise WideSheetError(f"{sheet_path}:{line}: {key[1]!r} has two {field!r} rows")
+                fields[field] = [row[column] for column in columns]
+                ingest.stats['rows'] += 1
+            if current is not None:
+                _finish_key(ingest, current, fields)
+            ingest.finish()
+        except BaseException:
+            writers.abort()
+            raise
+    writers.commit()
+    return ingest.stats
+
+
+def _finish_key(ingest, key, fields):
+    section, name = key
+    if section == 'emotion':
+        ingest.emotion(name, fields)
+    else:
+        ingest.ui(name, fields)
+
+
+def locale_outputs(locales, configs, output_dir):
+    """Map each language code to (json_file, ui_json_file)
+
+    configs (language_code -> config) supply the file names of languages
+    that have one; the others get text-<code>.json and ui-text-<code>.json.
+    All paths are relative to output_dir.
+    """
+    output_dir = Path(output_dir)
+    outputs = {}
+    for locale in locales:
+        config = configs.get(locale, {})
+        json_file = config.get('json_file', f"text-{locale}.json")
+        ui_json_file = config.get('ui_json_file') or f"ui-text-{locale}.json"
+        outputs[locale] = (output_dir / json_file, output_dir / ui_json_file)
+    return outputs
+
+
+def export_wide_sheet(sheet_path, languages, emotion_template_path, ui_template_path):
+    """Write a wide sheet from languages already converted to JSON
+
+    languages maps each language code to (emotions dict, UI dict, SVG
+    mapping). Every text field gets a row, references included, and
+    colours get one where a language differs from the template, so
+    ingesting the sheet gives back the same JSON up to the order of its
+    members. Emotions follow the English template's order, whichever
+    language comes first. Returns the number of rows written.
+    """
+    emotion_template = read_template(emotion_template_path)
+    ui_template = read_template(ui_template_path, 'key')
+    locales = list(languages)
+    fields = [field for field in next(iter(emotion_template.values())) if field != 'type']
+
+    rows = 0
+    with atomic_output(sheet_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['section', 'key', 'field'] + locales)
+        for key, template in emotion_template.items():
+            values = {}
+            for locale in locales:
+                emotions, _, mapping = languages[locale]
+                name = mapping.get(key, key)
+                emotion = emotions.get(name, {})
+                values[locale] = {NAME_FIELD: name, **emotion}
+            for field in fields:
+                cells = [values[locale].get(field, '') for locale in locales]
+                if not template.get(field, '').strip() and not any(cells):
+                    continue
+                if field in STRUCTURE_FIELDS and all(cell == template[field].strip()
+                                                     for cell in cells):
+                    continue
+                writer.writerow(['emotion', key, field] + cells)
+                rows += 1
+        ui_keys = []
+        for ui_text in [languages[locale][1] for locale in locales] + [ui_template]:
+            ui_keys += [key for key in ui_text if key not in ui_keys]
+        for key in ui_keys:
+            for field in UI_FIELDS:
+                cells = [(languages[locale][1].get(key) or {}).get(field) or '' for locale in locales]
+                writer.writerow(['ui', key, field] + cells)
+                rows += 1
+    return rows
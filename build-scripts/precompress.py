@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Write max-level precompressed siblings (.gz, plus .br / .zst when the
+brotli / zstandard modules are installed) for static artifacts, and record
+raw and compressed sizes in a manifest.
+
+Usage: python precompress.py file [file ...]
+       python precompress.py --all                  # every language's artifacts
+       python precompress.py --config languages/spanish-config.json
+
+The stage itself lives in plutchik_build.compress.
+"""
+
+import argparse
+from pathlib import Path
+
+from plutchik_build.compress import SIZE_MANIFEST, precompress, print_size_report
+from plutchik_build.multi import find_configs
+from plutchik_build.pipeline import PROJECT_ROOT, config_artifacts, load_config
+
+# Files of the English version, which has no language config
+DEFAULT_ARTIFACTS = ['index.html', 'text.json', 'css/styles.css', 'js/scripts.js']
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompress static artifacts")
+    parser.add_argument('files', type=Path, nargs='*', help="files to precompress")
+    parser.add_argument('--config', type=Path, action='append', default=[],
+                        help="precompress the artifacts of this language config")
+    parser.add_argument('--all', action='store_true',
+                        help="precompress the artifacts of every language config "
+                             "and the English version")
+    parser.add_argument('--manifest', type=Path, default=PROJECT_ROOT / SIZE_MANIFEST,
+                        help=f"size manifest to update (default: {SIZE_MANIFEST})")
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help="worker threads (default: number of cores)")
+    args = parser.parse_args()
+
+    configs = list(args.config)
+    files = list(args.files)
+    if args.all:
+        configs += find_configs()
+        files += [PROJECT_ROOT / name for name in DEFAULT_ARTIFACTS]
+    for config_path in configs:
+        files += config_artifacts(load_config(config_path), PROJECT_ROOT)
+
+    if not files:
+        parser.error("give files, --config or --all")
+
+    missing = [f for f in files if not f.exists()]
+    for path in missing:
+        print(f"⚠️  Skipping missing file: {path}")
+
+    results = precompress(files, args.manifest, PROJECT_ROOT, args.jobs)
+    print_size_report(results)
+    print(f"\n✅ Precompressed {len(results)} files, sizes in {args.manifest}")
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Prerender a static detail fragment and a deep-linkable page for every emotion
+
+Usage: python prerender-emotions.py languages/spanish-config.json [...]
+       python prerender-emotions.py --all [--jobs N]
+
+Reads each language's built text-*.json and ui-text-*.json (run
+build-language.py first) and writes into the config's "emotion_pages_dir":
+<emotion>.html, fragments/<emotion>.html and index.json. Languages are
+rendered in parallel and every file is replaced atomically.
+build-language.py runs the same stage when the config sets
+"emotion_pages_dir".
+
+The stage itself lives in plutchik_build.emotion_pages.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from plutchik_build.multi import find_configs, prerender_many
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prerender emotion detail fragments and pages")
+    parser.add_argument('configs', type=Path, nargs='*', metavar='config',
+                        help="language config JSON")
+    parser.add_argument('--all', action='store_true',
+                        help="prerender every languages/*-config.json")
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help="worker processes (default: number of cores)")
+    args = parser.parse_args()
+
+    if not args.configs and not args.all:
+        parser.error("give a config file or --all")
+
+    config_paths = find_configs() if args.all else args.configs
+    for config_path in config_paths:
+        if not config_path.exists():
+            print(f"❌ Error: Config file not found: {config_path}")
+            sys.exit(1)
+
+    summaries, wall_time = prerender_many(config_paths, jobs=args.jobs)
+
+    for summary in summaries:
+        if summary['ok']:
+            print(f"✅ {summary['language']}: {summary['pages']} emotions → "
+                  f"{summary['pages_dir']} ({summary['elapsed'] * 1000:.0f} ms)")
+        else:
+            print(f"❌ {summary['language']}: {summary['error']}")
+    print(f"\n  {sum(s['ok'] for s in summaries)}/{len(summaries)} languages prerendered "
+          f"in {wall_time:.2f} s")
+
+    sys.exit(0 if all(s['ok'] for s in summaries) else 1)
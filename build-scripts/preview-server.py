@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Serve the built webapp locally, or benchmark serving it
+
+The server keeps files in memory, reloads them when they change on disk,
+answers If-None-Match with 304, sends gzip to clients that accept it and
+rewrites the remote S3 data URL in js/scripts.js to the local text.json.
+The serving code lives in plutchik_build.server.
+
+Usage: python preview-server.py [--port 8000] [--host 127.0.0.1]
+       python preview-server.py --benchmark [--requests N] [--concurrency N]
+       python preview-server.py --benchmark --revalidate index-es.html
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from plutchik_build.pipeline import PROJECT_ROOT
+from plutchik_build.server import DEFAULT_HOST, DEFAULT_PORT, benchmark, page_assets, serve
+
+
+def print_benchmark(result, args):
+    mode = 'revalidating (304)' if args.revalidate else 'full responses'
+    encoding = 'identity' if args.no_gzip else 'gzip'
+    print(f"\n⏱  Preview server benchmark: {mode}, {encoding}, "
+          f"{args.concurrency} keep-alive clients")
+    print(f"  {'path':<28} {'bytes':>9} {'median':>9} {'p90':>9} {'p99':>9}")
+    for path, stats in result['paths'].items():
+        print(f"  {path:<28} {stats['bytes']:>9,} {stats['median_ms']:>7.3f}ms "
+              f"{stats['p90_ms']:>7.3f}ms {stats['p99_ms']:>7.3f}ms")
+    print(f"\n  {result['requests']:,} requests in {result['elapsed']:.2f} s "
+          f"({result['requests_per_second']:,.0f} requests/s)")
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('pages', nargs='*',
+                        help="pages to benchmark, with every file they load "
+                             "(default: index*.html)")
+    parser.add_argument('--root', type=Path, default=PROJECT_ROOT,
+                        help="directory to serve (default: the project root)")
+    parser.add_argument('--host', default=DEFAULT_HOST,
+                        help=f"address to listen on (default: {DEFAULT_HOST})")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                        help=f"port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument('--no-rewrite', action='store_true',
+                        help="serve the remote S3 URLs unchanged")
+    parser.add_argument('--quiet', '-q', action='store_true',
+                        help="do not log every request")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="measure latency and throughput on a temporary port and exit")
+    parser.add_argument('--requests', type=int, default=2000,
+                        help="requests per path in --benchmark mode (default: 2000)")
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help="concurrent clients in --benchmark mode (default: 8)")
+    parser.add_argument('--no-gzip', action='store_true',
+                        help="benchmark uncompressed responses")
+    parser.add_argument('--revalidate', action='store_true',
+                        help="benchmark conditional requests answered with 304")
+    args = parser.parse_args(argv)
+
+    if not args.root.is_dir():
+        print(f"❌ Error: not a directory: {args.root}")
+        return 1
+
+    if not args.benchmark:
+        serve(args.root, args.host, args.port, not args.no_rewrite, args.quiet)
+        return 0
+
+    pages = args.pages or sorted(p.name for p in args.root.glob('index*.html'))
+    paths = page_assets(pages, args.root)
+    if not paths:
+        print(f"❌ Error: none of these pages exist in {args.root}: {', '.join(pages)}")
+        return 1
+
+    result = benchmark(paths, args.root, args.requests, args.concurrency,
+                       accept_gzip=not args.no_gzip, revalidate=args.revalidate,
+                       rewrite_remote=not args.no_rewrite)
+    print_benchmark(result, args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
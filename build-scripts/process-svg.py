@@ -5,165 +5,163 @@ This script works with any language - the layer names in the SVG should always b
 only the visible text should be in the target language.
 
 Usage: python process-svg.py input.svg output.svg
+       python process-svg.py --stream input.svg output.svg
+       python process-svg.py input.svg output.svg --geometry plutchik-geometry.svg --labels labels.svg
+       python process-svg.py --split-only processed.svg --geometry plutchik-geometry.svg \\
+           --labels labels.svg [--mapping languages/italian-svg-mapping.json]
+       python process-svg.py input.svg output.svg --text-labels \\
+           --mapping languages/spanish-svg-mapping.json
+       python process-svg.py --identify input.svg output.svg
+       python process-svg.py input.svg output.svg --hitmap hitmap-es.json
+
+--stream processes the file incrementally with bounded memory, for large
+print and poster artwork. The output is identical to the default mode.
+
+--geometry and --labels split the processed SVG into the wheel geometry
+shared by every language and this language's label layer. The first
+language writes the geometry; every later one is checked against it.
+
+--text-labels replaces the outlined label glyphs with <text> elements
+named from the SVG mapping, so a translation fix no longer needs new
+artwork.
+
+--identify works out which layer is which emotion from its position on
+the wheel and its colour (needs NumPy), for exports whose layers are
+unnamed or not named with the English ids, and renames them first.
+
+--hitmap writes the polygons pointer events are resolved against (needs
+NumPy), so the page hit-tests one small map instead of every petal path
+and label glyph; --mapping names translated layers in it.
+
+The processing itself lives in plutchik_build.svg, plutchik_build.svg_stream,
+plutchik_build.svg_split, plutchik_build.svg_text, plutchik_build.svg_identify and
+plutchik_build.svg_hitmap.
 """
 
+import argparse
 import sys
-import xml.etree.ElementTree as ET
 from pathlib import Path
 
-# Register SVG namespace
-ET.register_namespace('', 'http://www.w3.org/2000/svg')
-
-# Standardized English layer names for base emotions (24)
-BASE_EMOTIONS = [
-    'serenity', 'joy', 'ecstasy',
-    'acceptance', 'trust', 'admiration',
-    'apprehension', 'fear', 'terror',
-    'distraction', 'surprise', 'amazement',
-    'pensiveness', 'sadness', 'grief',
-    'boredom', 'disgust', 'loathing',
-    'annoyance', 'anger', 'rage',
-    'interest', 'anticipation', 'vigilance'
-]
-
-# Standardized English layer names for intermediate/combination emotions (8)
-INTERMEDIATE_EMOTIONS = [
-    'aggressiveness', 'optimism', 'contempt',
-    'awe', 'love', 'remorse',
-    'disapproval', 'submission'
-]
-
-# Emotions that have double background shapes (need special handling)
-DOUBLE_BACKGROUND_EMOTIONS = ['annoyance', 'apprehension']
-
-
-def process_svg(input_path, output_path):
-    """Process SVG and add interactive classes"""
-
-    # Parse the SVG file
-    tree = ET.parse(input_path)
-    root = tree.getroot()
-
-    all_emotions = BASE_EMOTIONS + INTERMEDIATE_EMOTIONS
-    processed_count = 0
-
-    # Process each emotion
-    for emotion in all_emotions:
-        # Find the group with this ID
-        groups = root.findall(f".//*[@id='{emotion}']")
-
-        if not groups:
-            print(f"⚠️  Could not find layer: {emotion}")
-            continue
-
-        group = groups[0]
-        print(f"✓ Found: {emotion}")
-
-        # Determine if this is an intermediate emotion
-        is_intermediate = emotion in INTERMEDIATE_EMOTIONS
-
-        # Add classes to the group element
-        current_class = group.get('class', '')
-        new_classes = f"{current_class} emotion-container {emotion}".strip()
-        group.set('class', new_classes)
-
-        # For intermediate emotions, check if there's a rect (clickable target area)
-        rects = group.findall('.//{http://www.w3.org/2000/svg}rect')
-        if rects and is_intermediate:
-            target_rect = rects[0]
-            # Add white background class for clickability
-            target_rect.set('class', 'intermediate-word-bounding-box')
-            print(f"  → Added bounding box class to rect")
-
-        # Find the first path (the petal shape) and add classes
-        paths = group.findall('.//{http://www.w3.org/2000/svg}path')
-        if paths:
-            petal_path = paths[0]
-            current_path_class = petal_path.get('class', '')
-
-            if is_intermediate:
-                # For intermediate emotions, first path is part of the text/graphic
-                new_path_class = f"{current_path_class} intermediate-letter {emotion}".strip()
-            else:
-                # For base emotions, add petal-shape, filled-shape, and emotion-color classes
-                new_path_class = f"{current_path_class} petal-shape filled-shape {emotion}-color {emotion}".strip()
-
-            petal_path.set('class', new_path_class)
-            print(f"  → Added classes to {'graphic path' if is_intermediate else 'petal shape'}")
-
-        # Add a class to text paths
-        text_paths = paths[1:] if len(paths) > 1 else []
-
-        for text_path in text_paths:
-            current_text_class = text_path.get('class', '')
-
-            if is_intermediate:
-                # Intermediate emotions get "intermediate-letter {emotion}" classes
-                if 'intermediate-letter' not in current_text_class:
-                    new_text_class = f"{current_text_class} intermediate-letter {emotion}".strip()
-                    text_path.set('class', new_text_class)
-            else:
-                # Base emotions get "central-letter" class
-                if 'central-letter' not in current_text_class:
-                    new_text_class = f"{current_text_class} central-letter".strip()
-                    text_path.set('class', new_text_class)
-
-        if text_paths:
-            letter_type = "intermediate" if is_intermediate else "text"
-            print(f"  → Added classes to {len(text_paths)} {letter_type} paths")
-
-        processed_count += 1
-
-    print(f"\n✅ Processed {processed_count} emotions")
-
-    # Special fix for emotions with double background shapes
-    print(f"\n🔧 Applying double-background fix for {', '.join(DOUBLE_BACKGROUND_EMOTIONS)}...")
-    for emotion in DOUBLE_BACKGROUND_EMOTIONS:
-        groups = root.findall(f".//*[@id='{emotion}']")
-        if not groups:
-            print(f"⚠️  Could not find: {emotion}")
-            continue
-
-        group = groups[0]
-        print(f"✓ Fixing: {emotion}")
-
-        # Find the nested group that contains the two background shapes
-        nested_groups = group.findall('./{http://www.w3.org/2000/svg}g')
-        if nested_groups:
-            bg_group = nested_groups[0]  # First nested group has the backgrounds
-
-            # Get all paths in this group
-            paths = bg_group.findall('./{http://www.w3.org/2000/svg}path')
-
-            if len(paths) >= 2:
-                # Second path needs to be changed from central-letter to filled-shape
-                second_path = paths[1]
-
-                current_class = second_path.get('class', '')
-                if 'central-letter' in current_class:
-                    # Replace central-letter with petal-shape filled-shape
-                    new_class = current_class.replace('central-letter', f'petal-shape filled-shape {emotion}-color {emotion}')
-                    second_path.set('class', new_class)
-                    print(f"  → Fixed second background path")
-
-    # Write the modified SVG
-    tree.write(output_path, encoding='utf-8', xml_declaration=True)
-    print(f"\n✅ Saved to: {output_path}")
+from plutchik_build import process_svg, process_svg_stream
+from plutchik_build.emotions import read_emotions_csv
+from plutchik_build.pipeline import PROJECT_ROOT, TEMPLATE_CSV
+from plutchik_build.svg import load_svg, process_svg_tree, write_svg
+from plutchik_build.svg_hitmap import DEFAULT_TOLERANCE as DEFAULT_HITMAP_TOLERANCE
+from plutchik_build.svg_hitmap import print_hitmap_report, write_hitmap
+from plutchik_build.svg_identify import identify_layers_tree, print_identify_report
+from plutchik_build.svg_split import (
+    DEFAULT_TOLERANCE,
+    GeometryMismatchError,
+    load_svg_mapping,
+    split_svg,
+)
+from plutchik_build.svg_text import DEFAULT_FONT, print_text_labels_report, text_labels_tree
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: python process-svg.py input.svg output.svg")
-        sys.exit(1)
-
-    input_path = Path(sys.argv[1])
-    output_path = Path(sys.argv[2])
+    parser = argparse.ArgumentParser(description="Add interactive classes to a Plutchik SVG")
+    parser.add_argument('files', type=Path, nargs='+',
+                        help="input.svg output.svg, or the processed SVG with --split-only")
+    parser.add_argument('--stream', action='store_true',
+                        help="process with bounded memory (same output)")
+    parser.add_argument('--geometry', type=Path,
+                        help="shared geometry sheet to write, or to check this language against")
+    parser.add_argument('--labels', type=Path,
+                        help="label layer of this language to write")
+    parser.add_argument('--mapping', type=Path,
+                        help="SVG mapping used to rename translated layer ids to English "
+                             "and to name --text-labels")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="largest coordinate difference allowed between languages' "
+                             f"geometry (default: {DEFAULT_TOLERANCE})")
+    parser.add_argument('--split-only', action='store_true',
+                        help="the input is already processed: only split it")
+    parser.add_argument('--text-labels', action='store_true',
+                        help="replace the outlined label glyphs with <text> (needs --mapping)")
+    parser.add_argument('--font', default=DEFAULT_FONT,
+                        help=f"font-family of the --text-labels (default: {DEFAULT_FONT})")
+    parser.add_argument('--identify', action='store_true',
+                        help="identify the emotion layers by geometry and colour first (needs NumPy)")
+    parser.add_argument('--template', type=Path, default=PROJECT_ROOT / TEMPLATE_CSV,
+                        help=f"emotions template with the reference colours (default: {TEMPLATE_CSV})")
+    parser.add_argument('--hitmap', type=Path,
+                        help="hit map of the processed SVG to write (needs NumPy)")
+    parser.add_argument('--hitmap-tolerance', type=float, default=DEFAULT_HITMAP_TOLERANCE,
+                        help="largest distance from a hit region's edge to the real outline "
+                             f"(default: {DEFAULT_HITMAP_TOLERANCE})")
+    args = parser.parse_args()
+
+    if args.split_only and len(args.files) != 1:
+        parser.error("--split-only takes one processed SVG")
+    if not args.split_only and len(args.files) != 2:
+        parser.error("give input.svg output.svg")
+    if (args.geometry is None) != (args.labels is None) or (args.split_only and args.geometry is None):
+        parser.error("--geometry and --labels go together")
+    if args.text_labels and (args.split_only or args.mapping is None):
+        parser.error("--text-labels needs --mapping and input.svg output.svg")
+    if args.identify and (args.split_only or args.stream):
+        parser.error("--identify needs the whole tree: not with --stream or --split-only")
+
+    input_path = args.files[0]
+    output_path = args.files[-1]
 
     if not input_path.exists():
         print(f"❌ Error: Input SVG file not found: {input_path}")
         sys.exit(1)
 
-    # Create output directory if needed
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    process_svg(input_path, output_path)
+    tree = None
+    if not args.split_only:
+        # Create output directory if needed
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        if args.identify:
+            tree = load_svg(input_path)
+            try:
+                identification = identify_layers_tree(tree, read_emotions_csv(args.template))
+            except (ImportError, OSError) as e:
+                print(f"❌ Error: {e}")
+                sys.exit(1)
+            print_identify_report(identification, input_path.name)
+            print()
+            process_svg_tree(tree)
+            write_svg(tree, output_path)
+            print(f"\n✅ Saved to: {output_path}")
+        elif args.stream:
+            process_svg_stream(input_path, output_path)
+        else:
+            tree = process_svg(input_path, output_path)
+
+        if args.text_labels:
+            if tree is None:
+                tree = load_svg(output_path)
+            file_before = output_path.stat().st_size
+            stats = text_labels_tree(tree, load_svg_mapping(args.mapping), args.font)
+            write_svg(tree, output_path)
+            print()
+            print_text_labels_report(stats, output_path.name, file_before,
+                                     output_path.stat().st_size)
+
+    if args.geometry:
+        for path in (args.geometry, args.labels):
+            path.parent.mkdir(parents=True, exist_ok=True)
+        mapping = load_svg_mapping(args.mapping) if args.mapping else None
+        print()
+        try:
+            split_svg(output_path, args.labels, args.geometry, mapping, args.tolerance, tree)
+        except GeometryMismatchError as e:
+            print(f"❌ Error: geometry of {output_path} does not match {args.geometry}:")
+            for problem in e.problems:
+                print(f"   {problem}")
+            sys.exit(1)
+
+    if args.hitmap:
+        if tree is None:
+            tree = load_svg(output_path)
+        mapping = load_svg_mapping(args.mapping) if args.mapping else None
+        print()
+        try:
+            _, stats = write_hitmap(tree, args.hitmap, args.hitmap_tolerance, mapping=mapping)
+        except ImportError as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+        print_hitmap_report(stats, args.hitmap.name)
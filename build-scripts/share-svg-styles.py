@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Replace the per-export Illustrator .cls-N styles of processed SVGs with
+language-independent classes and one shared stylesheet
+
+Classes are renamed after a hash of the declarations they apply, so the same
+styling gets the same name in every language. The rewritten SVGs have their
+<style> block removed and need the shared stylesheet linked from the page.
+
+Usage: python share-svg-styles.py --css css/plutchik-wheel.css a.svg b.svg [--output-dir DIR]
+
+The stage itself lives in plutchik_build.svg_styles.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from plutchik_build.svg_styles import UnsupportedStyles, share_svg_styles
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Share SVG style rules across languages")
+    parser.add_argument('svgs', type=Path, nargs='+', help="processed SVG files")
+    parser.add_argument('--css', type=Path, required=True,
+                        help="shared stylesheet to write")
+    parser.add_argument('--output-dir', type=Path,
+                        help="write the rewritten SVGs here instead of in place")
+    parser.add_argument('--keep-style', action='store_true',
+                        help="keep the (canonical) <style> block in each SVG")
+    parser.add_argument('--keep-existing', action='store_true',
+                        help="merge with rules already in the stylesheet")
+    args = parser.parse_args()
+
+    for svg_path in args.svgs:
+        if not svg_path.exists():
+            print(f"❌ Error: SVG file not found: {svg_path}")
+            sys.exit(1)
+
+    try:
+        report, shared = share_svg_styles(args.svgs, args.css, args.output_dir,
+                                          strip=not args.keep_style,
+                                          keep_existing=args.keep_existing)
+    except UnsupportedStyles as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    for entry in report:
+        print(f"✓ {entry['svg']}: {entry['rules_before']} rules → {entry['classes']} classes")
+    print(f"\n✅ Wrote {len(shared)} shared classes to {args.css}")
@@ -0,0 +1,47 @@
+"""
+Shared fixtures for the build tests
+
+Tests never write into the checkout: builds go to pytest's tmp_path, and
+tests that change an input first copy a language's inputs into a
+throwaway project root.
+"""
+
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+BUILD_SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BUILD_SCRIPTS_DIR))
+
+from plutchik_build.pipeline import PROJECT_ROOT, load_config, mapping_path  # noqa: E402
+
+SPANISH_CONFIG = PROJECT_ROOT / 'languages' / 'spanish-config.json'
+ITALIAN_CONFIG = PROJECT_ROOT / 'languages' / 'italian-config.json'
+
+# Config entries naming a file the build reads
+INPUT_KEYS = ('csv_file', 'ui_csv_file', 'svg_input')
+
+
+def load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def spanish_project(tmp_path):
+    """A project root holding a copy of the Spanish inputs
+
+    Returns the path of the copied config.
+    """
+    root = tmp_path / 'project'
+    config = load_config(SPANISH_CONFIG)
+    sources = [SPANISH_CONFIG, mapping_path(SPANISH_CONFIG, config)]
+    sources += [PROJECT_ROOT / config[key] for key in INPUT_KEYS if config.get(key)]
+    for source in sources:
+        target = root / source.relative_to(PROJECT_ROOT)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(source, target)
+    return root / SPANISH_CONFIG.relative_to(PROJECT_ROOT)
@@ -0,0 +1,84 @@
+"""The compact columnar emotions payload and its decoders"""
+
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from conftest import load_json
+from plutchik_build.compact import (
+    COMPACT_VERSION,
+    decode_compact,
+    decode_compact_links,
+    dumps_compact,
+    encode_compact,
+    write_compact,
+)
+from plutchik_build.graph import GraphError, emotion_links
+from plutchik_build.pipeline import PROJECT_ROOT
+
+SOURCES = ['text.json', 'text-es.json', 'text-it.json']
+DECODER = PROJECT_ROOT / 'js' / 'emotions-compact.js'
+
+
+@pytest.fixture(params=SOURCES)
+def emotions_data(request):
+    return load_json(PROJECT_ROOT / request.param)
+
+
+def test_round_trip(emotions_data):
+    payload = json.loads(dumps_compact(encode_compact(emotions_data)))
+    assert decode_compact(payload) == emotions_data
+    assert list(decode_compact(payload)) == list(emotions_data)
+
+
+def test_links_match_the_resolved_graph(emotions_data):
+    payload = encode_compact(emotions_data)
+    assert decode_compact_links(payload) == emotion_links(emotions_data)
+
+
+def test_list_that_would_not_rejoin_is_kept_as_text():
+    emotions_data = {'a': {'color': '#112233', 'purpose': 'uno;dos'},
+                     'b': {'color': '#112233', 'purpose': 'uno; dos', 'opposite': 'a'}}
+    payload = encode_compact(emotions_data)
+    purpose = payload['columns'][[f for f, _ in payload['fields']].index('purpose')]
+    assert purpose == ['uno;dos', ['uno', 'dos']]
+    assert decode_compact(payload) == emotions_data
+    assert payload['palette'] == ['112233']
+
+
+def test_unknown_reference_fails_to_encode():
+    with pytest.raises(GraphError):
+        encode_compact({'a': {'color': '#112233', 'opposite': 'missing'}})
+
+
+def test_other_versions_are_rejected(emotions_data):
+    payload = encode_compact(emotions_data)
+    payload['version'] = COMPACT_VERSION - 1
+    with pytest.raises(ValueError):
+        decode_compact(payload)
+
+
+@pytest.mark.parametrize('language', ['es', 'it'])
+def test_committed_payload_is_current(language, tmp_path):
+    emotions_data = load_json(PROJECT_ROOT / f"text-{language}.json")
+    written = tmp_path / 'compact.json'
+    write_compact(emotions_data, written)
+    assert written.read_bytes() == (PROJECT_ROOT / f"text-{language}-compact.json").read_bytes()
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="node is not installed")
+def test_javascript_decoder_matches(emotions_data):
+    script = f"""
+const decoder = require({json.dumps(str(DECODER))});
+const payload = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+console.log(JSON.stringify([decoder.decode_compact_emotions(payload),
+                            decoder.decode_compact_links(payload)]));
+"""
+    payload = dumps_compact(encode_compact(emotions_data))
+    output = subprocess.run(['node', '-e', script], input=payload, capture_output=True,
+                            text=True, check=True).stdout
+    decoded, links = json.loads(output)
+    assert decoded == emotions_data
+    assert links == emotion_links(emotions_data)
@@ -0,0 +1,129 @@
+"""The wheel's hit map resolves points to the emotion the browser would hit"""
+
+import contextlib
+import io
+import json
+import shutil
+import subprocess
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from conftest import SPANISH_CONFIG, load_json  # noqa: E402
+from plutchik_build.pipeline import PROJECT_ROOT, build_language  # noqa: E402
+from plutchik_build.svg import load_svg  # noqa: E402
+from plutchik_build.svg_hitmap import contains, emotion_at, hit_shapes  # noqa: E402
+from plutchik_build.svg_identify import sample_segments, shape_segments, transformed_segments  # noqa: E402
+from plutchik_build.svg_split import is_label  # noqa: E402
+
+HITMAP_FILE = PROJECT_ROOT / 'hitmap-es.json'
+LOOKUP_SCRIPT = PROJECT_ROOT / 'js' / 'emotion-hitmap.js'
+# Grid spacing of the sampled points, in viewBox units
+STEP = 6.0
+
+
+def square(x, y, size):
+    return [x, y, x + size, y, x + size, y + size, x, y + size]
+
+
+SYNTHETIC = {
+    'viewBox': [0, 0, 100, 100],
+    'tolerance': 0.5,
+    'regions': [
+        # Topmost first: the small square covers part of the ring below it
+        {'emotion': 'joy', 'bbox': [40, 40, 60, 60], 'rings': [square(40, 40, 20)]},
+        # A square with a square hole (even-odd rule)
+        {'emotion': 'trust', 'bbox': [10, 10, 90, 90],
+         'rings': [square(10, 10, 80), square(30, 30, 40)]},
+    ],
+}
+
+
+@pytest.mark.parametrize('point, emotion', [
+    ((50, 50), 'joy'),         # on top of the hole
+    ((35, 35), None),          # in the hole
+    ((20, 20), 'trust'),
+    ((80, 50), 'trust'),
+    ((5, 5), None),            # outside every bounding box
+    ((95, 50), None),
+])
+def test_emotion_at_synthetic(point, emotion):
+    assert emotion_at(SYNTHETIC, *point) == emotion
+
+
+@pytest.fixture(scope='module')
+def built(tmp_path_factory):
+    """Paths of a fresh Spanish build"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = build_language(SPANISH_CONFIG, PROJECT_ROOT, tmp_path_factory.mktemp('es'))
+    return result['paths']
+
+
+@pytest.fixture(scope='module')
+def wheel(built):
+    """The processed Spanish wheel and its hit map"""
+    return load_svg(built['svg_processed']), load_json(built['svg_hitmap_file'])
+
+
+@pytest.fixture(scope='module')
+def grid(wheel):
+    x, y, width, height = wheel[1]['viewBox']
+    xs, ys = np.meshgrid(np.arange(x + STEP / 2, x + width, STEP),
+                         np.arange(y + STEP / 2, y + height, STEP))
+    return np.column_stack([xs.ravel(), ys.ravel()])
+
+
+def test_committed_hitmap_is_current(built):
+    assert built['svg_hitmap_file'].read_bytes() == HITMAP_FILE.read_bytes()
+
+
+def topmost_body(shapes, points):
+    """Emotion of the last painted petal or box under each point, or None"""
+    found = np.full(len(points), None, dtype=object)
+    for emotion, outlines in shapes:
+        found[contains(outlines, points)] = emotion
+    return found
+
+
+def test_hitmap_matches_the_wheel(wheel, grid):
+    tree, hitmap = wheel
+    shapes = []
+    for emotion, element, matrix in hit_shapes(tree.getroot()):
+        if not is_label(element):
+            outlines = [sample_segments(segments, 16)
+                        for segments in transformed_segments(shape_segments(element), matrix)]
+            shapes.append((emotion, outlines))
+
+    # Leave out points near an edge, where the tolerance may decide: the
+    # points a little further than it in every direction must agree
+    reach = 2 * hitmap['tolerance']
+    expected = topmost_body(shapes, grid)
+    for dx, dy in ((reach, 0), (-reach, 0), (0, reach), (0, -reach)):
+        near_edge = topmost_body(shapes, grid + [dx, dy]) != expected
+        expected[near_edge] = 'edge'
+
+    checked = 0
+    for point, emotion in zip(grid, expected):
+        if emotion is None or emotion == 'edge':
+            continue
+        checked += 1
+        assert emotion_at(hitmap, *point) == emotion, f"{emotion} at {tuple(point)}"
+    assert checked > 1000
+    # Every emotion has a region somewhere
+    assert {emotion for emotion in expected if emotion not in (None, 'edge')} == \
+        {region['emotion'] for region in hitmap['regions']}
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="node is not installed")
+def test_javascript_lookup_matches(wheel, grid):
+    hitmap = wheel[1]
+    script = f"""
+const {{emotion_at}} = require({json.dumps(str(LOOKUP_SCRIPT))});
+const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+console.log(JSON.stringify(input.points.map(p => emotion_at(input.hitmap, p[0], p[1]))));
+"""
+    stdin = json.dumps({'hitmap': hitmap, 'points': grid.tolist()})
+    output = subprocess.run(['node', '-e', script], input=stdin, capture_output=True,
+                            text=True, check=True).stdout
+    assert json.loads(output) == [emotion_at(hitmap, *point) for point in grid]
@@ -0,0 +1,235 @@
+"""Incremental builds: stage versions, the build manifest and the artifact cache"""
+
+import contextlib
+import io
+import os
+
+import pytest
+
+from plutchik_build import manifest as manifest_module
+from plutchik_build.artifacts import ArtifactStore
+from plutchik_build.manifest import STAGE_SOURCES, BuildManifest, stage_sources, stage_version
+from plutchik_build.pipeline import build_language
+
+CONFIG_KEYS = ['csv_file', 'json_file']
+
+
+def build(config_path, output_root, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = build_language(config_path, config_path.parent.parent, output_root, **kwargs)
+    assert result is not None
+    return result
+
+
+def actions(result):
+    return {stage: action for stage, action, _ in result['report']}
+
+
+def reasons(result):
+    return {stage: reason for stage, _, reason in result['report']}
+
+
+# Stage versions
+
+@pytest.mark.parametrize('stage', sorted(STAGE_SOURCES))
+def test_every_stage_version_covers_the_stage_runners(stage):
+    assert 'pipeline.py' in stage_sources(stage)
+
+
+def test_stage_sources_follow_package_imports():
+    # The hit map reaches the path parser only through svg_identify.py
+    assert 'svg_minify.py' in stage_sources('hitmap')
+    assert 'svg.py' not in stage_sources('emotions')
+
+
+def test_stage_version_changes_with_a_runner(tmp_path, monkeypatch):
+    package = tmp_path / 'plutchik_build'
+    package.mkdir()
+    for name in stage_sources('emotions'):
+        (package / name).write_bytes((manifest_module._PACKAGE_DIR / name).read_bytes())
+    monkeypatch.setattr(manifest_module, '_PACKAGE_DIR', package)
+    monkeypatch.setattr(manifest_module, '_stage_versions', {})
+    before = stage_version('emotions')
+
+    with open(package / 'pipeline.py', 'a', encoding='utf-8') as f:
+        f.write('\n# changed\n')
+    monkeypatch.setattr(manifest_module, '_stage_versions', {})
+    assert stage_version('emotions') != before
+
+
+# BuildManifest
+
+@pytest.fixture
+def stage_files(tmp_path):
+    source = tmp_path / 'in.csv'
+    output = tmp_path / 'out.json'
+    source.write_text('a,b\n1,2\n', encoding='utf-8')
+    output.write_text('{}', encoding='utf-8')
+    return source, output
+
+
+def recorded_manifest(path, source, output, config):
+    manifest = BuildManifest(path)
+    fingerprint = manifest.fingerprint('emotions', [source], output, config, CONFIG_KEYS)
+    manifest.record('emotions', fingerprint, manifest.rebuild_reason('emotions', fingerprint))
+    manifest.save()
+    return BuildManifest(path)
+
+
+def test_manifest_skips_an_unchanged_stage(tmp_path, stage_files):
+    source, output = stage_files
+    config = {'csv_file': 'in.csv', 'json_file': 'out.json'}
+    manifest = recorded_manifest(tmp_path / 'm.json', source, output, config)
+    fingerprint = manifest.fingerprint('emotions', [source], output, config, CONFIG_KEYS)
+    assert manifest.rebuild_reason('emotions', fingerprint) is None
+    assert BuildManifest(tmp_path / 'm.json', force=True).rebuild_reason('emotions', fingerprint) \
+        == 'forced (--force)'
+
+
+@pytest.mark.parametrize('change, reason', [
+    ('input', 'input changed'),
+    ('config', 'config changed'),
+    ('unread config', None),
+    ('output', 'output modified since last build'),
+    ('output deleted', 'output missing'),
+    ('version', 'stage code changed'),
+])
+def test_manifest_rebuild_reasons(tmp_path, stage_files, monkeypatch, change, reason):
+    source, output = stage_files
+    config = {'csv_file': 'in.csv', 'json_file': 'out.json', 'svg_input': 'a.svg'}
+    manifest = recorded_manifest(tmp_path / 'm.json', source, output, config)
+
+    if change == 'input':
+        source.write_text('a,b\n1,3\n', encoding='utf-8')
+    elif change == 'config':
+        config = dict(config, json_file='other.json')
+    elif change == 'unread config':
+        config = dict(config, svg_input='b.svg')
+    elif change == 'output':
+        output.write_text('{"edited": true}', encoding='utf-8')
+    elif change == 'output deleted':
+        output.unlink()
+    else:
+        monkeypatch.setattr(manifest_module, '_stage_versions', {'emotions': 'another version'})
+
+    fingerprint = manifest.fingerprint('emotions', [source], output, config, CONFIG_KEYS)
+    found = manifest.rebuild_reason('emotions', fingerprint)
+    if reason is None:
+        assert found is None
+    else:
+        assert found is not None and found.startswith(reason)
+
+
+def test_corrupt_manifest_rebuilds_everything(tmp_path, stage_files):
+    source, output = stage_files
+    path = tmp_path / 'm.json'
+    path.write_text('{not json', encoding='utf-8')
+    manifest = BuildManifest(path)
+    fingerprint = manifest.fingerprint('emotions', [source], output, {}, CONFIG_KEYS)
+    assert manifest.rebuild_reason('emotions', fingerprint) == 'no previous build recorded'
+
+
+# Whole builds
+
+def test_second_build_skips_every_stage(spanish_project, tmp_path):
+    output_root = tmp_path / 'out'
+    first = build(spanish_project, output_root)
+    assert set(actions(first).values()) == {'rebuilt'}
+
+    second = build(spanish_project, output_root)
+    assert set(actions(second).values()) == {'skipped'}
+    assert actions(second).keys() == actions(first).keys()
+
+
+def test_changed_input_rebuilds_only_its_stages(spanish_project, tmp_path):
+    output_root = tmp_path / 'out'
+    build(spanish_project, output_root)
+
+    ui_csv = spanish_project.parent.parent / 'translations' / 'ui-es.csv'
+    ui_csv.write_text(ui_csv.read_text(encoding='utf-8').replace('Aprende más:', 'Más:'),
+                      encoding='utf-8')
+    result = build(spanish_project, output_root)
+    assert actions(result)['ui_text'] == 'rebuilt'
+    assert reasons(result)['ui_text'] == f"input changed: {ui_csv.resolve()}"
+    # The prerendered pages read the UI JSON; nothing else does
+    rebuilt = {stage for stage, action in actions(result).items() if action != 'skipped'}
+    assert rebuilt == {'ui_text', 'emotion_pages'}
+
+
+def test_edited_output_is_rebuilt(spanish_project, tmp_path):
+    output_root = tmp_path / 'out'
+    first = build(spanish_project, output_root)
+    json_file = first['paths']['json_file']
+    original = json_file.read_bytes()
+    json_file.write_text('{}', encoding='utf-8')
+
+    result = build(spanish_project, output_root)
+    assert reasons(result)['emotions'] == 'output modified since last build'
+    assert json_file.read_bytes() == original
+
+
+# Artifact cache
+
+def test_cache_restores_identical_copies(spanish_project, tmp_path):
+    store = ArtifactStore(tmp_path / 'cache')
+    first = build(spanish_project, tmp_path / 'first', cache=store)
+    assert first['cache']['hits'] == 0 and first['cache']['stored'] > 0
+
+    second = build(spanish_project, tmp_path / 'second', cache=store)
+    restored = [stage for stage, action in actions(second).items() if action == 'restored']
+    assert restored and second['cache']['misses'] == 0
+
+    blobs = {os.stat(blob).st_ino for blob in (tmp_path / 'cache' / 'blobs').glob('*/*')}
+    for stage in restored:
+        key = {'emotions': 'json_file', 'ui_text': 'ui_json_file', 'graph': 'graph_file',
+               'compact': 'compact_json_file', 'svg': 'svg_processed',
+               'hitmap': 'svg_hitmap_file'}[stage]
+        restored_file = second['paths'][key]
+        assert restored_file.read_bytes() == first['paths'][key].read_bytes()
+        # A copy, so editing it in place cannot reach the cache
+        assert os.stat(restored_file).st_ino not in blobs
+
+
+def test_cache_key_follows_the_inputs(spanish_project, tmp_path):
+    store = ArtifactStore(tmp_path / 'cache')
+    build(spanish_project, tmp_path / 'first', cache=store)
+
+    csv_file = spanish_project.parent.parent / 'translations' / 'spanish.csv'
+    csv_file.write_text(csv_file.read_text(encoding='utf-8').replace('Felicidad', 'Dicha'),
+                        encoding='utf-8')
+    result = build(spanish_project, tmp_path / 'second', cache=store)
+    assert actions(result)['emotions'] == 'rebuilt'
+    assert 'Dicha' in result['paths']['json_file'].read_text(encoding='utf-8')
+
+
+def test_changed_blob_is_a_miss(tmp_path):
+    store = ArtifactStore(tmp_path / 'cache')
+    output = tmp_path / 'out.json'
+    output.write_text('{"a": 1}', encoding='utf-8')
+    key = 'ab' * 32
+    assert store.store(key, output)
+
+    blob = next((tmp_path / 'cache' / 'blobs').glob('*/*'))
+    blob.write_text('{"a": 2}', encoding='utf-8')
+    restored = tmp_path / 'restored.json'
+    assert not store.restore(key, restored)
+    assert not restored.exists()
+    assert not blob.exists()
+
+
+def test_evict_drops_least_recently_used(tmp_path):
+    store = ArtifactStore(tmp_path / 'cache', max_bytes=1500)
+    keys = []
+    for i in range(3):
+        output = tmp_path / f"out{i}.txt"
+        output.write_text(str(i) * 1000, encoding='utf-8')
+        keys.append(f"{i:02d}" * 32)
+        assert store.store(keys[-1], output)
+        entry = store._entry_path(keys[-1])
+        os.utime(entry, (1000 + i, 1000 + i))
+
+    evicted, freed = store.evict()
+    assert (evicted, freed) == (2, 2000)
+    assert store.size() == 1000
+    assert not store.restore(keys[0], tmp_path / 'r0.txt')
+    assert store.restore(keys[2], tmp_path / 'r2.txt')
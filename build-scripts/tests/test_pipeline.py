@@ -0,0 +1,51 @@
+"""The in-process pipeline against the original one-script-per-stage build"""
+
+import contextlib
+import io
+
+import pytest
+
+from conftest import ITALIAN_CONFIG, SPANISH_CONFIG
+from plutchik_build.manifest import MANIFEST_DIR
+from plutchik_build.pipeline import (
+    PROJECT_ROOT,
+    build_language,
+    build_language_comparable,
+    build_language_subprocess,
+)
+
+
+def output_files(root, skip=()):
+    """{relative path: bytes} of every file a build wrote under root"""
+    return {path.relative_to(root).as_posix(): path.read_bytes()
+            for path in sorted(root.rglob('*'))
+            if path.is_file() and MANIFEST_DIR not in path.parts and path.name not in skip}
+
+
+@pytest.mark.parametrize('config_path', [SPANISH_CONFIG, ITALIAN_CONFIG], ids=['es', 'it'])
+def test_in_process_matches_stage_scripts(config_path, tmp_path):
+    in_process = tmp_path / 'in-process'
+    scripts = tmp_path / 'scripts'
+    in_process.mkdir()
+    scripts.mkdir()
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert build_language_comparable(config_path, PROJECT_ROOT, in_process)
+        assert build_language_subprocess(config_path, PROJECT_ROOT, scripts)
+
+    # build_language_comparable() leaves its trimmed config next to the outputs
+    built = output_files(in_process, skip={config_path.name})
+    expected = output_files(scripts)
+    assert built.keys() == expected.keys()
+    assert built, "the build wrote nothing"
+    for name in expected:
+        assert built[name] == expected[name], f"{name} differs from the stage script's output"
+
+
+def test_full_build_leaves_the_checkout_alone(tmp_path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = build_language(SPANISH_CONFIG, PROJECT_ROOT, tmp_path, force=True)
+    assert result is not None
+    assert all(action == 'rebuilt' for _, action, _ in result['report'])
+    for key, path in result['paths'].items():
+        if path is not None and key not in ('csv_file', 'ui_csv_file', 'svg_input'):
+            assert tmp_path in path.parents, f"{key} written outside the output root"
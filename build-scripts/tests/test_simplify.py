@@ -0,0 +1,103 @@
+"""Ramer-Douglas-Peucker outline simplification stays within its tolerance"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from plutchik_build.pipeline import PROJECT_ROOT  # noqa: E402
+from plutchik_build.svg import load_svg  # noqa: E402
+from plutchik_build.svg_identify import (  # noqa: E402
+    layer_shapes,
+    sample_segments,
+    shape_segments,
+    transformed_segments,
+)
+from plutchik_build.svg_simplify import simplify_polyline, simplify_ring, simplify_svg_tree  # noqa: E402
+
+# Rounding the written coordinates to two decimals may add this much
+ROUNDING = 0.01
+
+
+def distances_to_polyline(points, polyline, closed=False):
+    """Distance of every point to the nearest segment of polyline"""
+    start = polyline
+    end = np.roll(polyline, -1, axis=0)
+    if not closed:
+        start, end = start[:-1], end[:-1]
+    chord = end - start
+    length2 = np.maximum((chord ** 2).sum(axis=1), 1e-12)
+    offset = points[:, None, :] - start[None, :, :]
+    t = np.clip((offset * chord).sum(axis=2) / length2, 0, 1)
+    nearest = start + t[..., None] * chord
+    return np.hypot(*(points[:, None, :] - nearest).transpose(2, 0, 1)).min(axis=1)
+
+
+def wobbly_curve(count, seed):
+    rng = np.random.default_rng(seed)
+    t = np.linspace(0, 3 * np.pi, count)
+    return np.column_stack([t * 10, np.sin(t) * 20 + rng.normal(0, 0.3, count)])
+
+
+@pytest.mark.parametrize('tolerance', [0.1, 0.5, 2.0])
+@pytest.mark.parametrize('seed', range(3))
+def test_polyline_within_tolerance(tolerance, seed):
+    points = wobbly_curve(400, seed)
+    simplified = simplify_polyline(points, tolerance)
+
+    assert len(simplified) < len(points)
+    assert (simplified[0] == points[0]).all() and (simplified[-1] == points[-1]).all()
+    # Kept points are a subsequence of the input
+    kept = [int(np.flatnonzero((points == p).all(axis=1))[0]) for p in simplified]
+    assert kept == sorted(kept)
+    assert distances_to_polyline(points, simplified).max() <= tolerance + 1e-9
+
+
+@pytest.mark.parametrize('tolerance', [0.1, 0.5])
+def test_ring_within_tolerance(tolerance):
+    angles = np.linspace(0, 2 * np.pi, 300, endpoint=False)
+    radius = 50 + 3 * np.sin(5 * angles)
+    points = np.column_stack([radius * np.cos(angles), radius * np.sin(angles)])
+    simplified = simplify_ring(points, tolerance)
+
+    assert 3 <= len(simplified) < len(points)
+    assert (simplified[0] == points[0]).all()
+    assert distances_to_polyline(points, simplified, closed=True).max() <= tolerance + 1e-9
+
+
+def test_straight_line_keeps_its_ends():
+    points = np.column_stack([np.arange(10.0), np.zeros(10)])
+    assert simplify_polyline(points, 0.01).tolist() == [[0.0, 0.0], [9.0, 0.0]]
+
+
+def user_space_outlines(element, matrix, samples=8):
+    return [sample_segments(segments, samples)
+            for segments in transformed_segments(shape_segments(element), matrix)]
+
+
+@pytest.mark.parametrize('tolerance', [0.25, 1.0])
+def test_wheel_outlines_move_less_than_the_tolerance(tolerance):
+    tree = load_svg(PROJECT_ROOT / 'Plutchik-spanish-processed.svg')
+    before = []
+    for _, shapes in layer_shapes(tree.getroot()):
+        for element, kind, _, matrix in shapes:
+            if kind not in ('label', 'box'):
+                before.append((element, matrix, user_space_outlines(element, matrix)))
+
+    stats = simplify_svg_tree(tree, tolerance)
+    assert stats['rewritten'] > 0
+    assert stats['max_deviation'] <= tolerance
+
+    checked = 0
+    for element, matrix, outlines in before:
+        after = user_space_outlines(element, matrix)
+        assert len(after) == len(outlines)
+        if all(len(a) == len(b) and np.allclose(a, b) for a, b in zip(after, outlines)):
+            continue
+        # The rings keep some large curves; flatten them finely enough that
+        # the polyline itself adds no error worth counting
+        after = user_space_outlines(element, matrix, samples=128)
+        checked += 1
+        for original, simplified in zip(outlines, after):
+            worst = distances_to_polyline(original, simplified, closed=True).max()
+            assert worst <= tolerance + ROUNDING, f"{element.get('class')} moved by {worst:.3f}"
+    assert checked > 0
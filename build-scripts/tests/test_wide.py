@@ -0,0 +1,82 @@
+"""Wide multi-language sheets against the per-language CSV conversion"""
+
+import contextlib
+import csv
+import io
+import subprocess
+import sys
+
+import pytest
+
+from conftest import BUILD_SCRIPTS_DIR, ITALIAN_CONFIG, SPANISH_CONFIG, load_json
+from plutchik_build.pipeline import PROJECT_ROOT, load_config, mapping_path
+from plutchik_build.wide import WideSheetError, export_wide_sheet, ingest_wide_sheet
+
+TEMPLATE = PROJECT_ROOT / 'translations' / 'template.csv'
+UI_TEMPLATE = PROJECT_ROOT / 'translations' / 'ui-template.csv'
+
+
+def language_json(config_path):
+    config = load_config(config_path)
+    return (load_json(PROJECT_ROOT / config['json_file']),
+            load_json(PROJECT_ROOT / config['ui_json_file']),
+            load_json(mapping_path(config_path, config)))
+
+
+@pytest.fixture
+def sheet(tmp_path):
+    """A wide sheet exported from the committed Spanish and Italian JSON"""
+    path = tmp_path / 'wide.csv'
+    languages = {'es': language_json(SPANISH_CONFIG), 'it': language_json(ITALIAN_CONFIG)}
+    export_wide_sheet(path, languages, TEMPLATE, UI_TEMPLATE)
+    return path
+
+
+def ingest(sheet_path, output_dir, locales=('es', 'it')):
+    outputs = {locale: (output_dir / f"text-{locale}.json", output_dir / f"ui-text-{locale}.json")
+               for locale in locales}
+    with contextlib.redirect_stdout(io.StringIO()):
+        stats = ingest_wide_sheet(sheet_path, outputs, TEMPLATE, UI_TEMPLATE)
+    return stats, outputs
+
+
+def test_ingest_matches_csv_to_json(sheet, tmp_path):
+    converted = tmp_path / 'converted'
+    converted.mkdir()
+    config = load_config(SPANISH_CONFIG)
+    for script, source, target in (('csv-to-json.py', config['csv_file'], 'text-es.json'),
+                                   ('ui-csv-to-json.py', config['ui_csv_file'], 'ui-text-es.json')):
+        subprocess.run([sys.executable, str(BUILD_SCRIPTS_DIR / script),
+                        str(PROJECT_ROOT / source), str(converted / target)],
+                       check=True, capture_output=True)
+
+    _, outputs = ingest(sheet, tmp_path)
+    json_file, ui_json_file = outputs['es']
+    # Members follow the sheet's row order; the values must be the same
+    assert load_json(json_file) == load_json(converted / 'text-es.json')
+    assert load_json(ui_json_file) == load_json(converted / 'ui-text-es.json')
+
+
+def test_ingest_round_trips_every_language(sheet, tmp_path):
+    stats, outputs = ingest(sheet, tmp_path)
+    for config_path, locale in ((SPANISH_CONFIG, 'es'), (ITALIAN_CONFIG, 'it')):
+        emotions, ui_text, _ = language_json(config_path)
+        json_file, ui_json_file = outputs[locale]
+        assert load_json(json_file) == emotions
+        assert load_json(ui_json_file) == ui_text
+    assert stats['emotions'] == 32
+
+
+def test_invalid_sheet_writes_nothing(sheet, tmp_path):
+    with open(sheet, 'r', encoding='utf-8', newline='') as f:
+        rows = list(csv.reader(f))
+    # Move a row of the first emotion to the end: its rows are split up
+    rows.append(rows.pop(2))
+    with open(sheet, 'w', encoding='utf-8', newline='') as f:
+        csv.writer(f).writerows(rows)
+
+    output_dir = tmp_path / 'out'
+    output_dir.mkdir()
+    with pytest.raises(WideSheetError, match='not contiguous'):
+        ingest(sheet, output_dir)
+    assert list(output_dir.iterdir()) == []
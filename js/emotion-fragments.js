@@ -0,0 +1,48 @@
+// Shows the detail panel of an emotion from the fragments prerendered by
+// build-scripts/prerender-emotions.py (see plutchik_build/emotion_pages.py)
+// instead of filling #content field by field. A fragment holds
+// #emotion-title, #emotion-description and #explore-container with the
+// template's ids and classes; each navigation button names the emotion it
+// leads to in data-emotion (an English SVG layer id). Only the fragment
+// requested last is swapped in, so a slow fetch cannot overwrite a later
+// click.
+
+var emotion_fragment_cache = {};
+var emotion_fragment_requested = null;
+
+function swap_emotion_fragment(fragment_text, content) {
+    content = content || document.getElementById('content');
+    var holder = document.createElement('div');
+    holder.innerHTML = fragment_text;
+
+    Array.prototype.slice.call(holder.children).forEach(function(element){
+        var current = element.id && content.querySelector('#' + element.id);
+        if (current) {
+            current.parentNode.replaceChild(element, current);
+        }
+    });
+    return content;
+}
+
+function load_emotion_fragment(pages_url, svg_id) {
+    // pages_url is the language's "emotion_pages_dir", e.g. 'emotions/es'
+    var url = pages_url + '/fragments/' + svg_id + '.html';
+    if (!(url in emotion_fragment_cache)) {
+        emotion_fragment_cache[url] = fetch(url).then(function(response){
+            if (!response.ok) {
+                delete emotion_fragment_cache[url];
+                throw new Error('No prerendered fragment for ' + svg_id);
+            }
+            return response.text();
+        });
+    }
+    emotion_fragment_requested = url;
+    return emotion_fragment_cache[url].then(function(fragment_text){
+        // null when another fragment was requested meanwhile
+        return url === emotion_fragment_requested ? swap_emotion_fragment(fragment_text) : null;
+    });
+}
+
+if (typeof module !== 'undefined') {
+    module.exports = { swap_emotion_fragment: swap_emotion_fragment };
+}
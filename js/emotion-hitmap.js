@@ -0,0 +1,51 @@
+// Resolves pointer events on the wheel against the hit map written by
+// build-scripts/process-svg.py --hitmap (see plutchik_build/svg_hitmap.py)
+// instead of letting the browser hit-test every petal path and label
+// glyph. Regions are listed topmost first; each has a bounding box and
+// rings of flat [x, y, x, y, ...] user-space points (even-odd rule).
+// Emotions are named by their English SVG layer ids.
+
+function point_in_rings(rings, x, y) {
+    var inside = false;
+    rings.forEach(function(ring){
+        var count = ring.length / 2;
+        for (var i = 0, j = count - 1; i < count; j = i++) {
+            var xi = ring[2 * i], yi = ring[2 * i + 1];
+            var xj = ring[2 * j], yj = ring[2 * j + 1];
+            if ((yi > y) !== (yj > y) && x < (xj - xi) * (y - yi) / (yj - yi) + xi) {
+                inside = !inside;
+            }
+        }
+    });
+    return inside;
+}
+
+function emotion_at(hitmap, x, y) {
+    var regions = hitmap.regions;
+    for (var i = 0; i < regions.length; i++) {
+        var bbox = regions[i].bbox;
+        if (x >= bbox[0] && x <= bbox[2] && y >= bbox[1] && y <= bbox[3]
+                && point_in_rings(regions[i].rings, x, y)) {
+            return regions[i].emotion;
+        }
+    }
+    return null;
+}
+
+function bind_emotion_hitmap(svg, hitmap, on_emotion) {
+    // on_emotion(svg_id, event) runs for clicks that land on an emotion
+    var point = svg.createSVGPoint();
+    svg.addEventListener('click', function(event){
+        point.x = event.clientX;
+        point.y = event.clientY;
+        var user = point.matrixTransform(svg.getScreenCTM().inverse());
+        var svg_id = emotion_at(hitmap, user.x, user.y);
+        if (svg_id) {
+            on_emotion(svg_id, event);
+        }
+    });
+}
+
+if (typeof module !== 'undefined') {
+    module.exports = { emotion_at: emotion_at, bind_emotion_hitmap: bind_emotion_hitmap };
+}
@@ -0,0 +1,76 @@
+// Decoder for the compact columnar emotions payload written by
+// build-scripts/csv-to-json.py --compact (see plutchik_build/compact.py).
+
+// Returns an object equal to the text*.json emotions data.
+function decode_compact_emotions(payload) {
+    check_compact_payload(payload);
+
+    var names = payload['names'];
+    var palette = payload['palette'];
+    var emotions_data_object = {};
+    names.forEach(function(name){
+        emotions_data_object[name] = {};
+    });
+
+    payload['fields'].forEach(function(field_and_kind, f){
+        var field = field_and_kind[0];
+        var kind = field_and_kind[1];
+        payload['columns'][f].forEach(function(value, i){
+            if (value === null) {
+                return;
+            }
+            if (kind === 'color') {
+                value = '#' + palette[value];
+            }
+            else if (kind === 'ref') {
+                value = names[value[0]];
+            }
+            else if (kind === 'list' && Array.isArray(value)) {
+                value = value.join('; ');
+            }
+            emotions_data_object[names[i]][field] = value;
+        });
+    });
+
+    return emotions_data_object;
+}
+
+// Returns the references resolved at build time:
+// {name: {field: {id, name, color}}}, as in the data island's "links".
+function decode_compact_links(payload) {
+    check_compact_payload(payload);
+
+    var names = payload['names'];
+    var palette = payload['palette'];
+    var links = {};
+    names.forEach(function(name){
+        links[name] = {};
+    });
+
+    payload['fields'].forEach(function(field_and_kind, f){
+        var field = field_and_kind[0];
+        if (field_and_kind[1] !== 'ref') {
+            return;
+        }
+        payload['columns'][f].forEach(function(value, i){
+            if (value !== null) {
+                links[names[i]][field] = {id: value[0], name: names[value[0]], color: '#' + palette[value[1]]};
+            }
+        });
+    });
+
+    return links;
+}
+
+function check_compact_payload(payload) {
+    if (payload['format'] !== 'plutchik-columns' || payload['version'] !== 2) {
+        throw 'Unsupported emotions payload format';
+    }
+}
+
+if (typeof module !== 'undefined') {
+    module.exports = {
+        decode_compact_emotions: decode_compact_emotions,
+        decode_compact_links: decode_compact_links
+    };
+}
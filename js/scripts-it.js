@@ -1,11 +1,32 @@
 
 $(document).ready(function() {
 
+    // Optional outputs of build-scripts/build-language.py (see
+    // languages/*-config.json); the page falls back when one is missing
+    const build_outputs = {
+        // Compact columnar emotions, decoded by js/emotions-compact.js
+        compact: 'text-it-compact.json',
+        // Prerendered detail panels, swapped in by js/emotion-fragments.js
+        pages: 'emotions/it',
+        // Click regions of the wheel, resolved by js/emotion-hitmap.js
+        hitmap: null
+    };
+
     async function load_text_and_initialize_interactive_elements() {
 
-        const text_data = await fetch('text-it.json');
+        // Pages built by build-scripts/generate-html.py embed the data,
+        // so only fall back to fetching it when there is no data island
+        const data_island = document.getElementById('plutchik-data');
+        const hitmap_binding = bind_hitmap();
         try {
-            var emotions_data_object = await text_data.json();
+            if (data_island) {
+                const page_data = JSON.parse(data_island.textContent);
+                var emotions_data_object = page_data['emotions'];
+                var emotion_links = page_data['links'] || resolve_emotion_links(emotions_data_object);
+            }
+            else {
+                var [emotions_data_object, emotion_links] = await fetch_emotions();
+            }
         }
         catch(_) {
             escape_and_revert_to_static_webapp('Error in JSON file');
@@ -14,23 +35,30 @@ $(document).ready(function() {
         $('#content').hide();
         $('#placeholder-container').show();
 
+        // With a hit map, one click handler on the wheel finds the emotion
+        // under the pointer instead of one handler per petal and glyph
+        const hitmap_bound = await hitmap_binding;
+
         Object.keys(emotions_data_object).forEach(function(emotion){
             var selected_emotion = emotions_data_object[emotion]
+            // Neighbours resolved at build time: {field: {id, name, color}}
+            var selected_links = emotion_links[emotion] || {};
 
-            $('.' + emotion).click(function(){
+            if (!hitmap_bound) {
+                $('.' + emotion).click(function(){
+                    show_emotion(emotion);
+                })
+            }
+
+            // Fills the panel field by field when there is no fragment
+            emotion_views[emotion] = function(){
                 console.log(emotion);
                 console.log(selected_emotion);
-                $('#content').hide();
-
-                $('#placeholder-container').hide();
-                // Stop the in-out animation
-                $('.animate-at-start').each(function() {
-                    $(this).one('animationiteration webkitAnimationIteration', function() {
-                        $(this).removeClass('animate-at-start');
-                    })
-                })
+                if (fragment_shown) {
+                    $('#content').html(content_template);
+                    fragment_shown = false;
+                }
 
-                $('#content').hide();
                 $('.emotion-name').text(capitalization_helper(emotion));
                 ['similar-words', 'sensations', 'message', 'purpose'].forEach(function(param_name){
                     if (param_name in selected_emotion) {
@@ -51,30 +79,31 @@ $(document).ready(function() {
                     // $('#emotion-title').removeClass('intermediate');
                     $('#intensity').text(selected_emotion['intensity']);
 
-                    opposite = selected_emotion['opposite'];
-                    $('#opposite-button').css('background-color', emotions_data_object[opposite]['color']);
-                    $('#opposite-button').text(capitalization_helper(opposite));
+                    var opposite = selected_links['opposite'];
+                    $('#opposite-button').attr('data-emotion', opposite['name']);
+                    $('#opposite-button').css('background-color', opposite['color']);
+                    $('#opposite-button').text(capitalization_helper(opposite['name']));
 
 
-                    if ('+intense' in selected_emotion) {
+                    if ('+intense' in selected_links) {
                         $('.increase-intensity').addClass('enabled');
-                        $('.increase-intensity > .explore-arrow').css('fill', emotions_data_object[selected_emotion['+intense']]['color'])
-                        up = selected_emotion['+intense'];
+                        $('.increase-intensity > .explore-arrow').css('fill', selected_links['+intense']['color'])
+                        $('.increase-intensity').attr('data-emotion', selected_links['+intense']['name']);
                     }
                     else {
                         $('.increase-intensity').removeClass('enabled');
                         $('.increase-intensity > .explore-arrow').css('fill', '#D3D3D3')
-                        up = null;
+                        $('.increase-intensity').removeAttr('data-emotion');
                     }
-                    if ('-intense' in selected_emotion) {
+                    if ('-intense' in selected_links) {
                         $('.decrease-intensity').addClass('enabled');
-                        $('.decrease-intensity > .explore-arrow').css('fill', emotions_data_object[selected_emotion['-intense']]['color'])
-                        down = selected_emotion['-intense'];
+                        $('.decrease-intensity > .explore-arrow').css('fill', selected_links['-intense']['color'])
+                        $('.decrease-intensity').attr('data-emotion', selected_links['-intense']['name']);
                     }
                     else {
                         $('.decrease-intensity').removeClass('enabled');
                         $('.decrease-intensity > .explore-arrow').css('fill', '#D3D3D3')
-                        down = null;
+                        $('.decrease-intensity').removeAttr('data-emotion');
                     }
 
                 }
@@ -89,19 +118,16 @@ $(document).ready(function() {
 
                     ['combo-emotion-0', 'combo-emotion-1'].forEach(function(param){
                         try {
-                            var combo_emotion = selected_emotion[param];
-                            $('#' + param + '-button').text(capitalization_helper(combo_emotion));
-                            combo_emotion_color = emotions_data_object[combo_emotion]['color'];
-                            $('#' + param + '-button').css('background-color', combo_emotion_color);
+                            var combo_emotion = selected_links[param];
+                            $('#' + param + '-button').text(capitalization_helper(combo_emotion['name']));
+                            $('#' + param + '-button').attr('data-emotion', combo_emotion['name']);
+                            $('#' + param + '-button').css('background-color', combo_emotion['color']);
                         }
                         catch {
                             escape_and_revert_to_static_webapp('Error populating combo emotion' + first_combo_emotion)
                         }
                     });
 
-                    combo_0 = selected_emotion['combo-emotion-0'];
-                    combo_1 = selected_emotion['combo-emotion-1'];
-
                     $('#combo-explanation').text(selected_emotion['combo-explanation']);
 
                 }
@@ -111,7 +137,7 @@ $(document).ready(function() {
                 }
 
                 $('#content').show();
-            })
+            }
 
             if (is_intermediate_emotion(selected_emotion)) {
                 $('.intermediate-emotion-container.' + emotion).hover(function(){
@@ -123,6 +149,73 @@ $(document).ready(function() {
             }
         })
 
+        async function bind_hitmap() {
+            if (!build_outputs.hitmap || typeof bind_emotion_hitmap !== 'function') {
+                return false;
+            }
+            try {
+                const hitmap_data = await fetch(build_outputs.hitmap);
+                if (!hitmap_data.ok) {
+                    return false;
+                }
+                const hitmap = await hitmap_data.json();
+                // Regions are named by SVG layer id; the names come from the
+                // prerendered index
+                bind_emotion_hitmap($('.plutchik-zone svg').get(0), hitmap, function(svg_id){
+                    var emotion = emotion_by_svg_id[svg_id];
+                    if (emotion in emotion_views) {
+                        show_emotion(emotion);
+                    }
+                });
+                return true;
+            }
+            catch(_) {
+                console.warn('Binding a click handler to every emotion instead');
+                return false;
+            }
+        }
+
+        async function fetch_emotions() {
+            // The compact payload is smaller; text-it.json is the fallback
+            if (build_outputs.compact && typeof decode_compact_emotions === 'function') {
+                try {
+                    const compact_data = await fetch(build_outputs.compact);
+                    if (compact_data.ok) {
+                        const payload = await compact_data.json();
+                        return [decode_compact_emotions(payload), decode_compact_links(payload)];
+                    }
+                }
+                catch(_) {
+                    console.warn('Falling back to text-it.json');
+                }
+            }
+            const text_data = await fetch('text-it.json');
+            const emotions_data_object = await text_data.json();
+            return [emotions_data_object, resolve_emotion_links(emotions_data_object)];
+        }
+
+        // text-it.json names the neighbours; resolve them once, on load, so a
+        // click reads the same {id, name, color} links as with a build output
+        function resolve_emotion_links(emotions_data_object) {
+            const names = Object.keys(emotions_data_object);
+            const links = {};
+            names.forEach(function(name){
+                links[name] = {};
+                ['+intense', '-intense', 'opposite', 'combo-emotion-0', 'combo-emotion-1'].forEach(function(field){
+                    const target = emotions_data_object[name][field];
+                    if (target === undefined) {
+                        return;
+                    }
+                    if (!(target in emotions_data_object)) {
+                        console.warn('Unknown emotion', target, 'in', field, 'of', name);
+                        return;
+                    }
+                    links[name][field] = {id: names.indexOf(target), name: target, color: emotions_data_object[target]['color']};
+                });
+            });
+            return links;
+        }
+
         function escape_and_revert_to_static_webapp(message){
             // TODO: Make this look better: Prevent hover stuff, center.
             // Turns dynamic webapp into static webapp
@@ -145,35 +238,72 @@ $(document).ready(function() {
         }
     };
 
-    var up, down, opposite, combo_0, combo_1;
+    // The panel as the page shipped it, restored when a fragment replaced it
+    const content_template = $('#content').html();
+    var emotion_views = {};
+    var fragment_shown = false;
+    var use_fragments = build_outputs.pages && typeof load_emotion_fragment === 'function';
+    var current_emotion = null;
+    // The SVG and the emotions JSON name emotions in Italian, fragments and
+    // the hit map by their English SVG layer ids; the prerendered index
+    // maps between them
+    var svg_id_by_emotion = {};
+    var emotion_by_svg_id = {};
+
+    if (build_outputs.pages) {
+        fetch(build_outputs.pages + '/index.json').then(function(response){
+            return response.json();
+        }).then(function(index){
+            Object.keys(index).forEach(function(svg_id){
+                svg_id_by_emotion[index[svg_id]['name']] = svg_id;
+                emotion_by_svg_id[svg_id] = index[svg_id]['name'];
+            });
+        }).catch(function(){
+            use_fragments = false;
+        });
+    }
 
-    load_text_and_initialize_interactive_elements();
+    function show_emotion(emotion) {
+        current_emotion = emotion;
+        $('#content').hide();
+        $('#placeholder-container').hide();
+        // Stop the in-out animation
+        $('.animate-at-start').each(function() {
+            $(this).one('animationiteration webkitAnimationIteration', function() {
+                $(this).removeClass('animate-at-start');
+            })
+        })
 
-    $('#opposite-button').click(function(){
-        if (opposite != null) {
-            $('.petal-shape.' + opposite).click();
+        if (!use_fragments || !(emotion in svg_id_by_emotion)) {
+            emotion_views[emotion]();
+            return;
         }
-    });
-    $('.increase-intensity').click(function(){
-        if (up != null) {
-            $('.petal-shape.' + up).click();
-        }
-    });
-    $('.decrease-intensity').click(function(){
-        if (down != null) {
-            $('.petal-shape.' + down).click();
-        }
-    });
-    $('#combo-emotion-0-button').click(function(){
-        if (combo_0 != null) {
-            $('.petal-shape.' + combo_0).click();
+        load_emotion_fragment(build_outputs.pages, svg_id_by_emotion[emotion]).then(function(content){
+            if (content) {
+                fragment_shown = true;
+                $('#content').show();
+            }
+        }).catch(function(){
+            // Not prerendered or not reachable: build the panel from the JSON
+            use_fragments = false;
+            if (current_emotion == emotion) {
+                emotion_views[emotion]();
+            }
+        });
+    }
+
+    load_text_and_initialize_interactive_elements();
+
+    // Opposite, intensity and combo buttons name their emotion in
+    // data-emotion: by SVG layer id in fragments, in Italian in the panel
+    // filled from the JSON
+    $('#content').on('click', '[data-emotion]', function(){
+        var target = $(this).attr('data-emotion');
+        var emotion = emotion_by_svg_id[target] || target;
+        if (emotion in emotion_views) {
+            show_emotion(emotion);
         }
     });
-    $('#combo-emotion-1-button').click(function(){
-        if (combo_1 != null) {
-            $('.petal-shape.' + combo_1).click();
-        }
-    })
 
 })
 
@@ -3,9 +3,17 @@ $(document).ready(function() {
 
     async function load_text_and_initialize_interactive_elements() {
 
-        const text_data = await fetch('https://6secus.s3.amazonaws.com/website/plutchik-webapp-testing/plutchik-webapp/text.json');
+        // Pages built by build-scripts/generate-html.py embed the data,
+        // so only fall back to fetching it when there is no data island
+        const data_island = document.getElementById('plutchik-data');
         try {
-            var emotions_data_object = await text_data.json();
+            if (data_island) {
+                var emotions_data_object = JSON.parse(data_island.textContent)['emotions'];
+            }
+            else {
+                const text_data = await fetch('https://6secus.s3.amazonaws.com/website/plutchik-webapp-testing/plutchik-webapp/text.json');
+                var emotions_data_object = await text_data.json();
+            }
         }
         catch(_) {
             escape_and_revert_to_static_webapp('Error in JSON file');